@@ -6,6 +6,7 @@ Analyzes a PDF to identify complex pages suitable for OCR benchmarking
 import os
 import sys
 import argparse
+import importlib.util
 from collections import defaultdict
 
 # Set UTF-8 encoding for Windows console
@@ -17,9 +18,8 @@ if sys.platform == 'win32':
     except Exception:
         pass
 
-try:
-    import fitz  # PyMuPDF
-except ImportError:
+# PyMuPDF is imported where it is used, so --help stays fast
+if importlib.util.find_spec("fitz") is None:
     print("Error: PyMuPDF is not installed.")
     print("Please install it using: pip install PyMuPDF")
     sys.exit(1)
@@ -139,6 +139,8 @@ def analyze_pdf(pdf_path, min_complexity=30, top_n=10):
     Returns:
         List of recommended page numbers and analysis data
     """
+    import fitz  # PyMuPDF
+    
     try:
         pdf_document = fitz.open(pdf_path)
     except Exception as e:
@@ -4,14 +4,42 @@ Generates comprehensive results for model comparison
 """
 
 import os
-import glob
 import json
 import time
 from datetime import datetime
 from pathlib import Path
 
-def batch_process_documents():
-    """Process all test documents and generate comparison report"""
+from input_discovery import INDEX_FILENAME, ChangeIndex, IMAGE_EXTENSIONS, discover_inputs, filter_changed
+from ocr_stats import ScoreStats
+from page_watchdog import PageTimeout, SupervisedEngine
+
+# Category folders processed when no roots or manifest are given
+DEFAULT_DOCUMENT_DIRS = [
+    "test_documents/tables",
+    "test_documents/invoices",
+    "test_documents/forms",
+    "test_documents/papers",
+    "test_documents/mixed"
+]
+
+
+def batch_process_documents(roots=None, manifest=None, extensions=None,
+                            recursive=False, incremental=False, page_timeout=None,
+                            dedup_threshold=None):
+    """
+    Process all test documents and generate comparison report
+    
+    Args:
+        roots: Directories to scan (default: the test_documents category folders)
+        manifest: Optional file with one document path per line ('-' for stdin)
+        extensions: Accepted file extensions (default: .jpg)
+        recursive: Scan subdirectories of the roots
+        incremental: Skip documents unchanged since the last successful run
+        page_timeout: Seconds allowed per document; OCR then runs in a worker
+                      process that is killed and replaced when a document overruns
+        dedup_threshold: OCR near-duplicate documents (perceptual hashes at most
+                         this many bits apart) once and reuse the result (None disables)
+    """
     
     print("="*70)
     print("PaddleOCR Batch Testing - Complete Document Set")
@@ -21,32 +49,58 @@ def batch_process_documents():
     
     # Import test function
     from test_basic_ocr import test_basic_ocr
+    from ocr_api import OCRPageResult, create_ocr_engine, save_ocr_outputs
     
     # Find all test documents
-    test_patterns = [
-        "test_documents/tables/*.jpg",
-        "test_documents/invoices/*.jpg",
-        "test_documents/forms/*.jpg",
-        "test_documents/papers/*.jpg",
-        "test_documents/mixed/*.jpg"
-    ]
+    if roots is None and manifest is None:
+        roots = DEFAULT_DOCUMENT_DIRS
+    extensions = extensions or {'.jpg'}
     
-    all_documents = []
-    for pattern in test_patterns:
-        all_documents.extend(glob.glob(pattern))
+    change_index = ChangeIndex(os.path.join("test_results", INDEX_FILENAME)) if incremental else None
+    discovered = discover_inputs(roots, manifest=manifest, extensions=extensions, recursive=recursive)
+    all_documents = list(filter_changed(discovered, change_index))
     
     print(f"\nFound {len(all_documents)} test documents")
     print("-"*70)
     
+    if not all_documents:
+        print("Nothing to process")
+        return None
+    
+    # Near-duplicate pre-pass: OCR runs once per cluster
+    clusters = None
+    if dedup_threshold is not None:
+        from page_dedup import DuplicateClusters
+        clusters = DuplicateClusters.build(all_documents, threshold=dedup_threshold)
+        print(f"✓ Near-duplicates: {clusters.duplicates} documents reuse another document's result "
+              f"({len(clusters.members)} clusters, hashed in {clusters.hash_seconds:.2f}s)")
+    
+    # Initialize PaddleOCR once and reuse it for every document
+    print("\nInitializing PaddleOCR...")
+    if page_timeout:
+        ocr = SupervisedEngine("ocr", timeout=page_timeout, lang='en')
+        ocr.wait_ready()
+        print(f"✓ Per-document timeout: {page_timeout:.0f}s (supervised worker process)")
+    else:
+        ocr = create_ocr_engine(lang='en')
+    
     # Process each document
     results_summary = {
         "test_date": datetime.now().isoformat(),
         "total_documents": len(all_documents),
         "successful": 0,
         "failed": 0,
+        "timed_out": 0,
         "documents": []
     }
     
+    # Page-level score statistics, merged per category and for the whole run
+    category_stats = {}
+    run_stats = ScoreStats()
+    reusable = {}
+    time_saved = 0.0
+    reused = 0
+    
     for idx, doc_path in enumerate(all_documents, 1):
         doc_name = os.path.basename(doc_path)
         category = os.path.basename(os.path.dirname(doc_path))
@@ -55,38 +109,54 @@ def batch_process_documents():
         print("-"*70)
         
         start_time = time.time()
+        representative = clusters.representative_of(doc_path) if clusters is not None else None
         
         try:
-            success = test_basic_ocr(doc_path, output_dir="test_results")
+            if representative is not None and representative in reusable:
+                # Near-duplicate of an earlier document: reuse its texts, scores and boxes
+                source = reusable[representative]
+                page_result = OCRPageResult(doc_path, texts=source.texts, scores=source.scores,
+                                            polys=source.polys)
+                save_ocr_outputs(page_result, "test_results", visualization=False)
+                time_saved += source.elapsed
+                reused += 1
+                print(f"✓ Near-duplicate of {os.path.basename(representative)}; reusing its result")
+            else:
+                page_result = test_basic_ocr(doc_path, output_dir="test_results", ocr=ocr)
+                if page_result and clusters is not None and clusters.needs_result(doc_path):
+                    page_result.raw_result = None
+                    reusable[doc_path] = page_result
             processing_time = time.time() - start_time
             
-            if success:
-                # Load results to get text count
-                json_path = os.path.join("test_results", 
-                                        os.path.splitext(doc_name)[0] + ".json")
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Calculate average confidence
-                confidences = [r['confidence'] for r in data['results']]
-                avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+            if page_result:
+                # Statistics come straight from the returned result
+                stats = page_result.stats
+                avg_confidence = stats.average
+                output_files = page_result.output_files
+                category_stats.setdefault(category, ScoreStats()).merge(stats)
+                run_stats.merge(stats)
                 
                 doc_result = {
                     "filename": doc_name,
                     "category": category,
                     "status": "success",
-                    "text_regions": len(data['results']),
+                    "text_regions": page_result.text_regions,
                     "avg_confidence": round(avg_confidence, 4),
+                    "total_characters": stats.total_characters,
+                    "confidence_distribution": stats.confidence_distribution(),
                     "processing_time": round(processing_time, 2),
+                    "duplicate_of": representative if representative in reusable else None,
                     "output_files": {
-                        "json": json_path,
-                        "txt": json_path.replace('.json', '.txt'),
-                        "image": json_path.replace('.json', '_annotated.jpg')
+                        "json": output_files.get("json"),
+                        "txt": output_files.get("txt"),
+                        "image": output_files.get("image")
                     }
                 }
                 
                 results_summary["successful"] += 1
-                print(f"✓ Success: {len(data['results'])} regions, "
+                if change_index is not None:
+                    change_index.mark_done(doc_path)
+                print(f"✓ Success: {page_result.text_regions} regions, "
                       f"Avg confidence: {avg_confidence:.2%}, "
                       f"Time: {processing_time:.2f}s")
             else:
@@ -99,6 +169,18 @@ def batch_process_documents():
                 results_summary["failed"] += 1
                 print(f"✗ Failed")
                 
+        except PageTimeout as e:
+            doc_result = {
+                "filename": doc_name,
+                "category": category,
+                "status": "timeout",
+                "error": str(e),
+                "processing_time": round(e.elapsed, 2)
+            }
+            results_summary["failed"] += 1
+            results_summary["timed_out"] += 1
+            print(f"✗ Timed out after {e.elapsed:.1f}s")
+            
         except Exception as e:
             processing_time = time.time() - start_time
             doc_result = {
@@ -113,10 +195,21 @@ def batch_process_documents():
         
         results_summary["documents"].append(doc_result)
     
+    if isinstance(ocr, SupervisedEngine):
+        results_summary["watchdog"] = ocr.stats()
+        ocr.close()
+    
+    if clusters is not None:
+        results_summary["dedup"] = clusters.summary(time_saved, reused)
+    
+    if change_index is not None:
+        change_index.save()
+    
     # Calculate statistics
     total_time = sum(d['processing_time'] for d in results_summary['documents'])
     results_summary["total_processing_time"] = round(total_time, 2)
     results_summary["avg_processing_time"] = round(total_time / len(all_documents), 2)
+    results_summary["region_statistics"] = run_stats.to_dict()
     
     # Save summary report
     summary_file = "test_results/BATCH_SUMMARY_REPORT.json"
@@ -127,7 +220,7 @@ def batch_process_documents():
     generate_text_report(results_summary)
     
     # Generate comparison table
-    generate_comparison_table(results_summary)
+    generate_comparison_table(results_summary, category_stats)
     
     print("\n" + "="*70)
     print("Batch Processing Complete!")
@@ -136,6 +229,12 @@ def batch_process_documents():
     print(f"  Total documents: {results_summary['total_documents']}")
     print(f"  Successful: {results_summary['successful']}")
     print(f"  Failed: {results_summary['failed']}")
+    if results_summary['timed_out']:
+        print(f"  Timed out: {results_summary['timed_out']}")
+    if clusters is not None:
+        dedup = results_summary["dedup"]
+        print(f"  Deduplicated: {dedup['reused']} of {dedup['duplicates']} ({dedup['dedupe_ratio']:.1%}), "
+              f"~{dedup['time_saved_seconds']:.2f}s saved")
     print(f"  Total time: {total_time:.2f}s")
     print(f"  Average time: {results_summary['avg_processing_time']:.2f}s per document")
     print(f"\nReports saved:")
@@ -159,6 +258,8 @@ def generate_text_report(results_summary):
         f.write(f"Total Documents: {results_summary['total_documents']}\n")
         f.write(f"Successful: {results_summary['successful']}\n")
         f.write(f"Failed: {results_summary['failed']}\n")
+        if results_summary.get('timed_out'):
+            f.write(f"Timed Out: {results_summary['timed_out']}\n")
         f.write(f"Success Rate: {results_summary['successful']/results_summary['total_documents']*100:.1f}%\n")
         f.write(f"Total Processing Time: {results_summary['total_processing_time']:.2f}s\n")
         f.write(f"Average Processing Time: {results_summary['avg_processing_time']:.2f}s\n\n")
@@ -184,15 +285,21 @@ def generate_text_report(results_summary):
                     f.write(f"  Text Regions: {doc['text_regions']}\n")
                     f.write(f"  Avg Confidence: {doc['avg_confidence']:.4f} ({doc['avg_confidence']*100:.2f}%)\n")
                     f.write(f"  Processing Time: {doc['processing_time']:.2f}s\n")
-                elif doc['status'] == 'error':
+                elif doc['status'] in ('error', 'timeout'):
                     f.write(f"  Error: {doc.get('error', 'Unknown')}\n")
                 
                 f.write("\n")
     
     print(f"✓ Text report saved to: {report_file}")
 
-def generate_comparison_table(results_summary):
-    """Generate markdown comparison table"""
+def generate_comparison_table(results_summary, category_stats=None):
+    """
+    Generate markdown comparison table
+    
+    Args:
+        results_summary: Batch summary dictionary
+        category_stats: Optional {category: ScoreStats} with region-level statistics
+    """
     
     table_file = "test_results/COMPARISON_TABLE.md"
     
@@ -250,6 +357,18 @@ def generate_comparison_table(results_summary):
             f.write(f"| {cat} | {stats['count']} | {success_rate:.0f}% | "
                    f"{avg_regions:.0f} | {avg_conf:.4f} | {avg_time:.2f} |\n")
         
+        if category_stats:
+            f.write("\n### Region-Level Confidence by Category\n\n")
+            f.write("| Category | Regions | Characters | Avg Confidence | Min | Max | High (≥0.9) | Medium (0.7-0.9) | Low (<0.7) |\n")
+            f.write("|----------|---------|------------|----------------|-----|-----|-------------|------------------|------------|\n")
+            
+            for cat, region_stats in sorted(category_stats.items()):
+                conf = region_stats.confidence_scores()
+                dist = list(region_stats.confidence_distribution().values())
+                f.write(f"| {cat} | {region_stats.count} | {region_stats.total_characters} | "
+                       f"{conf['average']:.4f} | {conf['min']:.4f} | {conf['max']:.4f} | "
+                       f"{dist[0]} | {dist[1]} | {dist[2]} |\n")
+        
         f.write("\n## Model Comparison Template\n\n")
         f.write("Use this table to compare with other OCR models:\n\n")
         f.write("| Model | Total Time (s) | Avg Time (s) | Avg Confidence | Success Rate | Notes |\n")
@@ -270,6 +389,54 @@ def generate_comparison_table(results_summary):
     
     print(f"✓ Comparison table saved to: {table_file}")
 
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Batch OCR testing over the test document set',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Default: test_documents/{tables,invoices,forms,papers,mixed}/*.jpg
+  python batch_test_all.py
+
+  # Walk a large corpus recursively, all image types, only new/changed files
+  python batch_test_all.py --root /data/scans --all-images --recursive --incremental
+
+  # Process a file list
+  find /data/scans -name "*.png" | python batch_test_all.py --manifest -
+        """
+    )
+    parser.add_argument('--root', action='append',
+                        help='Directory to scan (repeatable)')
+    parser.add_argument('--manifest',
+                        help='File listing document paths, one per line ("-" reads stdin)')
+    parser.add_argument('--all-images', action='store_true',
+                        help='Accept all image types instead of only .jpg')
+    parser.add_argument('--recursive', '-r', action='store_true',
+                        help='Scan subdirectories of the roots')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only process documents that are new or modified since the last run')
+    parser.add_argument('--page-timeout', type=float,
+                        help='Seconds allowed per document; runs OCR in a worker process that is '
+                             'killed and replaced on overrun, and records the document as timed out')
+    parser.add_argument('--dedup-threshold', type=int, nargs='?', const=4,
+                        help='OCR near-duplicate documents once: documents whose 64-bit perceptual hashes '
+                             'differ by at most this many bits share a result (default when given: 4)')
+    
+    args = parser.parse_args()
+    
+    batch_process_documents(
+        roots=args.root,
+        manifest=args.manifest,
+        extensions=IMAGE_EXTENSIONS if args.all_images else None,
+        recursive=args.recursive,
+        incremental=args.incremental,
+        page_timeout=args.page_timeout,
+        dedup_threshold=args.dedup_threshold
+    )
+
+
 if __name__ == "__main__":
-    batch_process_documents()
+    main()
 
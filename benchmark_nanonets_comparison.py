@@ -5,13 +5,25 @@ Tracks detailed performance metrics including time, memory, accuracy
 
 import os
 import sys
-import glob
 import json
 import time
 import csv
+import importlib.util
 from datetime import datetime
 from pathlib import Path
 
+from columnar_results import ColumnarPage
+from input_discovery import INDEX_FILENAME, ChangeIndex, discover_inputs, filter_changed
+from ocr_stats import DEFAULT_BUCKET_EDGES, ScoreStats, bucket_labels, parse_bucket_edges, rounded_scores
+from page_watchdog import PageTimeout, SupervisedEngine
+from result_stream import (
+    ResultStreamWriter,
+    build_page_record,
+    get_stream_path,
+    write_page_json,
+    write_page_text
+)
+
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
     try:
@@ -21,14 +33,22 @@ if sys.platform == 'win32':
     except Exception:
         pass
 
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
+# psutil is imported by PerformanceTracker when a benchmark actually runs
+PSUTIL_AVAILABLE = importlib.util.find_spec("psutil") is not None
+if not PSUTIL_AVAILABLE:
     print("Warning: psutil not available. Memory tracking will be limited.")
 
 
+# Image types picked up from the input directory
+BENCHMARK_EXTENSIONS = {'.png', '.jpg', '.jpeg'}
+
+# Pages between saves of the incremental input index
+INDEX_SAVE_INTERVAL = 100
+
+# Per-page fields that carry the full OCR payload rather than scalar metrics
+PAGE_PAYLOAD_FIELDS = ("extracted_texts", "confidence_list", "bounding_boxes")
+
+
 class PerformanceTracker:
     """Track performance metrics for OCR operations"""
     
@@ -37,7 +57,10 @@ class PerformanceTracker:
         self.end_time = None
         self.start_memory = None
         self.peak_memory = None
-        self.process = psutil.Process() if PSUTIL_AVAILABLE else None
+        self.process = None
+        if PSUTIL_AVAILABLE:
+            import psutil
+            self.process = psutil.Process()
     
     def start(self):
         """Start tracking"""
@@ -76,13 +99,82 @@ class PerformanceTracker:
         return metrics
 
 
-def perform_ocr_with_metrics(image_path, ocr_engine):
+class SummaryAggregator:
+    """
+    Accumulate per-page results for the summary report
+    
+    Keeps running totals plus one row per page. In lean mode the rows hold only
+    scalar metrics; texts, scores and boxes stay in the per-page outputs, so memory
+    does not grow with the amount of extracted text.
+    """
+    
+    def __init__(self, lean=False, bucket_edges=DEFAULT_BUCKET_EDGES):
+        self.lean = lean
+        self.region_stats = ScoreStats(bucket_edges)
+        self.pages = []
+        self.successful = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.refinement = {"pages": 0, "candidates": 0, "improved": 0, "errors": 0, "seconds": 0.0}
+        self.processing_seconds = 0.0
+        self.total_text_regions = 0
+        self.total_characters = 0
+        self.confidence_sum = 0.0
+    
+    @property
+    def total_images(self):
+        return self.successful + self.failed
+    
+    def add(self, image_path, result_data):
+        """Record one page and update the running totals"""
+        metrics = result_data["metrics"]
+        if self.lean:
+            metrics = {k: v for k, v in metrics.items() if k not in PAGE_PAYLOAD_FIELDS}
+        
+        self.pages.append({
+            "image_name": os.path.basename(image_path),
+            "image_path": image_path,
+            **metrics,
+            "performance": result_data["performance"]
+        })
+        self.processing_seconds += result_data["performance"].get("elapsed_time_seconds", 0.0)
+        
+        if metrics.get("success"):
+            self.successful += 1
+            self.total_text_regions += metrics.get("text_regions", 0)
+            self.total_characters += metrics.get("total_characters", 0)
+            self.confidence_sum += metrics.get("confidence_scores", {}).get("average", 0)
+            if result_data.get("stats") is not None:
+                self.region_stats += result_data["stats"]
+            refinement = metrics.get("refinement")
+            if refinement:
+                self.refinement["pages"] += 1
+                self.refinement["candidates"] += refinement["candidates"]
+                self.refinement["improved"] += refinement["improved"]
+                self.refinement["errors"] += int("error" in refinement)
+                self.refinement["seconds"] += refinement["seconds"]
+        else:
+            self.failed += 1
+            if metrics.get("timed_out"):
+                self.timed_out += 1
+
+
+def perform_ocr_with_metrics(image_path, ocr_engine, columnar=False, bucket_edges=DEFAULT_BUCKET_EDGES,
+                             refiner=None, bands=None):
     """
     Perform OCR on an image and track detailed metrics
     
     Args:
         image_path: Path to image file
         ocr_engine: Initialized PaddleOCR instance
+        columnar: Keep texts, scores and boxes as a ColumnarPage instead of
+                  nested Python lists in the metrics
+        bucket_edges: Confidence bucket edges for the distribution counts
+        refiner: Optional RegionRefiner that re-recognizes low-confidence
+                 regions at higher resolution before the metrics are computed
+        bands: Optional DocumentBands of the page's document; the running
+               header/footer come from its cache and only the lines that
+               change from page to page are OCRed
         
     Returns:
         Dictionary with OCR results and performance metrics
@@ -96,14 +188,14 @@ def perform_ocr_with_metrics(image_path, ocr_engine):
     
     try:
         # Perform OCR
-        result = ocr_engine.predict(image_path)
+        if bands is not None:
+            result = bands.predict(ocr_engine, image_path)
+        else:
+            result = ocr_engine.predict(image_path)
         
         # Update memory during processing
         tracker.update_peak_memory()
         
-        # Stop tracking
-        performance_metrics = tracker.stop()
-        
         # Process results
         if result and result[0]:
             ocr_result = result[0]
@@ -113,46 +205,70 @@ def perform_ocr_with_metrics(image_path, ocr_engine):
             scores = ocr_result.get('rec_scores', [])
             boxes = ocr_result.get('rec_polys', [])
             
-            # Calculate metrics
-            total_chars = sum(len(text) for text in texts)
-            avg_confidence = sum(scores) / len(scores) if scores else 0
-            min_confidence = min(scores) if scores else 0
-            max_confidence = max(scores) if scores else 0
+            # Second pass over the low-confidence regions only; if it fails the
+            # first-pass readings stand
+            refinement = None
+            if refiner is not None:
+                refine_start = time.perf_counter()
+                try:
+                    texts, scores, refinement = refiner.refine(image_path, texts, scores, boxes)
+                except Exception as e:
+                    refinement = {"threshold": refiner.threshold, "candidates": 0, "improved": 0,
+                                  "source": None, "seconds": round(time.perf_counter() - refine_start, 4),
+                                  "error": str(e)[:200]}
+                    print(f"⚠ Refinement failed, keeping first-pass readings: {str(e)[:100]}")
+            
+            # Stop tracking (page time includes the refinement pass)
+            performance_metrics = tracker.stop()
+            if refinement is not None:
+                performance_metrics["refine_time_seconds"] = refinement["seconds"]
             
-            # Count high/medium/low confidence predictions
-            high_conf = sum(1 for s in scores if s >= 0.9)
-            medium_conf = sum(1 for s in scores if 0.7 <= s < 0.9)
-            low_conf = sum(1 for s in scores if s < 0.7)
+            # Calculate metrics (one vectorized pass over the score array)
+            stats = ScoreStats.from_arrays(scores, texts, edges=bucket_edges)
+            total_chars = stats.total_characters
+            avg_confidence = stats.average
             
             ocr_metrics = {
                 "success": True,
                 "text_regions": len(texts),
                 "total_characters": total_chars,
-                "confidence_scores": {
-                    "average": round(avg_confidence, 4),
-                    "min": round(min_confidence, 4),
-                    "max": round(max_confidence, 4)
-                },
-                "confidence_distribution": {
-                    "high (≥0.9)": high_conf,
-                    "medium (0.7-0.9)": medium_conf,
-                    "low (<0.7)": low_conf
-                },
-                "extracted_texts": texts,
-                "confidence_list": [round(s, 4) for s in scores],
-                "bounding_boxes": [box.tolist() if hasattr(box, 'tolist') else list(box) for box in boxes]
+                "confidence_scores": stats.confidence_scores(),
+                "confidence_distribution": stats.confidence_distribution(),
             }
+            if refinement is not None:
+                ocr_metrics["refinement"] = refinement
+            if bands is not None:
+                ocr_metrics["bands"] = ocr_result["bands"]
+            
+            columns = None
+            if columnar:
+                columns = ColumnarPage.from_ocr_result(texts, scores, boxes)
+            else:
+                ocr_metrics.update({
+                    "extracted_texts": texts,
+                    "confidence_list": rounded_scores(scores),
+                    "bounding_boxes": [box.tolist() if hasattr(box, 'tolist') else list(box) for box in boxes]
+                })
             
             print(f"✓ Text regions detected: {len(texts)}")
             print(f"✓ Total characters: {total_chars}")
             print(f"✓ Average confidence: {avg_confidence:.2%}")
             print(f"✓ Processing time: {performance_metrics['elapsed_time_ms']:.2f} ms")
+            if bands is not None:
+                band_info = ocr_result["bands"]
+                print(f"✓ Header/footer: {band_info['band_regions']} regions "
+                      f"{'from the document cache' if band_info['cached'] else 'recognized and cached'}")
+            if refinement and refinement["candidates"]:
+                print(f"✓ Refined {refinement['improved']}/{refinement['candidates']} low-confidence regions "
+                      f"({refinement['source']}, {refinement['seconds'] * 1000:.0f} ms)")
             if PSUTIL_AVAILABLE:
                 print(f"✓ Peak memory: {performance_metrics['peak_memory_mb']:.2f} MB")
             
             return {
                 "ocr_result": ocr_result,
                 "metrics": ocr_metrics,
+                "columns": columns,
+                "stats": stats,
                 "performance": performance_metrics
             }
         else:
@@ -169,6 +285,20 @@ def perform_ocr_with_metrics(image_path, ocr_engine):
                 "performance": performance_metrics
             }
             
+    except PageTimeout as e:
+        performance_metrics = tracker.stop()
+        print(f"✗ Timed out after {e.elapsed:.1f}s")
+        
+        return {
+            "ocr_result": None,
+            "metrics": {
+                "success": False,
+                "timed_out": True,
+                "error": f"Timed out after {e.elapsed:.1f}s"
+            },
+            "performance": performance_metrics
+        }
+    
     except Exception as e:
         performance_metrics = tracker.stop()
         print(f"✗ Error: {e}")
@@ -183,7 +313,28 @@ def perform_ocr_with_metrics(image_path, ocr_engine):
         }
 
 
-def save_results(image_path, result_data, output_dir):
+def reuse_result(result_data, representative):
+    """
+    Result for a near-duplicate page, taken from its cluster representative
+    
+    Clusters only hold pages of one pixel size, so the bounding boxes apply
+    as they are. The OCR payload and statistics are shared; the performance entry records
+    no processing time, and the metrics note the source page and the OCR
+    time the reuse saved.
+    """
+    metrics = dict(result_data["metrics"])
+    metrics["duplicate_of"] = representative
+    metrics["reused_time_seconds"] = result_data["performance"]["elapsed_time_seconds"]
+    return {
+        "ocr_result": None,
+        "metrics": metrics,
+        "columns": result_data.get("columns"),
+        "stats": result_data.get("stats"),
+        "performance": {"elapsed_time_seconds": 0.0, "elapsed_time_ms": 0.0}
+    }
+
+
+def save_results(image_path, result_data, output_dir, stream_writer=None, columnar_format="npz"):
     """
     Save OCR results in multiple formats
     
@@ -191,69 +342,94 @@ def save_results(image_path, result_data, output_dir):
         image_path: Path to source image
         result_data: Dictionary with OCR results and metrics
         output_dir: Directory to save results
+        stream_writer: Optional ResultStreamWriter; when given, the page is appended
+                       to the JSONL stream instead of writing per-page JSON/TXT files
+        columnar_format: File type for columnar payloads ('npz' or 'arrow')
     """
     os.makedirs(output_dir, exist_ok=True)
     
     basename = os.path.basename(image_path)
     name_without_ext = os.path.splitext(basename)[0]
     
+    record = build_page_record(image_path, result_data)
+    
+    # Columnar payloads go to their own binary file; the record only references it
+    columns = result_data.get("columns")
+    if columns is not None:
+        columns_file = os.path.join(output_dir, f"{name_without_ext}.{columnar_format}")
+        columns.save(columns_file)
+        record["columns_file"] = columns_file
+        print(f"  → Saved columns: {columns_file}")
+    
+    if stream_writer is not None:
+        stream_writer.write(record)
+        print(f"  → Appended to stream: {stream_writer.path}")
+        return
+    
     # 1. Save comprehensive JSON with all metrics
     json_file = os.path.join(output_dir, f"{name_without_ext}.json")
-    output_data = {
-        "timestamp": datetime.now().isoformat(),
-        "source_image": str(image_path),
-        "image_name": basename,
-        "ocr_metrics": result_data["metrics"],
-        "performance_metrics": result_data["performance"]
-    }
-    
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    write_page_json(record, json_file)
     
     print(f"  → Saved JSON: {json_file}")
     
     # 2. Save plain text extraction
     if result_data["metrics"].get("success"):
         txt_file = os.path.join(output_dir, f"{name_without_ext}.txt")
-        with open(txt_file, 'w', encoding='utf-8') as f:
-            f.write(f"OCR Results for: {basename}\n")
-            f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-            f.write("="*70 + "\n\n")
-            
-            texts = result_data["metrics"]["extracted_texts"]
-            confidences = result_data["metrics"]["confidence_list"]
-            
-            f.write("EXTRACTED TEXT:\n")
-            f.write("-"*70 + "\n")
-            for text in texts:
-                f.write(f"{text}\n")
-            
-            f.write("\n" + "="*70 + "\n")
-            f.write("DETAILED RESULTS WITH CONFIDENCE:\n")
-            f.write("="*70 + "\n\n")
-            
-            for idx, (text, conf) in enumerate(zip(texts, confidences), 1):
-                f.write(f"{idx:3d}. [{conf:.4f}] {text}\n")
+        if columns is not None:
+            write_page_text(record, txt_file, texts=columns.texts, confidences=columns.scores)
+        else:
+            write_page_text(record, txt_file)
         
         print(f"  → Saved TXT: {txt_file}")
         
-        # 3. Save annotated visualization
-        try:
-            viz_file = os.path.join(output_dir, f"{name_without_ext}_annotated.jpg")
-            result_data["ocr_result"].save_to_img(viz_file)
-            print(f"  → Saved Visualization: {viz_file}")
-        except Exception as e:
-            print(f"  ⚠ Could not save visualization: {e}")
+        # 3. Save annotated visualization (not for results reused from another page
+        #    or stitched from band crops, which have no page image to draw on, nor
+        #    for refined pages, whose drawing would show the first-pass readings)
+        refined = (result_data["metrics"].get("refinement") or {}).get("improved")
+        if refined:
+            print(f"  → Skipped visualization: {refined} regions were refined after the first pass")
+        elif hasattr(result_data.get("ocr_result"), "save_to_img"):
+            try:
+                viz_file = os.path.join(output_dir, f"{name_without_ext}_annotated.jpg")
+                result_data["ocr_result"].save_to_img(viz_file)
+                print(f"  → Saved Visualization: {viz_file}")
+            except Exception as e:
+                print(f"  ⚠ Could not save visualization: {e}")
 
 
 def benchmark_all_pages(input_dir="test_documents/nanonets_comparison", 
-                        output_dir="test_results/nanonets_comparison"):
+                        output_dir="test_results/nanonets_comparison",
+                        output_mode="files", compress=False, result_format="json",
+                        lean_summary=False, bucket_edges=DEFAULT_BUCKET_EDGES,
+                        manifest=None, recursive=False, incremental=False, page_timeout=None,
+                        refine=False, refine_dpi=600, dedup_threshold=None, cache_bands=False):
     """
     Run benchmark on all extracted pages
     
     Args:
         input_dir: Directory with extracted page images
         output_dir: Directory to save results
+        output_mode: 'files' writes JSON/TXT/JPG per page, 'jsonl' appends one
+                     compact record per page to a single result stream
+        compress: Gzip-compress the JSONL stream (jsonl mode only)
+        result_format: 'json' keeps texts/scores/boxes inline, 'npz' or 'arrow'
+                       stores them as a columnar file per page
+        lean_summary: Keep only scalar per-page metrics for the summary instead of
+                      every page's texts, scores and boxes (implied by jsonl mode)
+        bucket_edges: Confidence bucket edges for the distribution counts
+        manifest: Optional file with one image path per line ('-' for stdin)
+        recursive: Scan subdirectories of input_dir
+        incremental: Skip images unchanged since the last run (index kept in output_dir)
+        page_timeout: Seconds allowed per page; inference then runs in a worker
+                      process that is killed and replaced when a page overruns
+        refine: Re-recognize regions below the lowest confidence bucket edge from
+                a high-resolution re-render (source PDF) or upsampled crop
+        refine_dpi: Render resolution for refined regions of PDF-extracted pages
+        dedup_threshold: Cluster near-duplicate pages whose perceptual hashes
+                         differ by at most this many bits; each cluster is OCRed
+                         once and the result reused (None disables)
+        cache_bands: OCR running headers/footers of PDF-extracted documents once
+                     per document and only the page body on every page
     """
     print("\n" + "="*70)
     print("PaddleOCR Benchmark - Nanonets Comparison")
@@ -261,47 +437,78 @@ def benchmark_all_pages(input_dir="test_documents/nanonets_comparison",
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
     
-    # Find all images
-    image_patterns = [
-        os.path.join(input_dir, "*.png"),
-        os.path.join(input_dir, "*.jpg"),
-        os.path.join(input_dir, "*.jpeg")
-    ]
-    
-    all_images = []
-    for pattern in image_patterns:
-        all_images.extend(glob.glob(pattern))
-    
-    all_images = sorted(all_images)
+    # Find all images (manifest and/or directory scan, optionally only changed files)
+    change_index = ChangeIndex(os.path.join(output_dir, INDEX_FILENAME)) if incremental else None
+    roots = [input_dir] if input_dir else []
+    discovered = discover_inputs(roots, manifest=manifest, extensions=BENCHMARK_EXTENSIONS,
+                                 recursive=recursive)
+    all_images = list(filter_changed(discovered, change_index))
     
     if not all_images:
-        print(f"\n✗ No images found in {input_dir}")
-        print("\nPlease run: python extract_pdf_pages.py --pages \"<page_numbers>\"")
+        if change_index is not None and change_index.entries:
+            print(f"\n✓ No new or modified images in {input_dir} - nothing to do")
+        else:
+            print(f"\n✗ No images found in {input_dir}")
+            print("\nPlease run: python extract_pdf_pages.py --pages \"<page_numbers>\"")
         return None
     
     print(f"\nFound {len(all_images)} images to process")
     
+    # Near-duplicate pre-pass: OCR runs once per cluster
+    clusters = None
+    if dedup_threshold is not None:
+        from page_dedup import DuplicateClusters
+        clusters = DuplicateClusters.build(all_images, threshold=dedup_threshold)
+        print(f"✓ Near-duplicates: {clusters.duplicates} of {len(all_images)} pages reuse another page's result "
+              f"({len(clusters.members)} clusters, hashed in {clusters.hash_seconds:.2f}s)")
+    
+    # Running header/footer pre-pass over pages rendered from the same PDF
+    planner = None
+    if cache_bands:
+        from page_bands import BandPlanner
+        planner = BandPlanner.build(all_images)
+        print(f"✓ Running headers/footers: {len(planner.documents)} documents, {planner.pages} pages "
+              f"OCR only their body (detected in {planner.detect_seconds:.2f}s)")
+    
     # Initialize PaddleOCR
     print("\nInitializing PaddleOCR (PP-OCRv5)...")
     try:
-        from paddleocr import PaddleOCR
+        from ocr_api import create_ocr_engine
         
         init_start = time.time()
-        ocr = PaddleOCR(
-            use_textline_orientation=True,
-            lang='en'
-        )
+        if page_timeout:
+            ocr = SupervisedEngine("ocr", timeout=page_timeout, lang='en', use_textline_orientation=True)
+            ocr.wait_ready()
+        else:
+            ocr = create_ocr_engine(lang='en', use_textline_orientation=True)
         init_time = time.time() - init_start
         print(f"✓ PaddleOCR initialized in {init_time:.2f}s")
+        if page_timeout:
+            print(f"✓ Per-page timeout: {page_timeout:.0f}s (supervised worker process)")
     except Exception as e:
         print(f"✗ Failed to initialize PaddleOCR: {e}")
         return None
     
+    refiner = None
+    if refine:
+        from region_refine import RegionRefiner
+        refiner = RegionRefiner(threshold=bucket_edges[0], dpi=refine_dpi)
+        print(f"✓ Refining regions below {bucket_edges[0]:.2f} confidence "
+              f"(PDF pages re-rendered at {refine_dpi} DPI)")
+    
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
     
+    # Open the result stream when running in JSONL mode
+    stream_writer = None
+    if output_mode == "jsonl":
+        stream_path = get_stream_path(output_dir, compress)
+        stream_writer = ResultStreamWriter(stream_path, append=incremental)
+        print(f"\nStreaming page results to: {stream_path}")
+    
     # Process each image
-    all_results = []
+    aggregator = SummaryAggregator(lean=lean_summary or stream_writer is not None,
+                                   bucket_edges=bucket_edges)
     total_tracker = PerformanceTracker()
     total_tracker.start()
     
@@ -309,34 +516,74 @@ def benchmark_all_pages(input_dir="test_documents/nanonets_comparison",
     print("Processing Images")
     print("="*70)
     
+    reusable = {}
+    time_saved = 0.0
+    reused = 0
+    
     for idx, image_path in enumerate(all_images, 1):
         print(f"\n[{idx}/{len(all_images)}] {os.path.basename(image_path)}")
         print("="*70)
         
-        # Perform OCR with metrics
-        result_data = perform_ocr_with_metrics(image_path, ocr)
+        representative = clusters.representative_of(image_path) if clusters is not None else None
+        if representative is not None and representative in reusable:
+            # Near-duplicate of an earlier page: reuse its result
+            result_data = reuse_result(reusable[representative], representative)
+            time_saved += result_data["metrics"]["reused_time_seconds"]
+            reused += 1
+            print(f"✓ Near-duplicate of {os.path.basename(representative)}; reusing its result")
+        else:
+            # Perform OCR with metrics
+            result_data = perform_ocr_with_metrics(image_path, ocr, columnar=result_format != "json",
+                                                   bucket_edges=bucket_edges, refiner=refiner,
+                                                   bands=planner.document_of(image_path) if planner else None)
+            if clusters is not None and clusters.needs_result(image_path) and result_data["metrics"].get("success"):
+                # Keep the payload, not the raw result with its decoded images; duplicates
+                # of a failed, timed-out or empty page are OCRed themselves
+                reusable[image_path] = {k: v for k, v in result_data.items() if k != "ocr_result"}
         
         # Save results
-        save_results(image_path, result_data, output_dir)
+        save_results(image_path, result_data, output_dir, stream_writer=stream_writer,
+                     columnar_format=result_format)
+        
+        # Remember successfully processed inputs for incremental reruns
+        if change_index is not None and result_data["metrics"].get("success"):
+            change_index.mark_done(image_path)
+            if idx % INDEX_SAVE_INTERVAL == 0:
+                change_index.save()
         
         # Store for summary
-        all_results.append({
-            "image_name": os.path.basename(image_path),
-            "image_path": image_path,
-            **result_data["metrics"],
-            "performance": result_data["performance"]
-        })
+        aggregator.add(image_path, result_data)
+        del result_data
     
     total_metrics = total_tracker.stop()
     
+    if isinstance(ocr, SupervisedEngine):
+        total_metrics["watchdog"] = ocr.stats()
+        ocr.close()
+    
+    if clusters is not None:
+        total_metrics["dedup"] = clusters.summary(time_saved, reused)
+    
+    if planner is not None:
+        total_metrics["bands"] = planner.summary()
+    
+    if stream_writer is not None:
+        stream_writer.close()
+    
+    if change_index is not None:
+        change_index.save()
+    
     # Generate summary report
-    summary = generate_summary_report(all_results, total_metrics, output_dir)
+    summary = generate_summary_report(
+        aggregator, total_metrics, output_dir,
+        result_stream=stream_writer.path if stream_writer is not None else None
+    )
     
     # Generate comparison report
     generate_comparison_report(summary, output_dir)
     
     # Generate CSV export
-    generate_csv_export(all_results, output_dir)
+    generate_csv_export(aggregator.pages, output_dir, bucket_edges=bucket_edges)
     
     print("\n" + "="*70)
     print("Benchmark Complete!")
@@ -344,25 +591,38 @@ def benchmark_all_pages(input_dir="test_documents/nanonets_comparison",
     print(f"\nProcessed: {len(all_images)} images")
     print(f"Total time: {total_metrics['elapsed_time_seconds']:.2f}s")
     print(f"Average time per page: {total_metrics['elapsed_time_seconds']/len(all_images):.2f}s")
+    if aggregator.timed_out:
+        print(f"Timed out: {aggregator.timed_out} page(s) (see 'timed_out' in the summary)")
+    if clusters is not None:
+        dedup = total_metrics["dedup"]
+        print(f"Deduplicated: {dedup['reused']} of {dedup['duplicates']} near-duplicate pages reused "
+              f"their representative's result, saving ~{dedup['time_saved_seconds']:.2f}s")
+    if planner is not None:
+        bands = total_metrics["bands"]
+        print(f"Header/footer cache: {bands['pages']} pages in {bands['documents']} documents, "
+              f"~{bands['estimated_time_saved_seconds']:.2f}s saved")
+    if refiner is not None:
+        refinement = aggregator.refinement
+        print(f"Refined: {refinement['improved']}/{refinement['candidates']} low-confidence regions "
+              f"improved in {refinement['seconds']:.2f}s")
+        if refinement['errors']:
+            print(f"Refinement failed on {refinement['errors']} page(s); their first-pass readings were kept")
     print(f"\nResults saved to: {output_dir}")
     
     return summary
 
 
-def generate_summary_report(all_results, total_metrics, output_dir):
-    """Generate comprehensive summary report"""
+def generate_summary_report(aggregator, total_metrics, output_dir, result_stream=None):
+    """Generate comprehensive summary report from a SummaryAggregator"""
     
-    successful = [r for r in all_results if r.get("success")]
-    failed = [r for r in all_results if not r.get("success")]
+    # Aggregate statistics come from the running totals
+    total_text_regions = aggregator.total_text_regions
+    total_characters = aggregator.total_characters
     
-    # Calculate aggregate statistics
-    total_text_regions = sum(r.get("text_regions", 0) for r in successful)
-    total_characters = sum(r.get("total_characters", 0) for r in successful)
-    
-    if successful:
-        avg_confidence = sum(r.get("confidence_scores", {}).get("average", 0) for r in successful) / len(successful)
-        avg_regions_per_page = total_text_regions / len(successful)
-        avg_chars_per_page = total_characters / len(successful)
+    if aggregator.successful:
+        avg_confidence = aggregator.confidence_sum / aggregator.successful
+        avg_regions_per_page = total_text_regions / aggregator.successful
+        avg_chars_per_page = total_characters / aggregator.successful
     else:
         avg_confidence = 0
         avg_regions_per_page = 0
@@ -372,25 +632,47 @@ def generate_summary_report(all_results, total_metrics, output_dir):
         "test_info": {
             "timestamp": datetime.now().isoformat(),
             "ocr_engine": "PaddleOCR v3.3.0 (PP-OCRv5) - (PaddleOCR-VL)",
-            "total_images": len(all_results),
-            "successful": len(successful),
-            "failed": len(failed)
+            "total_images": aggregator.total_images,
+            "successful": aggregator.successful,
+            "failed": aggregator.failed,
+            "timed_out": aggregator.timed_out
         },
         "aggregate_metrics": {
             "total_text_regions": total_text_regions,
             "total_characters": total_characters,
             "average_confidence": round(avg_confidence, 4),
             "average_regions_per_page": round(avg_regions_per_page, 2),
-            "average_characters_per_page": round(avg_chars_per_page, 2)
+            "average_characters_per_page": round(avg_chars_per_page, 2),
+            "region_confidence_scores": aggregator.region_stats.confidence_scores(),
+            "confidence_distribution": aggregator.region_stats.confidence_distribution()
         },
         "performance_metrics": {
             "total_processing_time_seconds": total_metrics["elapsed_time_seconds"],
-            "average_time_per_page_seconds": round(total_metrics["elapsed_time_seconds"] / len(all_results), 4),
-            "average_time_per_page_ms": round((total_metrics["elapsed_time_seconds"] / len(all_results)) * 1000, 2)
+            "average_time_per_page_seconds": round(total_metrics["elapsed_time_seconds"] / aggregator.total_images, 4),
+            "average_time_per_page_ms": round((total_metrics["elapsed_time_seconds"] / aggregator.total_images) * 1000, 2)
         },
-        "detailed_results": all_results
+        "detailed_results": aggregator.pages
     }
     
+    if result_stream:
+        summary["result_stream"] = result_stream
+    
+    if "watchdog" in total_metrics:
+        summary["watchdog"] = total_metrics["watchdog"]
+    
+    if "dedup" in total_metrics:
+        summary["dedup"] = total_metrics["dedup"]
+    
+    if "bands" in total_metrics:
+        summary["bands"] = total_metrics["bands"]
+    
+    if aggregator.refinement["pages"]:
+        refinement = dict(aggregator.refinement, seconds=round(aggregator.refinement["seconds"], 2))
+        # Page times include their refinement pass
+        refinement["share_of_processing_time"] = round(
+            refinement["seconds"] / max(aggregator.processing_seconds, 1e-9), 4)
+        summary["refinement"] = refinement
+    
     if PSUTIL_AVAILABLE:
         summary["performance_metrics"].update({
             "peak_memory_mb": total_metrics.get("peak_memory_mb", 0),
@@ -491,11 +773,18 @@ def generate_comparison_report(summary, output_dir):
     print(f"✓ Comparison report saved: {report_file}")
 
 
-def generate_csv_export(all_results, output_dir):
+def generate_csv_export(all_results, output_dir, bucket_edges=DEFAULT_BUCKET_EDGES):
     """Generate CSV export for easy spreadsheet analysis"""
     
     csv_file = os.path.join(output_dir, "performance_metrics.csv")
     
+    # Confidence buckets, highest first: "high (≥0.9)" -> "High Conf (≥0.9)"
+    labels = list(reversed(bucket_labels(bucket_edges)))
+    bucket_columns = []
+    for label in labels:
+        name, bounds = label.split(' ', 1)
+        bucket_columns.append(f"{name.capitalize()} Conf {bounds}")
+    
     with open(csv_file, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         
@@ -508,9 +797,7 @@ def generate_csv_export(all_results, output_dir):
             "Avg Confidence",
             "Min Confidence",
             "Max Confidence",
-            "High Conf (≥0.9)",
-            "Medium Conf (0.7-0.9)",
-            "Low Conf (<0.7)",
+            *bucket_columns,
             "Processing Time (s)",
             "Processing Time (ms)"
         ]
@@ -536,12 +823,10 @@ def generate_csv_export(all_results, output_dir):
                     conf_scores.get('average', 0),
                     conf_scores.get('min', 0),
                     conf_scores.get('max', 0),
-                    conf_dist.get('high (≥0.9)', 0),
-                    conf_dist.get('medium (0.7-0.9)', 0),
-                    conf_dist.get('low (<0.7)', 0)
+                    *(conf_dist.get(label, 0) for label in labels)
                 ])
             else:
-                row.extend([0, 0, 0, 0, 0, 0, 0, 0])
+                row.extend([0] * (5 + len(labels)))
             
             perf = result['performance']
             row.extend([
@@ -575,11 +860,62 @@ def main():
     parser.add_argument('--output', '-o',
                         default='test_results/nanonets_comparison',
                         help='Output directory for results')
+    parser.add_argument('--manifest',
+                        help='File listing image paths, one per line ("-" reads stdin); '
+                             'combined with --input unless --input is ""')
+    parser.add_argument('--recursive', '-r', action='store_true',
+                        help='Scan subdirectories of the input directory')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only process images that are new or modified since the last run')
+    parser.add_argument('--output-mode', choices=['files', 'jsonl'], default='files',
+                        help='Per-page JSON/TXT/JPG files, or one JSONL stream for all pages (default: files)')
+    parser.add_argument('--compress', action='store_true',
+                        help='Gzip-compress the JSONL stream (with --output-mode jsonl)')
+    parser.add_argument('--lean-summary', action='store_true',
+                        help='Keep only scalar per-page metrics in the summary (implied by --output-mode jsonl)')
+    parser.add_argument('--confidence-buckets', default='0.7,0.9',
+                        help='Comma-separated confidence bucket edges (default: 0.7,0.9)')
+    parser.add_argument('--result-format', choices=['json', 'npz', 'arrow'], default='json',
+                        help='Store texts/scores/boxes inline as JSON, or as a columnar file per page (default: json)')
+    parser.add_argument('--page-timeout', type=float,
+                        help='Seconds allowed per page; runs inference in a worker process that is '
+                             'killed and replaced on overrun, and records the page as timed out')
+    parser.add_argument('--refine-low-confidence', action='store_true',
+                        help='Re-recognize only regions below the lowest confidence bucket edge, '
+                             'from a high-resolution re-render of the source PDF or an upsampled crop')
+    parser.add_argument('--refine-dpi', type=int, default=600,
+                        help='Render resolution for refined regions of PDF-extracted pages (default: 600)')
+    parser.add_argument('--dedup-threshold', type=int, nargs='?', const=4,
+                        help='OCR near-duplicate pages once: pages whose 64-bit perceptual hashes differ by '
+                             'at most this many bits share a result (default when given: 4). Pages that '
+                             'differ only in small text (e.g. filled-in fields) can fall under the threshold')
+    parser.add_argument('--cache-bands', action='store_true',
+                        help='For pages extracted from the same PDF, OCR the running header/footer once per '
+                             'document and only the page body on every page')
     
     args = parser.parse_args()
     
+    try:
+        bucket_edges = parse_bucket_edges(args.confidence_buckets)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
     # Run benchmark
-    summary = benchmark_all_pages(args.input, args.output)
+    summary = benchmark_all_pages(args.input, args.output,
+                                  output_mode=args.output_mode,
+                                  compress=args.compress,
+                                  result_format=args.result_format,
+                                  lean_summary=args.lean_summary,
+                                  bucket_edges=bucket_edges,
+                                  manifest=args.manifest,
+                                  recursive=args.recursive,
+                                  incremental=args.incremental,
+                                  page_timeout=args.page_timeout,
+                                  refine=args.refine_low_confidence,
+                                  refine_dpi=args.refine_dpi,
+                                  dedup_threshold=args.dedup_threshold,
+                                  cache_bands=args.cache_bands)
     
     if summary:
         print("\n" + "="*70)
@@ -589,7 +925,11 @@ def main():
         print(f"  - {args.output}/nanonets_comparison_results.json")
         print(f"  - {args.output}/NANONETS_COMPARISON_REPORT.md")
         print(f"  - {args.output}/performance_metrics.csv")
-        print(f"  - Individual page results (JSON, TXT, annotated images)")
+        if args.output_mode == "jsonl":
+            print(f"  - {summary['result_stream']} (one record per page)")
+            print(f"    Derive per-page files with: python result_stream.py {summary['result_stream']}")
+        else:
+            print(f"  - Individual page results (JSON, TXT, annotated images)")
         print("\n" + "="*70)
         print("Next Steps:")
         print("="*70)
@@ -0,0 +1,295 @@
+"""
+Columnar OCR Results
+Store polygons, scores and texts of a page as flat NumPy columns (.npz) or Arrow IPC files,
+with converters to and from the per-page JSON schema
+"""
+
+import os
+import sys
+import json
+import argparse
+import importlib.util
+
+import numpy as np
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'replace')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
+    except Exception:
+        pass
+
+# pyarrow is only imported when Arrow files are read or written
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+
+COLUMN_NAMES = ("poly_points", "poly_offsets", "scores", "text_buffer", "text_offsets")
+
+
+def _offsets_from_lengths(lengths):
+    """Turn a sequence of lengths into an (N+1,) offsets array"""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    if len(lengths):
+        np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _smallest_coord_dtype(points):
+    """Use int16 when every coordinate fits, int32 otherwise"""
+    if points.size == 0:
+        return np.int16
+    info = np.iinfo(np.int16)
+    if points.min() >= info.min and points.max() <= info.max:
+        return np.int16
+    return np.int32
+
+
+class ColumnarPage:
+    """
+    OCR result of one page held as flat columns
+
+    Polygons are stored as one (M, 2) point array plus (N+1,) offsets so that
+    quads and longer polygons share the same layout; texts are one UTF-8 buffer
+    plus (N+1,) byte offsets. Individual rows are decoded only when accessed.
+    """
+
+    def __init__(self, poly_points, poly_offsets, scores, text_buffer, text_offsets):
+        self.poly_points = poly_points
+        self.poly_offsets = poly_offsets
+        self.scores = scores
+        self.text_buffer = text_buffer
+        self.text_offsets = text_offsets
+
+    def __len__(self):
+        return len(self.scores)
+
+    @classmethod
+    def from_ocr_result(cls, texts, scores, polys):
+        """
+        Build columns from PaddleOCR rec_texts / rec_scores / rec_polys
+
+        Args:
+            texts: Sequence of recognized strings
+            scores: Sequence or array of confidence scores
+            polys: Sequence of (K, 2) polygons (arrays or nested lists)
+
+        Returns:
+            ColumnarPage instance
+        """
+        encoded = [text.encode('utf-8') for text in texts]
+        text_offsets = _offsets_from_lengths([len(b) for b in encoded])
+        text_buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        poly_arrays = [np.asarray(poly).reshape(-1, 2) for poly in polys]
+        poly_offsets = _offsets_from_lengths([len(p) for p in poly_arrays])
+        if poly_arrays:
+            points = np.concatenate(poly_arrays)
+            points = np.rint(points) if points.dtype.kind == 'f' else points
+            poly_points = points.astype(_smallest_coord_dtype(points))
+        else:
+            poly_points = np.zeros((0, 2), dtype=np.int16)
+
+        return cls(
+            poly_points=poly_points,
+            poly_offsets=poly_offsets,
+            scores=np.asarray(scores, dtype=np.float32).reshape(-1),
+            text_buffer=text_buffer,
+            text_offsets=text_offsets
+        )
+
+    @classmethod
+    def from_json_fields(cls, metrics):
+        """Build columns from the extracted_texts / confidence_list / bounding_boxes schema"""
+        return cls.from_ocr_result(
+            metrics.get("extracted_texts", []),
+            metrics.get("confidence_list", []),
+            metrics.get("bounding_boxes", [])
+        )
+
+    def text(self, index):
+        """Decode a single text row"""
+        start, end = self.text_offsets[index], self.text_offsets[index + 1]
+        return bytes(self.text_buffer[start:end]).decode('utf-8')
+
+    def poly(self, index):
+        """Return a single polygon as a (K, 2) view into the point column"""
+        start, end = self.poly_offsets[index], self.poly_offsets[index + 1]
+        return self.poly_points[start:end]
+
+    @property
+    def texts(self):
+        """All texts decoded as a list of strings"""
+        return [self.text(i) for i in range(len(self.text_offsets) - 1)]
+
+    @property
+    def polys(self):
+        """All polygons as (K, 2) views"""
+        return [self.poly(i) for i in range(len(self.poly_offsets) - 1)]
+
+    def to_json_fields(self, score_digits=4):
+        """
+        Convert back to the per-page JSON schema
+
+        Args:
+            score_digits: Rounding applied to confidence_list, as in the JSON output
+
+        Returns:
+            Dictionary with extracted_texts, confidence_list and bounding_boxes
+        """
+        return {
+            "extracted_texts": self.texts,
+            "confidence_list": [round(float(s), score_digits) for s in self.scores],
+            "bounding_boxes": [poly.tolist() for poly in self.polys]
+        }
+
+    def save_npz(self, path, compressed=False):
+        """
+        Save columns as an .npz archive
+
+        Uncompressed archives are the default: they are larger than the compressed
+        variant but each column loads with a single read and no inflate step.
+        """
+        save = np.savez_compressed if compressed else np.savez
+        save(path, **{name: getattr(self, name) for name in COLUMN_NAMES})
+
+    @classmethod
+    def load_npz(cls, path):
+        """Load columns from an .npz archive"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{name: data[name] for name in COLUMN_NAMES})
+
+    def save_arrow(self, path):
+        """Save columns as an Arrow IPC file (requires pyarrow)"""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow output: pip install pyarrow")
+        import pyarrow as pa
+
+        text_offsets = pa.array(self.text_offsets.astype(np.int32))
+        poly_offsets = pa.array(self.poly_offsets.astype(np.int32))
+
+        texts = pa.StringArray.from_buffers(
+            len(self), text_offsets.buffers()[1], pa.py_buffer(self.text_buffer)
+        )
+        points = pa.FixedSizeListArray.from_arrays(
+            pa.array(self.poly_points.reshape(-1)), 2
+        )
+        polys = pa.ListArray.from_arrays(poly_offsets, points)
+
+        table = pa.table({"text": texts, "score": pa.array(self.scores), "poly": polys})
+        with pa.OSFile(path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    @classmethod
+    def load_arrow(cls, path):
+        """Load columns from an Arrow IPC file through a memory map (requires pyarrow)"""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow input: pip install pyarrow")
+        import pyarrow as pa
+
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+
+        texts = table.column("text").combine_chunks()
+        polys = table.column("poly").combine_chunks()
+        points = polys.flatten().flatten()
+
+        # Arrays are views on the mapped file when no nulls or offsets force a copy
+        return cls(
+            poly_points=points.to_numpy(zero_copy_only=False).reshape(-1, 2),
+            poly_offsets=polys.offsets.to_numpy().astype(np.int64),
+            scores=table.column("score").combine_chunks().to_numpy(),
+            text_buffer=np.frombuffer(texts.buffers()[2] or b"", dtype=np.uint8),
+            text_offsets=np.frombuffer(texts.buffers()[1], dtype=np.int32,
+                                       count=len(texts) + 1, offset=texts.offset * 4).astype(np.int64)
+        )
+
+    def save(self, path):
+        """Save by extension: .arrow/.feather use Arrow, anything else .npz"""
+        if path.endswith(('.arrow', '.feather')):
+            self.save_arrow(path)
+        else:
+            self.save_npz(path)
+
+    @classmethod
+    def load(cls, path):
+        """Load by extension: .arrow/.feather use Arrow, anything else .npz"""
+        if path.endswith(('.arrow', '.feather')):
+            return cls.load_arrow(path)
+        return cls.load_npz(path)
+
+
+def json_to_columnar(json_file, output_file):
+    """Convert a per-page JSON result file to a columnar file"""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    page = ColumnarPage.from_json_fields(data.get("ocr_metrics", {}))
+    page.save(output_file)
+    return page
+
+
+def columnar_to_json(columnar_file, output_file, json_template=None):
+    """
+    Convert a columnar file back to the per-page JSON schema
+
+    Args:
+        columnar_file: Path to .npz or .arrow file
+        output_file: Path of the JSON file to write
+        json_template: Optional JSON file whose metadata (timestamps, metrics) is kept
+    """
+    page = ColumnarPage.load(columnar_file)
+
+    if json_template:
+        with open(json_template, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    else:
+        data = {"ocr_metrics": {"success": len(page) > 0, "text_regions": len(page)}}
+
+    data.setdefault("ocr_metrics", {}).update(page.to_json_fields())
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert OCR results between the JSON schema and columnar .npz/.arrow files',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # JSON -> NPZ
+  python columnar_results.py to-columnar test_results/nanonets_comparison/page_003.json -o page_003.npz
+
+  # NPZ -> JSON, keeping metrics from the page's metadata JSON
+  python columnar_results.py to-json page_003.npz -o page_003.json --template page_003.json
+        """
+    )
+
+    parser.add_argument('command', choices=['to-columnar', 'to-json'],
+                        help='Conversion direction')
+    parser.add_argument('input', help='Input file')
+    parser.add_argument('--output', '-o', required=True,
+                        help='Output file (.npz, .arrow or .json)')
+    parser.add_argument('--template',
+                        help='JSON file whose metadata is kept when converting to JSON')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"Error: Input file not found: {args.input}")
+        sys.exit(1)
+
+    if args.command == 'to-columnar':
+        page = json_to_columnar(args.input, args.output)
+        print(f"✓ Wrote {len(page)} regions to {args.output}")
+    else:
+        columnar_to_json(args.input, args.output, args.template)
+        print(f"✓ Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Convert multiple document page images to structured Markdown files using PP-Stru
 import os
 import sys
 import argparse
+import importlib.util
 import time
 from pathlib import Path
 
@@ -18,48 +19,298 @@ if sys.platform == 'win32':
     except Exception:
         pass
 
-try:
-    from paddleocr import PPStructureV3
-except ImportError:
+from document_pages import DEFAULT_PDF_DPI, count_pages, is_multipage_candidate, iter_document_pages, prefetch
+from input_discovery import INDEX_FILENAME, IMAGE_EXTENSIONS, ChangeIndex, discover_inputs, iter_files
+from page_classifier import GatedPipeline, is_pdf, iter_pdf_page_classes
+from page_router import PageRouter
+from image_store import BLOB_DIRNAME, ImageStore, rewrite_links
+
+# PaddleOCR is imported when the pipeline is built, so --help stays fast
+if importlib.util.find_spec("paddleocr") is None:
     print("Error: PaddleOCR is not installed.")
     print("Please install it using: pip install \"paddleocr[all]\"")
     sys.exit(1)
 
 
-def get_image_files(input_dir):
+# Page images plus PDFs (multi-page TIFFs are already image extensions)
+INPUT_EXTENSIONS = IMAGE_EXTENSIONS | {'.pdf'}
+
+# Watch mode writes the change index at most this often (and once on shutdown)
+INDEX_SAVE_SECONDS = 30.0
+
+
+def get_image_files(input_dir, recursive=False, manifest=None):
     """
     Get all image files from input directory
     
     Args:
         input_dir: Path to directory containing images
+        recursive: Whether to scan subdirectories
+        manifest: Optional file with one image path per line ('-' for stdin)
         
     Returns:
-        Sorted list of image file paths
+        List of image file paths, in name order within each directory
     """
-    supported_formats = {'.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif'}
-    input_path = Path(input_dir)
+    roots = []
+    if input_dir:
+        input_path = Path(input_dir)
+        
+        if not input_path.exists():
+            print(f"Error: Input directory does not exist: {input_dir}")
+            return []
+        
+        if not input_path.is_dir():
+            print(f"Error: Input path is not a directory: {input_dir}")
+            return []
+        
+        roots.append(str(input_path))
     
-    if not input_path.exists():
-        print(f"Error: Input directory does not exist: {input_dir}")
-        return []
+    # Scanned lazily with os.scandir; files come out sorted (page_001.png, page_002.png, etc.)
+    return [Path(p) for p in discover_inputs(roots, manifest=manifest,
+                                             extensions=INPUT_EXTENSIONS,
+                                             recursive=recursive)]
+
+
+def get_output_filename(image_file, input_dir=None, recursive=False):
+    """
+    Markdown filename for an input image, relative to the output directory
     
-    if not input_path.is_dir():
-        print(f"Error: Input path is not a directory: {input_dir}")
-        return []
+    e.g., page_003.png -> page_003.md; recursive runs keep subfolders
+    """
+    relative = Path(image_file.name)
+    if recursive and input_dir:
+        try:
+            relative = Path(image_file).relative_to(input_dir)
+        except ValueError:
+            pass
+    return str(relative.with_suffix(".md"))
+
+
+def convert_image_file(pipeline, image_file, output_path, output_filename, image_store=None):
+    """
+    Run PP-StructureV3 on one image and write its markdown and extracted images
     
-    # Find all image files
-    image_files = []
-    for file_path in input_path.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in supported_formats:
-            image_files.append(file_path)
+    Args:
+        pipeline: Initialized PPStructureV3 instance
+        image_file: Path to the page image
+        output_path: Output directory (Path)
+        output_filename: Markdown filename relative to output_path
+        image_store: ImageStore for the extracted images (default: synchronous writes)
+        
+    Returns:
+        Path of the written markdown file
+    """
+    output_file = output_path / output_filename
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Run PP-StructureV3
+    output = pipeline.predict(input=str(image_file))
+    
+    # Extract markdown from results; images are queued for saving right away
+    markdown_list = []
     
-    # Sort files naturally (page_001.png, page_002.png, etc.)
-    image_files.sort(key=lambda x: x.name)
+    for res in output:
+        md_info = res.markdown
+        markdown_text = _save_page_images(md_info, output_path, output_file.parent, image_store)
+        markdown_list.append({**md_info, "markdown_texts": markdown_text, "markdown_images": {}})
+    
+    # If multiple pages (shouldn't happen for single images, but handle it)
+    if len(markdown_list) > 1:
+        markdown_text = pipeline.concatenate_markdown_pages(markdown_list)
+    else:
+        markdown_text = markdown_list[0]["markdown_texts"] if markdown_list else ""
     
-    return image_files
+    # Save markdown file
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(markdown_text)
+    
+    return output_file
+
+
+def _save_page_images(md_info, output_path, markdown_dir, image_store=None):
+    """
+    Save the images referenced by one page's markdown
+    
+    Returns:
+        The page's markdown text, with image links rewritten when the store
+        moved images into the shared blob folder
+    """
+    if image_store is None:
+        image_store = ImageStore(output_path, workers=0)
+    rewrites = image_store.save_all(md_info.get("markdown_images"), markdown_dir)
+    return rewrite_links(md_info["markdown_texts"], rewrites)
+
+
+def _is_cjk(char):
+    return '\u4e00' <= char <= '\u9fff'
+
+
+class MarkdownAssembler:
+    """
+    Append page markdown to a combined document as pages are produced
+    
+    Follows the joining rule of PP-StructureV3's concatenate_markdown_pages:
+    pages are separated by a blank line unless the previous page ends
+    mid-paragraph and the next page continues it (page_continuation_flags),
+    in which case they are joined with a space (no space next to CJK text).
+    Only the last character written is kept, so memory does not grow with
+    the number of pages.
+    """
+    
+    def __init__(self, file):
+        self.file = file
+        self.previous_paragraph_end = True
+        self.last_char = ""
+        self.pages = 0
+    
+    def append(self, md_info):
+        """Write one page's markdown (a res.markdown dictionary)"""
+        text = md_info.get("markdown_texts", "")
+        starts_paragraph, ends_paragraph = md_info.get("page_continuation_flags", (True, True))
+        
+        if self.pages == 0:
+            separator = ""
+        elif not starts_paragraph and not self.previous_paragraph_end:
+            first_char = text[0] if text else ""
+            separator = "" if _is_cjk(self.last_char) or _is_cjk(first_char) else " "
+        else:
+            separator = "\n\n"
+        
+        chunk = separator + text
+        self.file.write(chunk)
+        if chunk:
+            self.last_char = chunk[-1]
+        self.previous_paragraph_end = ends_paragraph
+        self.pages += 1
 
 
-def convert_pages_to_markdown(input_dir, output_dir, show_progress=True):
+def convert_document_file(pipeline, document_file, output_path, output_filename,
+                          dpi=DEFAULT_PDF_DPI, show_progress=True, image_store=None):
+    """
+    Convert a PDF or multi-page TIFF page by page
+    
+    Pages are decoded lazily (at most a couple held in memory), each page is
+    written to <stem>_page_NNN.md and appended to the combined <stem>.md as
+    soon as it is produced, so memory use does not depend on page count.
+    
+    Args:
+        pipeline: Initialized PPStructureV3 instance
+        document_file: Path to the .pdf/.tif/.tiff file
+        output_path: Output directory (Path)
+        output_filename: Markdown filename of the combined document
+        dpi: Rendering resolution for PDF pages
+        show_progress: Whether to print one line per page
+        image_store: ImageStore for the extracted images (default: synchronous writes)
+        
+    Returns:
+        Path of the combined markdown file
+    """
+    output_file = output_path / output_filename
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    
+    total_pages = count_pages(document_file)
+    if total_pages == 1 and Path(document_file).suffix.lower() != '.pdf':
+        # Single-frame TIFF: same as any other image
+        return convert_image_file(pipeline, document_file, output_path, output_filename,
+                                  image_store=image_store)
+    
+    # Gated/routed runs: classify PDF pages from the text layer as a hint the
+    # image pre-pass inside predict can only widen; scanned pages (None) use the pre-pass alone
+    page_aware = isinstance(pipeline, (GatedPipeline, PageRouter))
+    page_classes = {}
+    if page_aware and is_pdf(document_file):
+        page_classes = dict(iter_pdf_page_classes(document_file))
+    
+    with open(output_file, "w", encoding="utf-8") as combined:
+        assembler = MarkdownAssembler(combined)
+        
+        for page_number, page_image in prefetch(iter_document_pages(document_file, dpi=dpi)):
+            page_start = time.time()
+            
+            if page_aware:
+                output = pipeline.predict(input=page_image, page_class=page_classes.get(page_number))
+            else:
+                output = pipeline.predict(input=page_image)
+            del page_image
+            
+            for res in output:
+                md_info = res.markdown
+                markdown_text = _save_page_images(md_info, output_path, output_file.parent, image_store)
+                
+                page_file = output_file.with_name(f"{output_file.stem}_page_{page_number:03d}.md")
+                with open(page_file, "w", encoding="utf-8") as f:
+                    f.write(markdown_text)
+                
+                assembler.append({
+                    "markdown_texts": markdown_text,
+                    "page_continuation_flags": md_info.get("page_continuation_flags", (True, True))
+                })
+            
+            # Page results (and their images, once written) can be freed now
+            output = res = md_info = None
+            if show_progress:
+                print(f"    page {page_number}/{total_pages} ({time.time() - page_start:.2f}s)")
+            combined.flush()
+    
+    return output_file
+
+
+def convert_input_file(pipeline, input_file, output_path, output_filename,
+                       dpi=DEFAULT_PDF_DPI, show_progress=True, image_store=None):
+    """Convert an image, PDF or multi-page TIFF, choosing the right path by file type"""
+    if is_multipage_candidate(input_file):
+        return convert_document_file(pipeline, input_file, output_path, output_filename,
+                                     dpi=dpi, show_progress=show_progress,
+                                     image_store=image_store)
+    return convert_image_file(pipeline, input_file, output_path, output_filename,
+                              image_store=image_store)
+
+
+def build_pipeline(gate_modules=False, gating_calibrate=0, route=False):
+    """
+    Initialize PP-StructureV3, optionally wrapped for module gating and/or routing
+    
+    Args:
+        gate_modules: Wrap in GatedPipeline (per-class sub-pipeline flags)
+        gating_calibrate: Calibration pages per class for GatedPipeline
+        route: Wrap in PageRouter so simple text pages use plain PP-OCRv5
+        
+    Returns:
+        Object with predict() and concatenate_markdown_pages()
+    """
+    from ocr_api import create_structure_pipeline
+    
+    pipeline = create_structure_pipeline()
+    if gate_modules:
+        pipeline = GatedPipeline(pipeline, calibrate=gating_calibrate)
+    if route:
+        pipeline = PageRouter(pipeline)
+    return pipeline
+
+
+def _pipeline_reports(pipeline, stats):
+    """Store the gating/routing reports of a pipeline in the statistics"""
+    if isinstance(pipeline, PageRouter):
+        stats['routing'] = pipeline.report()
+        pipeline = pipeline.structure_pipeline
+    if isinstance(pipeline, GatedPipeline):
+        stats['gating'] = pipeline.report()
+
+
+def _image_store_report(image_store):
+    """Image counts for the summary"""
+    return {
+        'seen': image_store.images_seen,
+        'written': image_store.images_written,
+        'deduplicated': image_store.dedup,
+        'errors': list(image_store.errors)
+    }
+
+
+def convert_pages_to_markdown(input_dir, output_dir, show_progress=True,
+                              recursive=False, manifest=None, incremental=False,
+                              pdf_dpi=DEFAULT_PDF_DPI, gate_modules=False, gating_calibrate=0,
+                              route=False, dedup_images=False, image_writers=2):
     """
     Convert all page images in input directory to markdown files
     
@@ -67,6 +318,15 @@ def convert_pages_to_markdown(input_dir, output_dir, show_progress=True):
         input_dir: Directory containing page images
         output_dir: Directory to save markdown files
         show_progress: Whether to show progress messages
+        recursive: Scan subdirectories; output mirrors the input folder structure
+        manifest: Optional file with one image path per line ('-' for stdin)
+        incremental: Skip images unchanged since the last successful conversion
+        pdf_dpi: Rendering resolution for PDF pages
+        gate_modules: Switch off table/formula/seal/chart modules a page does not need
+        gating_calibrate: Pages per class also run ungated to measure time saved
+        route: Send simple text pages to plain OCR instead of PP-StructureV3
+        dedup_images: Store identical extracted images once in a shared folder
+        image_writers: Background threads saving images (0 = save synchronously)
         
     Returns:
         Dictionary with conversion statistics
@@ -76,11 +336,17 @@ def convert_pages_to_markdown(input_dir, output_dir, show_progress=True):
     output_path.mkdir(parents=True, exist_ok=True)
     
     # Get image files
-    image_files = get_image_files(input_dir)
+    image_files = get_image_files(input_dir, recursive=recursive, manifest=manifest)
+    
+    change_index = None
+    if incremental:
+        change_index = ChangeIndex(str(output_path / INDEX_FILENAME))
+        image_files = [f for f in image_files if change_index.is_changed(str(f))]
     
     if not image_files:
-        print(f"No image files found in: {input_dir}")
-        return {'success': 0, 'failed': 0, 'total': 0}
+        print(f"No new or modified image files found in: {input_dir}" if incremental
+              else f"No image files found in: {input_dir}")
+        return {'success': 0, 'failed': 0, 'total': 0, 'processing_times': [], 'failed_files': []}
     
     print(f"Found {len(image_files)} image files to process")
     print("="*70)
@@ -90,7 +356,7 @@ def convert_pages_to_markdown(input_dir, output_dir, show_progress=True):
         print("\nInitializing PP-StructureV3...")
     
     try:
-        pipeline = PPStructureV3()
+        pipeline = build_pipeline(gate_modules, gating_calibrate, route)
     except Exception as e:
         print(f"Error initializing PP-StructureV3: {e}")
         return {'success': 0, 'failed': len(image_files), 'total': len(image_files)}
@@ -109,6 +375,9 @@ def convert_pages_to_markdown(input_dir, output_dir, show_progress=True):
         'failed_files': []
     }
     
+    # Images are encoded and written in the background while the next page runs
+    image_store = ImageStore(output_path, dedup=dedup_images, workers=image_writers)
+    
     # Process each image
     for idx, image_file in enumerate(image_files, 1):
         start_time = time.time()
@@ -117,46 +386,21 @@ def convert_pages_to_markdown(input_dir, output_dir, show_progress=True):
             if show_progress:
                 print(f"\n[{idx}/{len(image_files)}] Processing: {image_file.name}")
             
-            # Run PP-StructureV3
-            output = pipeline.predict(input=str(image_file))
-            
-            # Extract markdown from results
-            markdown_list = []
-            markdown_images_list = []
-            
-            for res in output:
-                md_info = res.markdown
-                markdown_list.append(md_info)
-                markdown_images_list.append(md_info.get("markdown_images", {}))
-            
-            # If multiple pages (shouldn't happen for single images, but handle it)
-            if len(markdown_list) > 1:
-                markdown_text = pipeline.concatenate_markdown_pages(markdown_list)
-            else:
-                markdown_text = markdown_list[0]["markdown_texts"] if markdown_list else ""
-            
             # Generate output filename (preserve page number from input)
-            # e.g., page_003.png -> page_003.md
-            output_filename = image_file.stem + ".md"
-            output_file = output_path / output_filename
+            output_filename = get_output_filename(image_file, input_dir, recursive)
             
-            # Save markdown file
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(markdown_text)
-            
-            # Save any extracted images
-            for item in markdown_images_list:
-                if item:
-                    for img_path, image in item.items():
-                        # Save relative to output directory
-                        img_file_path = output_path / img_path
-                        img_file_path.parent.mkdir(parents=True, exist_ok=True)
-                        image.save(str(img_file_path))
+            # Run PP-StructureV3 and save markdown plus extracted images
+            convert_input_file(pipeline, image_file, output_path, output_filename,
+                               dpi=pdf_dpi, show_progress=show_progress,
+                               image_store=image_store)
             
             elapsed = time.time() - start_time
             stats['processing_times'].append(elapsed)
             stats['success'] += 1
             
+            if change_index is not None:
+                change_index.mark_done(str(image_file))
+            
             if show_progress:
                 print(f"  ✓ Saved: {output_filename} ({elapsed:.2f}s)")
             
@@ -169,6 +413,294 @@ def convert_pages_to_markdown(input_dir, output_dir, show_progress=True):
                 print(f"  ✗ Failed: {image_file.name}")
                 print(f"    Error: {str(e)[:100]}")
     
+    image_store.close()
+    stats['images'] = _image_store_report(image_store)
+    
+    if change_index is not None:
+        change_index.save()
+    
+    _pipeline_reports(pipeline, stats)
+    
+    return stats
+
+
+# File name patterns written by scanners and copy tools while a file is incomplete
+PARTIAL_SUFFIXES = ('.part', '.partial', '.tmp', '.crdownload', '.filepart')
+
+
+def _is_partial_name(path):
+    """True for hidden files and names used for in-progress writes"""
+    name = os.path.basename(path)
+    return name.startswith('.') or name.startswith('~') or name.lower().endswith(PARTIAL_SUFFIXES)
+
+
+class ArrivalTracker:
+    """
+    Detect completed files in a watched folder
+    
+    A file counts as complete once its size and mtime have stayed the same for
+    settle_seconds across polls; files still growing keep being re-checked. The
+    arrival time is when the file was first seen, so reported latency includes
+    the settle delay.
+    
+    A returned file stays claimed until complete() or fail() is called. A
+    failed file is handed out again up to retries times; after that it is
+    only picked up again once it changes on disk.
+    """
+    
+    def __init__(self, settle_seconds=2.0, retries=1):
+        self.settle_seconds = settle_seconds
+        self.retries = retries
+        self.pending = {}   # path -> (size, mtime_ns, first_seen, last_change)
+        self.active = set()
+        self.seen = set()
+        self.failed = {}    # path -> (size, mtime_ns) when it last failed
+        self.attempts = {}
+    
+    def poll(self, paths, now=None):
+        """
+        Update state from the current directory listing
+        
+        Args:
+            paths: Iterable of candidate file paths
+            now: Current time (time.time()); injectable for testing
+            
+        Returns:
+            List of (path, arrived_at) for files that became complete
+        """
+        now = time.time() if now is None else now
+        ready = []
+        
+        for path in paths:
+            if path in self.seen or path in self.active or _is_partial_name(path):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Renamed or removed between listing and stat
+                self.pending.pop(path, None)
+                continue
+            
+            state = (stat.st_size, stat.st_mtime_ns)
+            if path in self.failed:
+                if self.failed[path] == state:
+                    continue
+                # Rewritten since it failed: treat as a new arrival
+                del self.failed[path]
+                self.attempts.pop(path, None)
+            previous = self.pending.get(path)
+            
+            if previous is None:
+                self.pending[path] = (*state, now, now)
+                continue
+            
+            size, mtime_ns, first_seen, last_change = previous
+            if (size, mtime_ns) != state:
+                self.pending[path] = (*state, first_seen, now)
+            elif stat.st_size > 0 and now - last_change >= self.settle_seconds:
+                del self.pending[path]
+                self.active.add(path)
+                ready.append((path, first_seen))
+        
+        return ready
+    
+    def complete(self, path):
+        """Record a successful conversion; the file is not returned again"""
+        self.active.discard(path)
+        self.attempts.pop(path, None)
+        self.seen.add(path)
+    
+    def fail(self, path):
+        """
+        Record a failed conversion
+        
+        Returns:
+            True when the file should be retried now (it stays claimed),
+            False when it waits for the file to change
+        """
+        self.attempts[path] = self.attempts.get(path, 0) + 1
+        if self.attempts[path] <= self.retries:
+            return True
+        
+        self.active.discard(path)
+        try:
+            stat = os.stat(path)
+            self.failed[path] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            self.attempts.pop(path, None)
+        return False
+
+
+def watch_and_convert(input_dir, output_dir, workers=1, poll_interval=1.0,
+                      settle_seconds=2.0, recursive=False, show_progress=True,
+                      pdf_dpi=DEFAULT_PDF_DPI, gate_modules=False, gating_calibrate=0,
+                      route=False, dedup_images=False, image_writers=2):
+    """
+    Keep PP-StructureV3 resident and convert page images as they arrive
+    
+    Args:
+        input_dir: Folder to watch
+        output_dir: Directory to save markdown files
+        workers: Number of resident pipelines converting in parallel
+        poll_interval: Seconds between folder scans
+        settle_seconds: How long a file must stay unchanged before it is converted
+        recursive: Also watch subdirectories
+        show_progress: Whether to show progress messages
+        pdf_dpi: Rendering resolution for PDF pages
+        gate_modules: Switch off table/formula/seal/chart modules a page does not need
+        gating_calibrate: Pages per class also run ungated to measure time saved
+        route: Send simple text pages to plain OCR instead of PP-StructureV3
+        dedup_images: Store identical extracted images once in a shared folder
+        image_writers: Background threads saving images (0 = save synchronously)
+        
+    Returns:
+        Dictionary with conversion statistics (on Ctrl+C); each file counts
+        once, when it converts or runs out of retries, and retried attempts
+        are counted separately
+    """
+    import json
+    import queue
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+    
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    
+    change_index = ChangeIndex(str(output_path / INDEX_FILENAME))
+    latency_log = output_path / "watch_latency.jsonl"
+    
+    # Build every pipeline up front; workers borrow one per file
+    print(f"\nInitializing {workers} PP-StructureV3 pipeline(s)...")
+    pipelines = queue.Queue()
+    all_pipelines = []
+    for _ in range(workers):
+        pipeline = build_pipeline(gate_modules, gating_calibrate, route)
+        all_pipelines.append(pipeline)
+        pipelines.put(pipeline)
+    print("✓ Pipeline(s) initialized")
+    
+    # One store for all workers so identical images are shared across files
+    image_store = ImageStore(output_path, dedup=dedup_images, workers=image_writers)
+    
+    def convert_one(image_file, arrived_at):
+        pipeline = pipelines.get()
+        start_time = time.time()
+        try:
+            output_filename = get_output_filename(image_file, input_dir, recursive)
+            convert_input_file(pipeline, image_file, output_path, output_filename,
+                               dpi=pdf_dpi, show_progress=False, image_store=image_store)
+            return output_filename, start_time, time.time()
+        finally:
+            pipelines.put(pipeline)
+    
+    stats = {
+        'success': 0,
+        'failed': 0,
+        'total': 0,
+        'retries': 0,
+        'processing_times': [],
+        'latencies': [],
+        'failed_files': []
+    }
+    
+    tracker = ArrivalTracker(settle_seconds=settle_seconds)
+    backlog = deque()
+    in_flight = {}
+    
+    def record_result(future, log):
+        path, arrived_at = in_flight.pop(future)
+        image_file = Path(path)
+        record = {"file": path, "arrived_at": arrived_at}
+        
+        try:
+            output_filename, started_at, finished_at = future.result()
+            latency = finished_at - arrived_at
+            stats['total'] += 1
+            stats['success'] += 1
+            stats['processing_times'].append(finished_at - started_at)
+            stats['latencies'].append(latency)
+            tracker.complete(path)
+            change_index.mark_done(path)
+            record.update({
+                "status": "success",
+                "markdown": output_filename,
+                "queue_wait_s": round(started_at - arrived_at, 3),
+                "processing_s": round(finished_at - started_at, 3),
+                "latency_s": round(latency, 3)
+            })
+            if show_progress:
+                print(f"  ✓ {image_file.name} → {output_filename} "
+                      f"(latency {latency:.2f}s, processing {finished_at - started_at:.2f}s)")
+        except Exception as e:
+            retry = tracker.fail(path)
+            if retry:
+                stats['retries'] += 1
+                backlog.append((path, arrived_at))
+            else:
+                stats['total'] += 1
+                stats['failed'] += 1
+                stats['failed_files'].append(image_file.name)
+            record.update({"status": "failed", "error": str(e)[:200], "retry": retry})
+            if show_progress:
+                print(f"  ✗ Failed: {image_file.name}{' (will retry)' if retry else ''}")
+                print(f"    Error: {str(e)[:100]}")
+        
+        log.write(json.dumps(record, ensure_ascii=False) + "\n")
+        log.flush()
+    
+    print(f"\nWatching {input_dir} (Ctrl+C to stop)...")
+    print("="*70)
+    
+    index_saved_at = time.time()
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor, \
+            open(latency_log, "a", encoding="utf-8") as log:
+        try:
+            while True:
+                # Persist finished files in batches rather than after each one
+                if time.time() - index_saved_at >= INDEX_SAVE_SECONDS:
+                    change_index.save()
+                    index_saved_at = time.time()
+                
+                # Pick up newly completed files
+                candidates = iter_files(input_dir, extensions=INPUT_EXTENSIONS, recursive=recursive)
+                for path, arrived_at in tracker.poll(candidates):
+                    if change_index.is_changed(path):
+                        backlog.append((path, arrived_at))
+                    else:
+                        tracker.complete(path)
+                
+                # Bounded concurrency: never more than one file queued per worker
+                while backlog and len(in_flight) < workers:
+                    path, arrived_at = backlog.popleft()
+                    future = executor.submit(convert_one, Path(path), arrived_at)
+                    in_flight[future] = (path, arrived_at)
+                
+                if not in_flight:
+                    time.sleep(poll_interval)
+                    continue
+                
+                done, _ = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record_result(future, log)
+        except KeyboardInterrupt:
+            print("\nStopping watch mode (waiting for in-flight pages)...")
+            # Queued files and pending retries are left for the next run; running ones are still logged
+            for future in list(in_flight):
+                if future.cancel():
+                    in_flight.pop(future)
+            for future in wait(list(in_flight)).done:
+                record_result(future, log)
+    
+    image_store.close()
+    stats['images'] = _image_store_report(image_store)
+    change_index.save()
+    if route:
+        stats['routing'] = PageRouter.merge_reports(p.report() for p in all_pipelines)
+        all_pipelines = [p.structure_pipeline for p in all_pipelines]
+    if gate_modules:
+        stats['gating'] = GatedPipeline.merge_reports(p.report() for p in all_pipelines)
+    print(f"Latency log: {latency_log}")
     return stats
 
 
@@ -180,6 +712,8 @@ def print_summary(stats, output_dir):
     print(f"Total files:      {stats['total']}")
     print(f"Successful:       {stats['success']}")
     print(f"Failed:           {stats['failed']}")
+    if stats.get('retries'):
+        print(f"Retried attempts: {stats['retries']}")
     try :
         if stats['processing_times']:
             avg_time = sum(stats['processing_times']) / len(stats['processing_times'])
@@ -188,6 +722,54 @@ def print_summary(stats, output_dir):
             print(f"  Average:        {avg_time:.2f}s per page")
             print(f"  Total:          {total_time:.2f}s")
         
+        if stats.get('latencies'):
+            latencies = sorted(stats['latencies'])
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(f"\nArrival to markdown latency:")
+            print(f"  Median:         {p50:.2f}s")
+            print(f"  95th pct:       {p95:.2f}s")
+            print(f"  Max:            {latencies[-1]:.2f}s")
+        
+        images = stats.get('images')
+        if images and images['seen']:
+            print(f"\nExtracted images:")
+            print(f"  Referenced:     {images['seen']}")
+            print(f"  Written:        {images['written']}")
+            if images['deduplicated']:
+                print(f"  Duplicates:     {images['seen'] - images['written']} (shared in {BLOB_DIRNAME}/)")
+            for error in images['errors'][:5]:
+                print(f"  ⚠ {error}")
+        
+        if stats.get('routing'):
+            routing = stats['routing']
+            print(f"\nPage routing:")
+            for route, entry in routing['routes'].items():
+                rate = f"{entry['pages_per_second']:.2f} pages/s" if entry['pages_per_second'] else "-"
+                print(f"  {route:10s} {entry['pages']:5d} pages ({entry['share']:.0%})  {rate}")
+            if routing['page_classes']:
+                classes = ", ".join(f"{k}: {v}" for k, v in sorted(routing['page_classes'].items()))
+                print(f"  Page classes: {classes}")
+            if routing.get('kept_on_structure'):
+                print(f"  Text pages kept on PP-StructureV3 (rule/grid evidence): {routing['kept_on_structure']}")
+            if routing['throughput_gain']:
+                print(f"  Throughput gain: {routing['throughput_gain']:.2f}x vs PP-StructureV3 on every page "
+                      f"(estimated {routing['estimated_structure_only_time']:.1f}s)")
+        
+        if stats.get('gating'):
+            print(f"\nModule gating by page class:")
+            total_saved = None
+            for page_class, entry in stats['gating'].items():
+                line = f"  {page_class:8s} {entry['pages']:5d} pages  avg {entry['avg_time']:.2f}s"
+                if entry['time_saved'] is not None:
+                    line += f"  saved ~{entry['time_saved']:.1f}s"
+                    total_saved = (total_saved or 0.0) + entry['time_saved']
+                print(line)
+            if total_saved is not None:
+                print(f"  Estimated time saved: {total_saved:.1f}s (from calibration pages)")
+            else:
+                print(f"  (use --gating-calibrate N to measure time saved)")
+        
         if stats['failed_files']:
             print(f"\nFailed files:")
             for filename in stats['failed_files']:
@@ -214,32 +796,80 @@ Examples:
   # Convert all pages in a directory
   python convert_pages_to_markdown.py test_documents/nanonets_comparison
   
+  # Convert PDFs directly (no need to run extract_pdf_pages.py first)
+  python convert_pages_to_markdown.py test_documents/pdfs --dpi 200
+  
   # Specify custom output directory
   python convert_pages_to_markdown.py test_documents/nanonets_comparison -o output/my_markdown
   
+  # Skip table/formula/seal models on pages that do not need them
+  python convert_pages_to_markdown.py test_documents/nanonets_comparison --gate-modules --gating-calibrate 2
+  
+  # Plain OCR for simple text pages, PP-StructureV3 only where layout matters
+  python convert_pages_to_markdown.py test_documents/nanonets_comparison --route
+  
+  # Store repeated crops (logos, figures) once and save images in the background
+  python convert_pages_to_markdown.py test_documents/nanonets_comparison --dedup-images --image-writers 4
+  
+  # Watch a scanner drop folder and convert pages as they arrive
+  python convert_pages_to_markdown.py /srv/scans/inbox --watch --workers 2
+  
   # Quiet mode (minimal output)
   python convert_pages_to_markdown.py test_documents/nanonets_comparison --quiet
 
-Supported image formats:
-  PNG, JPG, JPEG, BMP, TIFF
+Supported input formats:
+  PNG, JPG, JPEG, BMP, TIFF (including multi-page), PDF
   
 Output:
   - Markdown files named after input files (page_001.md, page_002.md, etc.)
+  - PDFs and multi-page TIFFs: <name>_page_001.md ... plus combined <name>.md
   - Extracted images saved in subdirectories within output folder
+  - With --dedup-images: identical images stored once in images/<hash>.jpg
         """
     )
     
-    parser.add_argument('input_dir',
+    parser.add_argument('input_dir', nargs='?', default='',
                         help='Directory containing page images to convert')
     parser.add_argument('--output', '-o', 
                         default='output/markdown_pages',
                         help='Output directory for markdown files (default: output/markdown_pages)')
+    parser.add_argument('--recursive', '-r', action='store_true',
+                        help='Scan subdirectories (output mirrors the folder structure)')
+    parser.add_argument('--manifest',
+                        help='File listing image paths, one per line ("-" reads stdin)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only convert images that are new or modified since the last run')
+    parser.add_argument('--dpi', type=int, default=DEFAULT_PDF_DPI,
+                        help=f'Rendering resolution for PDF pages (default: {DEFAULT_PDF_DPI})')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep the pipeline loaded and convert new images as they arrive')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Resident pipelines converting in parallel in watch mode (default: 1)')
+    parser.add_argument('--poll-interval', type=float, default=1.0,
+                        help='Seconds between folder scans in watch mode (default: 1.0)')
+    parser.add_argument('--settle-seconds', type=float, default=2.0,
+                        help='Seconds a file must stay unchanged before it counts as complete (default: 2.0)')
+    parser.add_argument('--gate-modules', action='store_true',
+                        help='Classify pages (text/table/figure/full) and switch off unneeded sub-pipelines')
+    parser.add_argument('--gating-calibrate', type=int, default=0, metavar='N',
+                        help='Also run the full pipeline on the first N pages of each class to measure time saved')
+    parser.add_argument('--route', action='store_true',
+                        help='Send simple text pages to PP-OCRv5 (lightweight markdown), the rest to PP-StructureV3')
+    parser.add_argument('--dedup-images', action='store_true',
+                        help=f'Store identical extracted images once in {BLOB_DIRNAME}/ and rewrite markdown links')
+    parser.add_argument('--image-writers', type=int, default=2,
+                        help='Background threads saving extracted images, 0 = synchronous (default: 2)')
     parser.add_argument('--quiet', '-q',
                         action='store_true',
                         help='Suppress progress messages')
     
     args = parser.parse_args()
     
+    if not args.input_dir and not args.manifest:
+        parser.error("an input directory or --manifest is required")
+    if args.watch and not args.input_dir:
+        parser.error("--watch needs an input directory")
+    
     print("\n" + "="*70)
     print("Page to Markdown Converter")
     print("Using PP-StructureV3 for document parsing")
@@ -248,11 +878,39 @@ Output:
     print(f"Output directory: {args.output}")
     print()
     
+    if args.watch:
+        stats = watch_and_convert(
+            args.input_dir,
+            args.output,
+            workers=max(1, args.workers),
+            poll_interval=args.poll_interval,
+            settle_seconds=args.settle_seconds,
+            recursive=args.recursive,
+            show_progress=not args.quiet,
+            pdf_dpi=args.dpi,
+            gate_modules=args.gate_modules,
+            gating_calibrate=args.gating_calibrate,
+            route=args.route,
+            dedup_images=args.dedup_images,
+            image_writers=max(0, args.image_writers)
+        )
+        print_summary(stats, args.output)
+        return
+    
     # Convert pages
     stats = convert_pages_to_markdown(
         args.input_dir,
         args.output,
-        show_progress=not args.quiet
+        show_progress=not args.quiet,
+        recursive=args.recursive,
+        manifest=args.manifest,
+        incremental=args.incremental,
+        pdf_dpi=args.dpi,
+        gate_modules=args.gate_modules,
+        gating_calibrate=args.gating_calibrate,
+        route=args.route,
+        dedup_images=args.dedup_images,
+        image_writers=max(0, args.image_writers)
     )
     
     # Print summary
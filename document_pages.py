@@ -0,0 +1,151 @@
+"""
+Document Page Iterator
+Lazily decode the pages of PDFs and multi-page TIFFs as images, one page at a time
+"""
+
+import os
+import queue
+import threading
+
+import numpy as np
+
+
+# Inputs that can hold more than one page
+MULTIPAGE_EXTENSIONS = {'.pdf', '.tif', '.tiff'}
+
+# Default rendering resolution for PDF pages (matches extract_pdf_pages.py)
+DEFAULT_PDF_DPI = 300
+
+
+def is_multipage_candidate(path):
+    """True for file types that may contain several pages"""
+    return os.path.splitext(str(path))[1].lower() in MULTIPAGE_EXTENSIONS
+
+
+def count_pages(path):
+    """
+    Number of pages in a PDF or TIFF without decoding them
+
+    Args:
+        path: Path to the document
+
+    Returns:
+        Page count (1 for ordinary images)
+    """
+    ext = os.path.splitext(str(path))[1].lower()
+
+    if ext == '.pdf':
+        import fitz  # PyMuPDF
+        with fitz.open(str(path)) as pdf_document:
+            return pdf_document.page_count
+
+    if ext in ('.tif', '.tiff'):
+        from PIL import Image
+        with Image.open(str(path)) as img:
+            return getattr(img, 'n_frames', 1)
+
+    return 1
+
+
+def _rgb_to_bgr(array):
+    """PaddleOCR pipelines expect OpenCV channel order"""
+    return np.ascontiguousarray(array[:, :, ::-1])
+
+
+def _iter_pdf_pages(path, dpi):
+    import fitz  # PyMuPDF
+
+    zoom = dpi / 72
+    matrix = fitz.Matrix(zoom, zoom)
+
+    pdf_document = fitz.open(str(path))
+    try:
+        for page_idx in range(pdf_document.page_count):
+            pix = pdf_document[page_idx].get_pixmap(matrix=matrix, alpha=False)
+            array = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+            if pix.n == 1:
+                array = np.repeat(array, 3, axis=2)
+            yield page_idx + 1, _rgb_to_bgr(array[:, :, :3])
+            del pix
+    finally:
+        pdf_document.close()
+
+
+def _iter_tiff_pages(path):
+    from PIL import Image
+
+    with Image.open(str(path)) as img:
+        for frame_idx in range(getattr(img, 'n_frames', 1)):
+            img.seek(frame_idx)
+            yield frame_idx + 1, _rgb_to_bgr(np.asarray(img.convert('RGB')))
+
+
+def iter_document_pages(path, dpi=DEFAULT_PDF_DPI):
+    """
+    Iterate over the pages of a PDF or (multi-page) TIFF
+
+    Only the current page is decoded; nothing is written to disk.
+
+    Args:
+        path: Path to .pdf, .tif or .tiff file
+        dpi: Rendering resolution for PDF pages
+
+    Yields:
+        (page_number, image) with 1-based page numbers and BGR uint8 arrays
+    """
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext == '.pdf':
+        yield from _iter_pdf_pages(path, dpi)
+    elif ext in ('.tif', '.tiff'):
+        yield from _iter_tiff_pages(path)
+    else:
+        raise ValueError(f"Not a multi-page document type: {path}")
+
+
+def prefetch(iterable, depth=2):
+    """
+    Decode the next items of an iterator on a background thread
+
+    At most `depth` items wait in the queue, so memory stays bounded while
+    rendering the next page overlaps with processing the current one.
+
+    Args:
+        iterable: Source iterator (e.g. iter_document_pages)
+        depth: Maximum number of prefetched items
+
+    Yields:
+        Items of the source iterator, in order
+    """
+    buffer = queue.Queue(maxsize=max(1, depth))
+    done = object()
+    stop = threading.Event()
+
+    def producer():
+        try:
+            for item in iterable:
+                while not stop.is_set():
+                    try:
+                        buffer.put(('item', item), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            buffer.put(('done', done))
+        except Exception as e:
+            buffer.put(('error', e))
+
+    thread = threading.Thread(target=producer, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == 'done':
+                break
+            if kind == 'error':
+                raise value
+            yield value
+    finally:
+        stop.set()
+        thread.join(timeout=1.0)
@@ -0,0 +1,411 @@
+"""
+Engine Model Configuration
+Pin the models of each PaddleOCR / PP-StructureV3 pipeline to local directories so engines
+start without model-hoster checks, and verify the local model cache once
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'replace')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
+    except Exception:
+        pass
+
+
+# Default config location; OCR_MODEL_CONFIG overrides it
+CONFIG_FILENAME = "ocr_models.json"
+CONFIG_ENV = "OCR_MODEL_CONFIG"
+
+# Written by `verify` next to the config; startup only compares it with the config
+STAMP_SUFFIX = ".verified"
+
+# PaddleX skips its model-source connectivity checks when this is set
+MODEL_SOURCE_CHECK_ENV = "PADDLE_PDX_DISABLE_MODEL_SOURCE_CHECK"
+
+# Default PaddleX download cache, used by `init`
+DEFAULT_MODEL_CACHE = Path.home() / ".paddlex" / "official_models"
+
+# Files a PaddleX inference model directory must contain (either format)
+MODEL_FILE_SETS = (
+    ("inference.json", "inference.pdiparams", "inference.yml"),
+    ("inference.pdmodel", "inference.pdiparams", "inference.yml"),
+)
+
+# Model roles (kwarg prefixes) and how to recognize them by directory name in `init`
+MODEL_ROLES = (
+    ("text_detection", lambda name: name.endswith("_det")),
+    ("text_recognition", lambda name: name.endswith("_rec")),
+    ("textline_orientation", lambda name: "textline_ori" in name),
+    ("doc_orientation_classify", lambda name: "doc_ori" in name),
+    ("doc_unwarping", lambda name: name.startswith("UVDoc")),
+    ("layout_detection", lambda name: "Layout" in name),
+)
+
+_config_cache = {}
+
+
+def get_config_path(path=None):
+    """Config file to use: explicit path, $OCR_MODEL_CONFIG, or ./ocr_models.json"""
+    return Path(path or os.environ.get(CONFIG_ENV) or CONFIG_FILENAME)
+
+
+def load_model_config(path=None):
+    """
+    Load the pinned-model config (cached per path)
+
+    Relative *_model_dir values are resolved against "model_root" (itself
+    relative to the config file).
+
+    Args:
+        path: Config file; default from get_config_path()
+
+    Returns:
+        Config dictionary, or None when no config file exists
+    """
+    config_path = get_config_path(path)
+    key = str(config_path.resolve()) if config_path.exists() else str(config_path)
+    if key in _config_cache:
+        return _config_cache[key]
+
+    if not config_path.exists():
+        _config_cache[key] = None
+        return None
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    root = config_path.parent / config.get("model_root", ".")
+    for kwargs in config.get("pipelines", {}).values():
+        for name, value in kwargs.items():
+            if name.endswith("_model_dir") and value and not os.path.isabs(value):
+                kwargs[name] = str((root / value).resolve())
+
+    config["_path"] = str(config_path)
+    _config_cache[key] = config
+    return config
+
+
+def prepare_offline_mode(config=None):
+    """
+    Set up the environment for startup without remote lookups
+
+    Must run before paddleocr is imported. Also warns once when the pinned
+    models have not been verified since the config last changed.
+
+    Args:
+        config: Loaded config (default: load_model_config())
+
+    Returns:
+        True when an offline config is active
+    """
+    config = config if config is not None else load_model_config()
+    if not config or not config.get("offline", True):
+        return False
+
+    os.environ.setdefault(MODEL_SOURCE_CHECK_ENV, "True")
+
+    if not config.get("_stamp_checked"):
+        config["_stamp_checked"] = True
+        if not is_verified(config):
+            print(f"⚠ Pinned models in {config['_path']} are not verified; "
+                  f"run: python engine_config.py verify")
+    return True
+
+
+def pipeline_kwargs(pipeline, lang=None, config=None):
+    """
+    Constructor kwargs pinned for a pipeline
+
+    Looks up "<pipeline>:<lang>" first (e.g. "ocr:fr"), then "<pipeline>".
+    A recognition model only belongs to the language it was pinned for: when
+    lang is given, text_recognition_* keys of the plain "<pipeline>" entry
+    are left out, so an engine for another language does not silently load it.
+
+    Args:
+        pipeline: "ocr" (PaddleOCR) or "structure" (PPStructureV3)
+        lang: Recognition language, for per-language recognition models
+        config: Loaded config (default: load_model_config())
+
+    Returns:
+        Dictionary of kwargs (empty when nothing is pinned)
+    """
+    config = config if config is not None else load_model_config()
+    if not config:
+        return {}
+
+    pipelines = config.get("pipelines", {})
+    kwargs = dict(pipelines.get(pipeline, {}))
+    if lang:
+        kwargs = {name: value for name, value in kwargs.items()
+                  if not name.startswith("text_recognition_")}
+        kwargs.update(pipelines.get(f"{pipeline}:{lang}", {}))
+    return kwargs
+
+
+def _config_fingerprint(config):
+    """Hash of the pinned kwargs, so editing the config invalidates the stamp"""
+    pipelines = json.dumps(config.get("pipelines", {}), sort_keys=True)
+    return hashlib.blake2b(pipelines.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _stamp_path(config):
+    return Path(config["_path"] + STAMP_SUFFIX)
+
+
+def _pinned_dirs(config):
+    dirs = set()
+    for kwargs in config.get("pipelines", {}).values():
+        for name, value in kwargs.items():
+            if name.endswith("_model_dir") and value:
+                dirs.add(value)
+    return sorted(dirs)
+
+
+def _dir_state(model_dir):
+    """Cheap (name, size, mtime_ns) listing of a model directory"""
+    state = []
+    with os.scandir(model_dir) as it:
+        for entry in sorted(it, key=lambda e: e.name):
+            if entry.is_file():
+                stat = entry.stat()
+                state.append([entry.name, stat.st_size, stat.st_mtime_ns])
+    return state
+
+
+def is_verified(config):
+    """
+    True when `verify` succeeded for this config and no model file changed since
+
+    Only stats the model directories; nothing is hashed.
+    """
+    stamp_file = _stamp_path(config)
+    if not stamp_file.exists():
+        return False
+    try:
+        with open(stamp_file, 'r', encoding='utf-8') as f:
+            stamp = json.load(f)
+        if stamp.get("fingerprint") != _config_fingerprint(config):
+            return False
+        return all(_dir_state(d) == stamp["dirs"].get(d, {}).get("files")
+                   for d in _pinned_dirs(config))
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def _file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_models(config):
+    """
+    Check every pinned model directory and write the verification stamp
+
+    A directory passes when it holds a complete inference model (graph,
+    parameters and inference.yml) and every file is readable; content hashes
+    are stored in the stamp so later corruption can be told apart from updates.
+
+    Args:
+        config: Loaded config
+
+    Returns:
+        List of problems (empty when everything is fine)
+    """
+    problems = []
+    stamp = {"fingerprint": _config_fingerprint(config), "dirs": {}}
+
+    for model_dir in _pinned_dirs(config):
+        if not os.path.isdir(model_dir):
+            problems.append(f"{model_dir}: directory not found")
+            continue
+
+        present = set(os.listdir(model_dir))
+        if not any(set(files) <= present for files in MODEL_FILE_SETS):
+            problems.append(f"{model_dir}: incomplete model (need inference.json or .pdmodel, "
+                            f".pdiparams and .yml)")
+            continue
+
+        try:
+            digests = {name: _file_digest(os.path.join(model_dir, name))
+                       for name in sorted(present) if os.path.isfile(os.path.join(model_dir, name))}
+        except OSError as e:
+            problems.append(f"{model_dir}: unreadable ({e})")
+            continue
+
+        stamp["dirs"][model_dir] = {"files": _dir_state(model_dir), "digests": digests}
+
+    if not problems:
+        with open(_stamp_path(config), 'w', encoding='utf-8') as f:
+            json.dump(stamp, f, indent=2)
+    return problems
+
+
+def init_config(model_cache=DEFAULT_MODEL_CACHE, lang='en'):
+    """
+    Build a config that pins the models found in a local model cache
+
+    Directory names decide the role (*_det, *_rec, *textline_ori*, ...); the
+    recognition model is the one PaddleOCR uses for the language
+    (multilingual_ocr.REC_MODELS), e.g. latin_PP-OCRv5_mobile_rec for french.
+    It is pinned under "ocr:<lang>" only, so engines for other languages keep
+    choosing their own.
+
+    Args:
+        model_cache: Directory with one subdirectory per model
+        lang: Language whose recognition model goes into the "ocr:<lang>" entry
+
+    Returns:
+        Config dictionary
+
+    Raises:
+        ValueError: The language has no known recognition model, or its
+                    model is not in the cache
+    """
+    from multilingual_ocr import REC_MODELS
+
+    model_cache = Path(model_cache)
+    names = sorted(entry.name for entry in os.scandir(model_cache) if entry.is_dir())
+
+    rec_model = REC_MODELS.get(lang)
+    if rec_model is None:
+        raise ValueError(f"No recognition model known for language '{lang}'")
+    if rec_model not in names:
+        # Pinning another language's model would silently misread the text
+        raise ValueError(f"Recognition model {rec_model} for '{lang}' is not in {model_cache}; "
+                         f"run OCR with lang='{lang}' once with network access to download it")
+
+    pinned = {"text_recognition": rec_model}
+    for role, matches in MODEL_ROLES:
+        if role in pinned:
+            continue
+        candidates = [name for name in names if matches(name)]
+        if candidates:
+            # Server models first, then the newest version
+            candidates.sort(key=lambda name: ("server" not in name, name))
+            pinned[role] = candidates[0]
+
+    def kwargs_for(roles):
+        kwargs = {}
+        for role in roles:
+            if role in pinned:
+                kwargs[f"{role}_model_name"] = pinned[role]
+                kwargs[f"{role}_model_dir"] = pinned[role]
+        return kwargs
+
+    shared_roles = ("text_detection", "textline_orientation",
+                    "doc_orientation_classify", "doc_unwarping")
+    return {
+        "model_root": str(model_cache),
+        "offline": True,
+        "pipelines": {
+            "ocr": kwargs_for(shared_roles),
+            f"ocr:{lang}": kwargs_for(("text_recognition",)),
+            "structure": kwargs_for(shared_roles + ("text_recognition", "layout_detection"))
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Pin OCR models to local directories and verify the model cache',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Write ocr_models.json from the models PaddleOCR already downloaded
+  python engine_config.py init
+
+  # Check the pinned model directories once (writes ocr_models.json.verified)
+  python engine_config.py verify
+
+  # Show what an engine will be built with
+  python engine_config.py show --lang fr
+
+Config format (relative *_model_dir paths are resolved against model_root):
+  {
+    "model_root": "models",
+    "offline": true,
+    "pipelines": {
+      "ocr":       {"text_detection_model_name": "PP-OCRv5_server_det",
+                    "text_detection_model_dir": "PP-OCRv5_server_det", ...},
+      "ocr:fr":    {"text_recognition_model_name": "latin_PP-OCRv5_mobile_rec",
+                    "text_recognition_model_dir": "latin_PP-OCRv5_mobile_rec"},
+      "structure": {"layout_detection_model_dir": "PP-DocLayout_plus-L", ...}
+    }
+  }
+        """
+    )
+
+    parser.add_argument('command', choices=['init', 'verify', 'show'],
+                        help='Action to perform')
+    parser.add_argument('--config', '-c',
+                        help=f'Config file (default: ${CONFIG_ENV} or {CONFIG_FILENAME})')
+    parser.add_argument('--model-cache', default=str(DEFAULT_MODEL_CACHE),
+                        help=f'Model cache scanned by init (default: {DEFAULT_MODEL_CACHE})')
+    parser.add_argument('--lang', default='en',
+                        help='Language for init / show (default: en)')
+    parser.add_argument('--force', action='store_true',
+                        help='Overwrite an existing config in init')
+
+    args = parser.parse_args()
+    config_path = get_config_path(args.config)
+
+    if args.command == 'init':
+        if config_path.exists() and not args.force:
+            print(f"✗ {config_path} already exists (use --force to overwrite)")
+            sys.exit(1)
+        if not os.path.isdir(args.model_cache):
+            print(f"✗ Model cache not found: {args.model_cache}")
+            print("Run any OCR script once with network access to download the models.")
+            sys.exit(1)
+
+        try:
+            config = init_config(args.model_cache, lang=args.lang)
+        except ValueError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2)
+        print(f"✓ Wrote {config_path}")
+        for pipeline, kwargs in config["pipelines"].items():
+            pinned = [v for k, v in kwargs.items() if k.endswith("_model_name")]
+            print(f"  {pipeline:10s} {', '.join(pinned) or '(nothing found)'}")
+        print("\nNext step: python engine_config.py verify")
+        return
+
+    config = load_model_config(config_path)
+    if config is None:
+        print(f"✗ No config found at {config_path} (create one with: python engine_config.py init)")
+        sys.exit(1)
+
+    if args.command == 'verify':
+        problems = verify_models(config)
+        if problems:
+            print(f"✗ {len(problems)} problem(s) with pinned models:")
+            for problem in problems:
+                print(f"  - {problem}")
+            sys.exit(1)
+        print(f"✓ {len(_pinned_dirs(config))} model directories verified")
+        print(f"✓ Stamp written: {_stamp_path(config)}")
+        return
+
+    for pipeline in ("ocr", "structure"):
+        print(f"{pipeline} ({args.lang}):")
+        for name, value in sorted(pipeline_kwargs(pipeline, args.lang, config).items()):
+            print(f"  {name} = {value}")
+    print(f"Verified: {'yes' if is_verified(config) else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
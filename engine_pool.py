@@ -0,0 +1,285 @@
+"""
+Memory-Budgeted Engine Pool
+Keep as many PaddleOCR / PP-StructureV3 engines resident as a memory budget allows, evict the
+least recently used one when a new engine does not fit, and run queued jobs grouped by engine
+so each engine is loaded as few times as possible
+"""
+
+import gc
+import os
+import sys
+import time
+import argparse
+import importlib.util
+from collections import OrderedDict
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'replace')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
+    except Exception:
+        pass
+
+
+PSUTIL_AVAILABLE = importlib.util.find_spec("psutil") is not None
+
+# Footprint assumed for an engine that has never been measured (MB)
+DEFAULT_FOOTPRINT_MB = 800
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB, or None when it cannot be read"""
+    if PSUTIL_AVAILABLE:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def build_engine(key):
+    """
+    Default engine factory
+
+    Args:
+        key: "structure" (PP-StructureV3), "ocr" or "ocr:<lang>" (PaddleOCR)
+
+    Returns:
+        Engine with a predict() method
+    """
+    from ocr_api import create_ocr_engine, create_structure_pipeline
+
+    pipeline, _, lang = key.partition(":")
+    if pipeline == "structure":
+        return create_structure_pipeline()
+    if pipeline == "ocr":
+        return create_ocr_engine(lang=lang or 'en')
+    raise ValueError(f"Unknown engine key '{key}' (use structure, ocr or ocr:<lang>)")
+
+
+class EnginePool:
+    """
+    LRU cache of engines bounded by measured memory footprint
+
+    An engine's footprint is the RSS growth over its load and first job. It
+    is remembered after eviction, so the pool can make room before
+    reloading. Freed memory is not always returned to the OS, so eviction
+    decisions use the footprints, while the report also shows the real RSS.
+    """
+
+    def __init__(self, budget_mb, factory=build_engine):
+        self.budget_mb = budget_mb
+        self.factory = factory
+        self.engines = OrderedDict()     # key -> engine, least recently used first
+        self.footprints = {}             # key -> MB (kept after eviction)
+        self._unmeasured = set()         # keys whose first job has not run yet
+        self._rss_before_first_job = None
+        self.loads = {}
+        self.evictions = {}
+        self.load_seconds = 0.0
+        self.peak_rss_mb = current_rss_mb()
+
+    @property
+    def used_mb(self):
+        return sum(self.footprints.get(key, DEFAULT_FOOTPRINT_MB) for key in self.engines)
+
+    @property
+    def headroom_mb(self):
+        return self.budget_mb - self.used_mb
+
+    def _track_rss(self):
+        rss = current_rss_mb()
+        if rss is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb or 0.0, rss)
+        return rss
+
+    def evict(self, key):
+        """Drop a resident engine"""
+        if self.engines.pop(key, None) is not None:
+            self.evictions[key] = self.evictions.get(key, 0) + 1
+            gc.collect()
+
+    def _make_room(self, needed_mb, keep=None):
+        """Evict least recently used engines until needed_mb fits"""
+        for key in list(self.engines):
+            if self.headroom_mb >= needed_mb:
+                break
+            if key != keep:
+                print(f"  ↺ Evicting {key} ({self.footprints.get(key, DEFAULT_FOOTPRINT_MB):.0f} MB)")
+                self.evict(key)
+
+    def get(self, key):
+        """
+        Resident engine for key, loading it (and evicting others) if needed
+
+        An engine larger than the whole budget is still loaded, alone.
+        """
+        if key in self.engines:
+            self.engines.move_to_end(key)
+            return self.engines[key]
+
+        self._make_room(self.footprints.get(key, DEFAULT_FOOTPRINT_MB))
+
+        rss_before = current_rss_mb()
+        start = time.perf_counter()
+        engine = self.factory(key)
+        self.load_seconds += time.perf_counter() - start
+        rss_after = self._track_rss()
+
+        if rss_before is not None and rss_after is not None and key not in self.footprints:
+            self.footprints[key] = max(rss_after - rss_before, 0.0)
+            self._unmeasured.add(key)
+        self._rss_before_first_job = rss_before
+
+        self.engines[key] = engine
+        self.loads[key] = self.loads.get(key, 0) + 1
+        if self.loads[key] > 1:
+            print(f"  ⚠ Reloading {key} (load #{self.loads[key]})")
+        return engine
+
+    def run(self, key, input_path):
+        """Run one input through an engine; returns the list of predict results"""
+        engine = self.get(key)
+        result = list(engine.predict(input_path))
+
+        # Inference buffers are allocated on the first run: count them too
+        if key in self._unmeasured:
+            self._unmeasured.discard(key)
+            rss = self._track_rss()
+            if rss is not None and self._rss_before_first_job is not None:
+                self.footprints[key] = max(self.footprints[key], rss - self._rss_before_first_job)
+                self._make_room(0, keep=key)
+        else:
+            self._track_rss()
+        return result
+
+    def run_jobs(self, jobs):
+        """
+        Run (engine key, input) jobs grouped by engine
+
+        Groups whose engine is already resident go first, then the rest in
+        order of first appearance, so each engine is loaded once per call
+        unless the budget forces an eviction.
+
+        Args:
+            jobs: Sequence of (key, input_path)
+
+        Returns:
+            List of predict results (None for failed jobs) in job order
+        """
+        groups = OrderedDict()
+        for idx, (key, input_path) in enumerate(jobs):
+            groups.setdefault(key, []).append((idx, input_path))
+
+        order = [key for key in self.engines if key in groups] + \
+                [key for key in groups if key not in self.engines]
+
+        results = [None] * len(jobs)
+        for key in order:
+            print(f"\n{key}: {len(groups[key])} job(s)")
+            for idx, input_path in groups[key]:
+                try:
+                    results[idx] = self.run(key, input_path)
+                    print(f"  ✓ {input_path}")
+                except Exception as e:
+                    print(f"  ✗ {input_path}: {e}")
+        return results
+
+    def report(self):
+        """Loads, reloads, evictions and memory headroom"""
+        return {
+            "budget_mb": self.budget_mb,
+            "resident": list(self.engines),
+            "used_mb": round(self.used_mb, 1),
+            "headroom_mb": round(self.headroom_mb, 1),
+            "rss_mb": current_rss_mb(),
+            "peak_rss_mb": self.peak_rss_mb,
+            "footprints_mb": {key: round(mb, 1) for key, mb in self.footprints.items()},
+            "loads": dict(self.loads),
+            "reloads": sum(count - 1 for count in self.loads.values()),
+            "evictions": dict(self.evictions),
+            "load_seconds": round(self.load_seconds, 2)
+        }
+
+
+def print_pool_report(report):
+    print("\n" + "="*60)
+    print("ENGINE POOL")
+    print("="*60)
+    print(f"Budget:     {report['budget_mb']:.0f} MB")
+    print(f"Resident:   {', '.join(report['resident']) or '-'} ({report['used_mb']:.0f} MB)")
+    print(f"Headroom:   {report['headroom_mb']:.0f} MB")
+    if report['rss_mb'] is not None:
+        print(f"Process RSS: {report['rss_mb']:.0f} MB (peak {report['peak_rss_mb']:.0f} MB)")
+    print(f"Loads:      {sum(report['loads'].values())} ({report['reloads']} reloads, "
+          f"{report['load_seconds']:.1f}s loading)")
+    for key, mb in report['footprints_mb'].items():
+        print(f"  {key:20s} {mb:8.0f} MB  loads {report['loads'].get(key, 0)}  "
+              f"evictions {report['evictions'].get(key, 0)}")
+
+
+def read_jobs(path):
+    """Jobs file: one "<engine key> <input path>" per line, # comments allowed"""
+    jobs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            key, _, input_path = line.partition(' ')
+            if not input_path.strip():
+                raise ValueError(f"{path}:{line_no}: expected '<engine> <input>'")
+            jobs.append((key, input_path.strip()))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run OCR jobs for several engines within a memory budget',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # jobs.txt: one "<engine> <input>" per line
+  #   ocr:en        test_images/receipt.jpg
+  #   ocr:french    test_images/facture.jpg
+  #   structure     test_documents/report.png
+  python engine_pool.py jobs.txt --budget-mb 4000
+
+Engines: "ocr" / "ocr:<lang>" (PaddleOCR) and "structure" (PP-StructureV3).
+Jobs are grouped by engine; the least recently used engine is evicted when
+the next one does not fit the budget.
+        """
+    )
+
+    parser.add_argument('jobs', help='Jobs file')
+    parser.add_argument('--budget-mb', type=float, default=4000,
+                        help='Memory for resident engines in MB (default: 4000)')
+
+    args = parser.parse_args()
+
+    try:
+        jobs = read_jobs(args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    if not PSUTIL_AVAILABLE and current_rss_mb() is None:
+        print(f"⚠ Cannot measure RSS on this platform; assuming {DEFAULT_FOOTPRINT_MB} MB per engine")
+
+    pool = EnginePool(args.budget_mb)
+    results = pool.run_jobs(jobs)
+    print_pool_report(pool.report())
+
+    failed = sum(1 for r in results if r is None)
+    if failed:
+        print(f"\n✗ {failed}/{len(jobs)} jobs failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
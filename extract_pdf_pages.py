@@ -6,8 +6,11 @@ Extract specific pages from a PDF and convert them to high-quality images for OC
 import os
 import sys
 import argparse
+import importlib.util
 from pathlib import Path
 
+from input_discovery import save_page_sources
+
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
     try:
@@ -17,9 +20,8 @@ if sys.platform == 'win32':
     except Exception:
         pass
 
-try:
-    import fitz  # PyMuPDF
-except ImportError:
+# PyMuPDF is imported where it is used, so --help stays fast
+if importlib.util.find_spec("fitz") is None:
     print("Error: PyMuPDF is not installed.")
     print("Please install it using: pip install PyMuPDF")
     sys.exit(1)
@@ -68,6 +70,8 @@ def extract_pdf_pages(pdf_path, pages, output_dir, dpi=300, image_format='png'):
     Returns:
         List of extracted image paths
     """
+    import fitz  # PyMuPDF
+    
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
     
@@ -82,6 +86,7 @@ def extract_pdf_pages(pdf_path, pages, output_dir, dpi=300, image_format='png'):
     print(f"PDF has {total_pages} pages")
     
     extracted_files = []
+    page_sources = {}
     
     # Calculate zoom factor for desired DPI
     # Default is 72 DPI, so zoom = dpi / 72
@@ -124,12 +129,20 @@ def extract_pdf_pages(pdf_path, pages, output_dir, dpi=300, image_format='png'):
                   f"({pix.width}x{pix.height}px, {file_size:.1f} KB)")
             
             extracted_files.append(output_path)
+            page_sources[output_filename] = {
+                "pdf": os.path.abspath(pdf_path),
+                "page": page_idx,
+                "dpi": dpi
+            }
             
         except Exception as e:
             print(f"✗ Error extracting page {page_idx + 1}: {e}")
     
     pdf_document.close()
     
+    if page_sources:
+        save_page_sources(output_dir, page_sources)
+    
     print("="*70)
     print(f"\n✓ Successfully extracted {len(extracted_files)} pages")
     print(f"Output directory: {output_dir}")
@@ -139,6 +152,8 @@ def extract_pdf_pages(pdf_path, pages, output_dir, dpi=300, image_format='png'):
 
 def analyze_pdf_info(pdf_path):
     """Display basic PDF information"""
+    import fitz  # PyMuPDF
+    
     try:
         pdf_document = fitz.open(pdf_path)
         
@@ -0,0 +1,320 @@
+"""
+Host Auto-Tuner
+Micro-benchmark thread count, MKL-DNN and precision settings on a sample of pages and save
+the fastest PaddleOCR / PP-StructureV3 kwargs as a host profile that every entry point loads
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import socket
+import platform
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'replace')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
+    except Exception:
+        pass
+
+
+# Profile location; OCR_HOST_PROFILE overrides it ("off" disables profiles)
+PROFILE_ENV = "OCR_HOST_PROFILE"
+DEFAULT_PROFILE_PATH = Path.home() / ".paddleocr_host_profile.json"
+
+# Keys the tuner controls; explicit kwargs at the call site still win
+TUNED_KEYS = ("cpu_threads", "enable_mkldnn", "precision")
+
+DEFAULT_SAMPLE_DIRS = ["test_documents"]
+
+_profile_cache = {}
+
+
+def get_profile_path():
+    """Profile file, or None when profiles are switched off"""
+    value = os.environ.get(PROFILE_ENV)
+    if value and value.lower() in ("off", "none", "0"):
+        return None
+    return Path(value) if value else DEFAULT_PROFILE_PATH
+
+
+def host_fingerprint():
+    """What a profile was measured on; a different CPU means re-tuning"""
+    return {
+        "hostname": socket.gethostname(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def load_host_profile():
+    """
+    Load the host profile (cached)
+
+    Returns:
+        Profile dictionary, or None when there is none (or it was measured on
+        different hardware, which prints a warning once)
+    """
+    path = get_profile_path()
+    if path is None:
+        return None
+
+    key = str(path)
+    if key in _profile_cache:
+        return _profile_cache[key]
+
+    profile = None
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                profile = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Ignoring unreadable host profile {path}: {e}")
+
+    if profile is not None:
+        measured_on = profile.get("host", {})
+        current = host_fingerprint()
+        if (measured_on.get("cpu_count"), measured_on.get("machine")) != \
+                (current["cpu_count"], current["machine"]):
+            print(f"⚠ Host profile {path} was tuned on different hardware; "
+                  f"run: python host_tuning.py tune")
+            profile = None
+
+    _profile_cache[key] = profile
+    return profile
+
+
+def profile_kwargs(pipeline):
+    """
+    Tuned constructor kwargs for a pipeline
+
+    Args:
+        pipeline: "ocr" (PaddleOCR) or "structure" (PPStructureV3)
+
+    Returns:
+        Dictionary of kwargs (empty without a profile)
+    """
+    profile = load_host_profile()
+    if not profile:
+        return {}
+    entry = profile.get("pipelines", {}).get(pipeline, {})
+    return {k: v for k, v in entry.get("kwargs", {}).items() if k in TUNED_KEYS}
+
+
+def candidate_configs(max_threads=None, precisions=("fp32",)):
+    """
+    Configurations to try: thread counts x MKL-DNN on/off x precisions
+
+    Thread counts are 1, 2, 4, ... up to the CPU count, plus the CPU count itself.
+    """
+    cpu_count = max_threads or os.cpu_count() or 1
+    threads = sorted({min(2 ** i, cpu_count) for i in range(cpu_count.bit_length())} | {cpu_count})
+
+    configs = []
+    for precision in precisions:
+        for enable_mkldnn in (True, False):
+            for cpu_threads in threads:
+                configs.append({
+                    "cpu_threads": cpu_threads,
+                    "enable_mkldnn": enable_mkldnn,
+                    "precision": precision
+                })
+    return configs
+
+
+def sample_pages(dirs, count):
+    """Evenly spaced sample of the images under dirs"""
+    from input_discovery import discover_inputs
+
+    pages = list(discover_inputs(dirs, recursive=True))
+    if len(pages) <= count:
+        return pages
+    step = len(pages) / count
+    return [pages[int(i * step)] for i in range(count)]
+
+
+def _build_engine(pipeline, config):
+    from ocr_api import create_ocr_engine, create_structure_pipeline
+
+    # use_profile=False: measure the candidate, not the current profile
+    if pipeline == "structure":
+        return create_structure_pipeline(use_profile=False, **config)
+    return create_ocr_engine(lang='en', use_profile=False, **config)
+
+
+def benchmark_config(pipeline, config, pages, warmup=1):
+    """
+    Median seconds per page for one configuration
+
+    Returns:
+        (median_seconds, init_seconds), or (None, None) when the engine fails
+    """
+    try:
+        init_start = time.perf_counter()
+        engine = _build_engine(pipeline, config)
+        init_time = time.perf_counter() - init_start
+
+        for page in pages[:warmup]:
+            list(engine.predict(str(page)))
+
+        times = []
+        for page in pages:
+            start = time.perf_counter()
+            list(engine.predict(str(page)))
+            times.append(time.perf_counter() - start)
+    except Exception as e:
+        print(f"    ✗ {e}")
+        return None, None
+    finally:
+        engine = None
+        gc.collect()
+
+    times.sort()
+    return times[len(times) // 2], init_time
+
+
+def tune(pipelines=("ocr",), sample_dirs=DEFAULT_SAMPLE_DIRS, sample_size=5,
+         precisions=("fp32",), max_threads=None):
+    """
+    Run the micro-benchmarks and build a host profile
+
+    Args:
+        pipelines: Which engines to tune ("ocr", "structure")
+        sample_dirs: Directories with representative pages
+        sample_size: Pages timed per configuration
+        precisions: Precisions to try (e.g. "fp32", "fp16")
+        max_threads: Largest thread count to try (default: CPU count)
+
+    Returns:
+        Profile dictionary, or None when no pages were found
+    """
+    pages = sample_pages(sample_dirs, sample_size)
+    if not pages:
+        print(f"✗ No sample pages found in {', '.join(sample_dirs)}")
+        return None
+
+    print(f"Sample: {len(pages)} pages from {', '.join(sample_dirs)}")
+    profile = {
+        "created": datetime.now().isoformat(),
+        "host": host_fingerprint(),
+        "sample": [str(p) for p in pages],
+        "pipelines": {}
+    }
+
+    for pipeline in pipelines:
+        print(f"\nTuning {pipeline}...")
+        results = []
+        for config in candidate_configs(max_threads, precisions):
+            label = (f"threads={config['cpu_threads']:<3d} mkldnn={str(config['enable_mkldnn']):5s} "
+                     f"precision={config['precision']}")
+            median, init_time = benchmark_config(pipeline, config, pages)
+            if median is None:
+                continue
+            print(f"  {label}  {median * 1000:8.1f} ms/page  (init {init_time:.1f}s)")
+            results.append({**config, "page_ms": round(median * 1000, 1),
+                            "init_s": round(init_time, 2)})
+
+        if not results:
+            print(f"  ✗ Every configuration failed for {pipeline}")
+            continue
+
+        best = min(results, key=lambda r: r["page_ms"])
+        profile["pipelines"][pipeline] = {
+            "kwargs": {k: best[k] for k in TUNED_KEYS},
+            "page_ms": best["page_ms"],
+            "results": results
+        }
+        print(f"  ✓ Fastest: threads={best['cpu_threads']} mkldnn={best['enable_mkldnn']} "
+              f"precision={best['precision']} ({best['page_ms']:.1f} ms/page)")
+
+    return profile
+
+
+def save_host_profile(profile, path=None):
+    """Write a profile atomically"""
+    path = Path(path or get_profile_path() or DEFAULT_PROFILE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+    os.replace(tmp_path, path)
+    _profile_cache.clear()
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find the fastest engine settings for this machine and save them as a host profile',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Examples:
+  # Tune PaddleOCR on 5 pages from test_documents
+  python host_tuning.py tune
+
+  # Tune both engines on a custom sample, also trying fp16
+  python host_tuning.py tune --pipelines ocr,structure --samples test_documents/nanonets_comparison --precisions fp32,fp16
+
+  # Show the active profile
+  python host_tuning.py show
+
+The profile is written to {DEFAULT_PROFILE_PATH} (override with ${PROFILE_ENV};
+set it to "off" to ignore profiles). All scripts that build engines through
+ocr_api load it automatically; explicit settings in a script still win.
+        """
+    )
+
+    parser.add_argument('command', choices=['tune', 'show'], help='Action to perform')
+    parser.add_argument('--pipelines', default='ocr',
+                        help='Comma-separated engines to tune: ocr, structure (default: ocr)')
+    parser.add_argument('--samples', nargs='+', default=DEFAULT_SAMPLE_DIRS,
+                        help='Directories with representative pages (default: test_documents)')
+    parser.add_argument('--sample-size', type=int, default=5,
+                        help='Pages timed per configuration (default: 5)')
+    parser.add_argument('--precisions', default='fp32',
+                        help='Comma-separated precisions to try (default: fp32)')
+    parser.add_argument('--max-threads', type=int,
+                        help='Largest thread count to try (default: CPU count)')
+    parser.add_argument('--output', '-o',
+                        help='Profile file to write (default: active profile path)')
+
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        profile = load_host_profile()
+        if not profile:
+            print(f"No host profile at {get_profile_path()} (create one with: python host_tuning.py tune)")
+            return
+        print(f"Profile: {get_profile_path()} (tuned {profile.get('created', '?')})")
+        for pipeline, entry in profile.get("pipelines", {}).items():
+            print(f"  {pipeline:10s} {entry['kwargs']}  {entry['page_ms']:.1f} ms/page")
+        return
+
+    pipelines = [p.strip() for p in args.pipelines.split(',') if p.strip()]
+    unknown = [p for p in pipelines if p not in ("ocr", "structure")]
+    if unknown:
+        parser.error(f"unknown pipeline(s): {', '.join(unknown)}")
+
+    profile = tune(
+        pipelines=pipelines,
+        sample_dirs=args.samples,
+        sample_size=max(1, args.sample_size),
+        precisions=[p.strip() for p in args.precisions.split(',') if p.strip()],
+        max_threads=args.max_threads
+    )
+    if not profile or not profile["pipelines"]:
+        sys.exit(1)
+
+    path = save_host_profile(profile, args.output)
+    print(f"\n✓ Host profile saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
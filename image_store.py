@@ -0,0 +1,145 @@
+"""
+Markdown Image Store
+Save the images PP-StructureV3 extracts on background threads, optionally storing identical
+crops once in a shared content-addressed folder
+"""
+
+import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+# Shared folder (relative to the output directory) for deduplicated images
+BLOB_DIRNAME = "images"
+
+
+def image_digest(image):
+    """Content hash of a PIL image's pixels (BLAKE2b, 128-bit)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class ImageStore:
+    """
+    Write markdown images without blocking inference
+
+    With dedup=True every image is stored as <BLOB_DIRNAME>/<hash><ext> and
+    written only the first time its content is seen; save() returns the new
+    link so the markdown can be rewritten. Without dedup images keep their
+    original paths. With workers=0 writes happen synchronously.
+
+    At most max_pending images wait for the writers, so memory stays bounded
+    when encoding falls behind inference. Call close() (or use as a context
+    manager) to wait for all writes; failures are collected in .errors.
+    """
+
+    def __init__(self, output_path, dedup=False, workers=2, max_pending=None):
+        self.output_path = Path(output_path)
+        self.dedup = dedup
+        self.executor = ThreadPoolExecutor(max_workers=workers) if workers > 0 else None
+        self.slots = threading.BoundedSemaphore(max_pending or max(1, workers) * 4)
+        self.lock = threading.Lock()
+        self.known = set()
+        self.errors = []
+        self.images_seen = 0
+        self.images_written = 0
+
+        if dedup:
+            # Blobs written by earlier runs are reused
+            blob_dir = self.output_path / BLOB_DIRNAME
+            if blob_dir.is_dir():
+                self.known.update(entry.name for entry in os.scandir(blob_dir))
+
+    def _write(self, image, target):
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            image.save(str(target))
+        except Exception as e:
+            with self.lock:
+                self.errors.append(f"{target}: {e}")
+                # Not stored after all: the next image with this content writes it again
+                self.known.discard(target.name)
+            return
+        with self.lock:
+            self.images_written += 1
+
+    def _write_async(self, image, target):
+        try:
+            self._write(image, target)
+        finally:
+            self.slots.release()
+
+    def save(self, img_path, image):
+        """
+        Queue one image for writing
+
+        Args:
+            img_path: Path from markdown_images (relative to the output directory)
+            image: PIL image
+
+        Returns:
+            Path of the stored image relative to the output directory
+        """
+        relative = img_path
+        if self.dedup:
+            relative = f"{BLOB_DIRNAME}/{image_digest(image)}{Path(img_path).suffix.lower() or '.jpg'}"
+
+        with self.lock:
+            self.images_seen += 1
+            if self.dedup and Path(relative).name in self.known:
+                return relative
+            # Claimed while the write is pending; released again if it fails
+            self.known.add(Path(relative).name)
+
+        target = self.output_path / relative
+        if self.executor is None:
+            self._write(image, target)
+        else:
+            self.slots.acquire()
+            self.executor.submit(self._write_async, image, target)
+        return relative
+
+    def save_all(self, markdown_images, markdown_dir=None):
+        """
+        Queue all images of one page and return the markdown link rewrites
+
+        Args:
+            markdown_images: Dictionary {img_path: PIL image} from res.markdown
+            markdown_dir: Directory of the markdown file that links the images;
+                          links are made relative to it (default: output directory)
+
+        Returns:
+            Dictionary {original link: new link} for links that changed (blob
+            links, and links from markdown files in subfolders)
+        """
+        rewrites = {}
+        base = Path(markdown_dir) if markdown_dir else self.output_path
+        for img_path, image in (markdown_images or {}).items():
+            stored = self.save(img_path, image)
+            link = Path(os.path.relpath(self.output_path / stored, base)).as_posix()
+            if link != img_path:
+                rewrites[img_path] = link
+        return rewrites
+
+    def close(self):
+        """Wait for all queued writes"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def rewrite_links(markdown_text, rewrites):
+    """Replace image links in markdown/HTML text according to save_all() rewrites"""
+    for old, new in rewrites.items():
+        markdown_text = markdown_text.replace(f'"{old}"', f'"{new}"').replace(f'({old})', f'({new})')
+    return markdown_text
@@ -0,0 +1,245 @@
+"""
+Input Discovery
+Lazily find input files under one or more roots with os.scandir, read file lists from a
+manifest or stdin, and skip inputs that have not changed since the last run
+"""
+
+import os
+import sys
+import json
+import hashlib
+
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif'}
+
+INDEX_FILENAME = ".input_index.json"
+
+# Sidecar mapping page images to the PDF page and DPI they were rendered from
+PAGE_SOURCES_FILENAME = "page_sources.json"
+
+
+def iter_files(root, extensions=IMAGE_EXTENSIONS, recursive=True):
+    """
+    Walk a directory lazily and yield matching files
+
+    Entries are visited in name order within each directory, so runs are
+    reproducible, but no directory listing beyond the current one is held.
+
+    Args:
+        root: Directory (or single file) to scan
+        extensions: Set of lowercase extensions to accept; None accepts everything
+        recursive: Whether to descend into subdirectories
+
+    Yields:
+        File paths as strings
+    """
+    if os.path.isfile(root):
+        if extensions is None or os.path.splitext(root)[1].lower() in extensions:
+            yield root
+        return
+
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"⚠ Cannot read directory {directory}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if entry.is_file():
+                if extensions is None or os.path.splitext(entry.name)[1].lower() in extensions:
+                    yield entry.path
+            elif recursive and entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.'):
+                subdirs.append(entry.path)
+
+        # Reverse so the stack pops subdirectories in name order
+        stack.extend(reversed(subdirs))
+
+
+def read_file_list(source):
+    """
+    Read input paths from a manifest file or stdin
+
+    Args:
+        source: Path to a text file with one path per line, or '-' for stdin.
+                Blank lines and lines starting with '#' are ignored.
+
+    Yields:
+        File paths as strings
+    """
+    stream = sys.stdin if source == '-' else open(source, 'r', encoding='utf-8')
+    try:
+        for line in stream:
+            path = line.strip()
+            if path and not path.startswith('#'):
+                yield path
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def discover_inputs(roots=None, manifest=None, extensions=IMAGE_EXTENSIONS, recursive=True):
+    """
+    Yield input files from a manifest and/or directory roots
+
+    Args:
+        roots: Directory or list of directories to scan
+        manifest: Optional manifest path or '-' for stdin
+        extensions: Set of lowercase extensions to accept
+        recursive: Whether to descend into subdirectories of the roots
+
+    Yields:
+        File paths as strings
+    """
+    if manifest:
+        for path in read_file_list(manifest):
+            if extensions is None or os.path.splitext(path)[1].lower() in extensions:
+                yield path
+
+    if isinstance(roots, str):
+        roots = [roots]
+    for root in roots or []:
+        yield from iter_files(root, extensions=extensions, recursive=recursive)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Content hash of a file (BLAKE2b, 128-bit)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ChangeIndex:
+    """
+    Persistent (mtime, size, hash) index of processed inputs
+
+    A file is unchanged when its mtime and size match the index. When only the
+    mtime differs the content hash decides, so touched-but-identical files are
+    still skipped. Files are recorded with mark_done() after they were processed
+    successfully, and the index is written with save().
+    """
+
+    def __init__(self, index_file):
+        self.index_file = index_file
+        self.entries = {}
+        self.dirty = False
+
+        if os.path.exists(index_file):
+            try:
+                with open(index_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠ Ignoring unreadable input index {index_file}: {e}")
+
+    @staticmethod
+    def _key(path):
+        return os.path.abspath(path)
+
+    def is_changed(self, path):
+        """Return True if the file is new or modified since it was last marked done"""
+        entry = self.entries.get(self._key(path))
+        if entry is None:
+            return True
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return True
+
+        mtime_ns, size, digest = entry
+        if stat.st_size != size:
+            return True
+        if stat.st_mtime_ns == mtime_ns:
+            return False
+
+        # Same size, new mtime: compare content and refresh the mtime if identical
+        if file_digest(path) == digest:
+            self.entries[self._key(path)] = [stat.st_mtime_ns, size, digest]
+            self.dirty = True
+            return False
+        return True
+
+    def mark_done(self, path):
+        """Record the current state of a processed file"""
+        stat = os.stat(path)
+        self.entries[self._key(path)] = [stat.st_mtime_ns, stat.st_size, file_digest(path)]
+        self.dirty = True
+
+    def save(self):
+        """Write the index atomically if it changed"""
+        if not self.dirty:
+            return
+
+        parent = os.path.dirname(self.index_file)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, separators=(',', ':'))
+        os.replace(tmp_file, self.index_file)
+        self.dirty = False
+
+
+def filter_changed(paths, index):
+    """
+    Yield only the paths that are new or modified according to a ChangeIndex
+
+    Args:
+        paths: Iterable of file paths
+        index: ChangeIndex instance, or None to pass everything through
+    """
+    for path in paths:
+        if index is None or index.is_changed(path):
+            yield path
+
+
+def load_page_sources(directory):
+    """Page sources recorded in a directory ({image filename: {"pdf", "page", "dpi"}})"""
+    path = os.path.join(directory, PAGE_SOURCES_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_page_sources(directory, sources):
+    """Merge page sources into the directory's sidecar"""
+    merged = load_page_sources(directory)
+    merged.update(sources)
+    with open(os.path.join(directory, PAGE_SOURCES_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(merged, f, indent=2)
+
+
+# directory -> (sidecar mtime_ns, sources), so a run parses each sidecar once
+_page_sources_cache = {}
+
+
+def _cached_page_sources(directory):
+    try:
+        mtime_ns = os.stat(os.path.join(directory, PAGE_SOURCES_FILENAME)).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _page_sources_cache.get(directory)
+    if cached is None or cached[0] != mtime_ns:
+        cached = (mtime_ns, load_page_sources(directory))
+        _page_sources_cache[directory] = cached
+    return cached[1]
+
+
+def find_page_source(image_path):
+    """PDF source of a rendered page image ({"pdf", "page", "dpi"}), or None"""
+    directory, filename = os.path.split(os.path.abspath(image_path))
+    source = _cached_page_sources(directory).get(filename)
+    if source and os.path.exists(source.get("pdf", "")):
+        return source
+    return None
@@ -0,0 +1,478 @@
+"""
+Multilingual OCR (detect once, recognize many)
+Run text detection and line orientation once per image, then only the recognition model of
+each requested language over the cached crops
+"""
+
+import time
+
+from ocr_api import OCRPageResult
+from text_crops import crop_text_regions, sort_polys
+
+
+DEFAULT_DETECTION_MODEL = "PP-OCRv5_server_det"
+DEFAULT_ORIENTATION_MODEL = "PP-LCNet_x1_0_textline_ori"
+
+# Languages offered by the test scripts (code -> name)
+SUPPORTED_LANGUAGES = {
+    'ch': 'Chinese & English',
+    'en': 'English',
+    'french': 'French',
+    'german': 'German',
+    'korean': 'Korean',
+    'japan': 'Japanese',
+    'chinese_cht': 'Traditional Chinese',
+    'it': 'Italian',
+    'es': 'Spanish',
+    'pt': 'Portuguese',
+    'ru': 'Russian',
+    'ar': 'Arabic',
+    'hi': 'Hindi',
+    'ug': 'Uyghur',
+    'fa': 'Persian',
+    'ur': 'Urdu',
+    'rs_latin': 'Serbian (Latin)',
+    'oc': 'Occitan',
+    'mr': 'Marathi',
+    'ne': 'Nepali',
+    'rsc': 'Serbian (Cyrillic)',
+    'bg': 'Bulgarian',
+    'uk': 'Ukrainian',
+    'be': 'Belarusian',
+    'te': 'Telugu',
+    'kn': 'Kannada',
+    'ta': 'Tamil',
+    'af': 'Afrikaans',
+    'az': 'Azerbaijani',
+    'bs': 'Bosnian',
+    'cs': 'Czech',
+    'cy': 'Welsh',
+    'da': 'Danish',
+    'et': 'Estonian',
+    'ga': 'Irish',
+    'hr': 'Croatian',
+    'hu': 'Hungarian',
+    'id': 'Indonesian',
+    'is': 'Icelandic',
+    'ku': 'Kurdish',
+    'lt': 'Lithuanian',
+    'lv': 'Latvian',
+    'mi': 'Maori',
+    'ms': 'Malay',
+    'mt': 'Maltese',
+    'nl': 'Dutch',
+    'no': 'Norwegian',
+    'pl': 'Polish',
+    'ro': 'Romanian',
+    'sk': 'Slovak',
+    'sl': 'Slovenian',
+    'sq': 'Albanian',
+    'sv': 'Swedish',
+    'sw': 'Swahili',
+    'tl': 'Tagalog',
+    'tr': 'Turkish',
+    'uz': 'Uzbek',
+    'vi': 'Vietnamese',
+}
+
+# Recognition model per language family (PaddleOCR 3.x defaults)
+LATIN_LANGS = {
+    'fr', 'french', 'de', 'german', 'es', 'it', 'pt', 'af', 'az', 'bs', 'cs', 'cy', 'da',
+    'et', 'ga', 'hr', 'hu', 'id', 'is', 'ku', 'la', 'lt', 'lv', 'mi', 'ms', 'mt', 'nl',
+    'no', 'oc', 'pl', 'ro', 'rs_latin', 'sk', 'sl', 'sq', 'sv', 'sw', 'tl', 'tr', 'uz', 'vi'
+}
+ESLAV_LANGS = {'ru', 'uk', 'be'}
+CYRILLIC_LANGS = {'rsc', 'bg', 'mn', 'abq', 'ady', 'kbd', 'ava', 'dar', 'inh', 'che', 'lbe', 'lez', 'tab'}
+ARABIC_LANGS = {'ar', 'fa', 'ug', 'ur'}
+DEVANAGARI_LANGS = {'hi', 'mr', 'ne', 'bh', 'mai', 'ang', 'bho', 'mah', 'sck', 'new', 'gom', 'sa', 'bgc'}
+
+REC_MODELS = {
+    'ch': "PP-OCRv5_server_rec",
+    'chinese_cht': "PP-OCRv5_server_rec",
+    'japan': "PP-OCRv5_server_rec",
+    'en': "en_PP-OCRv5_mobile_rec",
+    'korean': "korean_PP-OCRv5_mobile_rec",
+    'th': "th_PP-OCRv5_mobile_rec",
+    'el': "el_PP-OCRv5_mobile_rec",
+    'ta': "ta_PP-OCRv5_mobile_rec",
+    'te': "te_PP-OCRv5_mobile_rec",
+    'kn': "ka_PP-OCRv3_mobile_rec",
+}
+REC_MODELS.update({lang: "latin_PP-OCRv5_mobile_rec" for lang in LATIN_LANGS})
+REC_MODELS.update({lang: "eslav_PP-OCRv5_mobile_rec" for lang in ESLAV_LANGS})
+REC_MODELS.update({lang: "cyrillic_PP-OCRv5_mobile_rec" for lang in CYRILLIC_LANGS})
+REC_MODELS.update({lang: "arabic_PP-OCRv5_mobile_rec" for lang in ARABIC_LANGS})
+REC_MODELS.update({lang: "devanagari_PP-OCRv5_mobile_rec" for lang in DEVANAGARI_LANGS})
+
+
+# Writing systems each recognition model can output
+MODEL_SCRIPTS = {
+    "PP-OCRv5_server_rec": {"han", "kana", "latin"},
+    "en_PP-OCRv5_mobile_rec": {"latin"},
+    "latin_PP-OCRv5_mobile_rec": {"latin"},
+    "korean_PP-OCRv5_mobile_rec": {"hangul", "latin"},
+    "eslav_PP-OCRv5_mobile_rec": {"cyrillic", "latin"},
+    "cyrillic_PP-OCRv5_mobile_rec": {"cyrillic", "latin"},
+    "arabic_PP-OCRv5_mobile_rec": {"arabic"},
+    "devanagari_PP-OCRv5_mobile_rec": {"devanagari"},
+    "th_PP-OCRv5_mobile_rec": {"thai"},
+    "el_PP-OCRv5_mobile_rec": {"greek"},
+    "ta_PP-OCRv5_mobile_rec": {"tamil"},
+    "te_PP-OCRv5_mobile_rec": {"telugu"},
+    "ka_PP-OCRv3_mobile_rec": {"kannada"},
+}
+
+# Unicode blocks per script; digits and punctuation belong to none
+SCRIPT_RANGES = {
+    "latin": [(0x41, 0x5A), (0x61, 0x7A), (0xC0, 0x24F), (0x1E00, 0x1EFF)],
+    "greek": [(0x370, 0x3FF)],
+    "cyrillic": [(0x400, 0x52F)],
+    "arabic": [(0x600, 0x6FF), (0x750, 0x77F), (0xFB50, 0xFDFF), (0xFE70, 0xFEFF)],
+    "devanagari": [(0x900, 0x97F)],
+    "tamil": [(0xB80, 0xBFF)],
+    "telugu": [(0xC00, 0xC7F)],
+    "kannada": [(0xC80, 0xCFF)],
+    "thai": [(0xE00, 0xE7F)],
+    "hangul": [(0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF)],
+    "kana": [(0x3040, 0x30FF)],
+    "han": [(0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF)],
+}
+
+# Languages probed by the script pre-pass, most likely first
+DEFAULT_CANDIDATES = ('en', 'ch', 'french', 'korean', 'ru', 'ar', 'hi')
+
+
+def char_script(ch):
+    """Script of one character, or None for digits, punctuation and spaces"""
+    code = ord(ch)
+    for script, ranges in SCRIPT_RANGES.items():
+        for low, high in ranges:
+            if low <= code <= high:
+                return script
+    return None
+
+
+def script_match(text, model_name):
+    """
+    Share of the letters in text that the model's scripts cover
+
+    Recognizers fed a foreign script still emit their own alphabet, so this
+    mostly catches models that fall back to look-alike characters. Text
+    without letters counts as a full match.
+    """
+    scripts = MODEL_SCRIPTS.get(model_name)
+    letters = [script for script in map(char_script, text) if script]
+    if not letters or scripts is None:
+        return 1.0
+    return sum(1 for script in letters if script in scripts) / len(letters)
+
+
+def recognition_model_kwargs(lang):
+    """
+    TextRecognition kwargs for a language
+
+    A recognition model pinned for the language in the engine config
+    ("ocr:<lang>") wins over the built-in mapping.
+
+    Raises:
+        ValueError: for languages without a known recognition model
+    """
+    from engine_config import load_model_config
+
+    # Only the language's own entry: a model in the shared "ocr" entry is not per-language
+    config = load_model_config()
+    pinned = config.get("pipelines", {}).get(f"ocr:{lang}", {}) if config else {}
+    model_name = pinned.get("text_recognition_model_name") or REC_MODELS.get(lang)
+    if model_name is None:
+        raise ValueError(f"No recognition model known for language '{lang}'; "
+                         f"use test_multilingual_ocr(image, '{lang}') instead")
+
+    kwargs = {"model_name": model_name}
+    if pinned.get("text_recognition_model_name") == model_name and pinned.get("text_recognition_model_dir"):
+        kwargs["model_dir"] = pinned["text_recognition_model_dir"]
+    return kwargs
+
+
+def _module_kwargs(role, default_model):
+    """Model name/dir for a shared module from the engine config, plus host profile settings"""
+    from engine_config import pipeline_kwargs, prepare_offline_mode
+    from host_tuning import profile_kwargs
+
+    prepare_offline_mode()
+    pinned = pipeline_kwargs("ocr")
+    kwargs = profile_kwargs("ocr")
+    kwargs["model_name"] = pinned.get(f"{role}_model_name", default_model)
+    if pinned.get(f"{role}_model_dir"):
+        kwargs["model_dir"] = pinned[f"{role}_model_dir"]
+    return kwargs
+
+
+class MultilingualOCR:
+    """
+    Shared detection + orientation with per-language recognition
+
+    Each model is loaded once and kept; languages that map to the same
+    recognition model share one recognition pass.
+    """
+
+    def __init__(self, use_textline_orientation=True, batch_size=16):
+        self.use_textline_orientation = use_textline_orientation
+        self.batch_size = batch_size
+        self._detector = None
+        self._orientation = None
+        self._recognizers = {}
+
+    def _get_detector(self):
+        if self._detector is None:
+            from paddleocr import TextDetection
+            self._detector = TextDetection(**_module_kwargs("text_detection", DEFAULT_DETECTION_MODEL))
+        return self._detector
+
+    def _get_orientation(self):
+        if self._orientation is None:
+            from paddleocr import TextLineOrientationClassification
+            self._orientation = TextLineOrientationClassification(
+                **_module_kwargs("textline_orientation", DEFAULT_ORIENTATION_MODEL))
+        return self._orientation
+
+    def _get_recognizer(self, rec_kwargs):
+        key = (rec_kwargs["model_name"], rec_kwargs.get("model_dir"))
+        if key not in self._recognizers:
+            from host_tuning import profile_kwargs
+            from paddleocr import TextRecognition
+            self._recognizers[key] = TextRecognition(**profile_kwargs("ocr"), **rec_kwargs)
+        return self._recognizers[key]
+
+    def detect(self, image):
+        """
+        Detect text regions and cut them out upright
+
+        Args:
+            image: Image path or BGR array
+
+        Returns:
+            (polys, crops, timings) with polys in reading order and timings
+            {"detection": s, "orientation": s}
+        """
+        import cv2
+
+        if isinstance(image, str):
+            image = cv2.imread(image)
+            if image is None:
+                raise ValueError("Could not read image")
+
+        start = time.perf_counter()
+        det_result = next(iter(self._get_detector().predict(image)))
+        polys = sort_polys(det_result["dt_polys"])
+        crops = crop_text_regions(image, polys)
+        timings = {"detection": time.perf_counter() - start, "orientation": 0.0}
+
+        if self.use_textline_orientation and crops:
+            start = time.perf_counter()
+            crops = self.orient(crops)
+            timings["orientation"] = time.perf_counter() - start
+
+        return polys, crops, timings
+
+    def orient(self, crops):
+        """Turn upside-down text line crops upright (in place; returns the list)"""
+        for idx, res in enumerate(self._get_orientation().predict(crops, batch_size=self.batch_size)):
+            if res["label_names"][0] == "180_degree":
+                crops[idx] = crops[idx][::-1, ::-1].copy()
+        return crops
+
+    def recognize(self, crops, lang):
+        """
+        Recognize cached crops with one language's model
+
+        Returns:
+            (texts, scores, seconds)
+        """
+        recognizer = self._get_recognizer(recognition_model_kwargs(lang))
+        start = time.perf_counter()
+        texts, scores = [], []
+        if crops:
+            for res in recognizer.predict(crops, batch_size=self.batch_size):
+                texts.append(res["rec_text"])
+                scores.append(float(res["rec_score"]))
+        return texts, scores, time.perf_counter() - start
+
+    def run(self, image_path, languages):
+        """
+        Detect once, then recognize with every language
+
+        Args:
+            image_path: Path to the image
+            languages: Language codes
+
+        Returns:
+            (results, timings): results maps language -> OCRPageResult (elapsed is
+            the recognition time), timings has the shared detection/orientation
+            seconds and "recognition" per language
+        """
+        polys, crops, timings = self.detect(str(image_path))
+        timings["recognition"] = {}
+
+        by_model = {}
+        results = {}
+        for lang in languages:
+            try:
+                model_name = recognition_model_kwargs(lang)["model_name"]
+            except ValueError as e:
+                results[lang] = OCRPageResult(image_path, error=str(e))
+                continue
+
+            if model_name not in by_model:
+                by_model[model_name] = self.recognize(crops, lang)
+                rec_time = by_model[model_name][2]
+            else:
+                rec_time = 0.0   # same model as an earlier language: reused
+
+            texts, scores, _ = by_model[model_name]
+            timings["recognition"][lang] = rec_time
+            results[lang] = OCRPageResult(image_path, texts=texts, scores=scores,
+                                          polys=polys, elapsed=rec_time,
+                                          error=None if texts else "No text detected")
+        return results, timings
+
+    def identify_languages(self, crops, candidates=DEFAULT_CANDIDATES, sample_size=8,
+                           min_region_score=0.8, mixed_share=0.25):
+        """
+        Script-identification pre-pass over a sample of crops
+
+        Candidates are probed in order on evenly spaced sample crops; each
+        region's fit is its recognition score times the share of its letters
+        in the model's scripts. Probing stops at the first candidate that fits
+        every sampled region, which is the common single-script case.
+
+        Args:
+            crops: Upright text crops in reading order
+            candidates: Languages to consider (one probe per recognition model)
+            sample_size: Crops recognized per candidate
+            min_region_score: Fit a region needs to count as read correctly
+            mixed_share: Share of sampled regions another language must win to
+                be added for per-region routing
+
+        Returns:
+            (languages, report): languages to recognize with, primary first;
+            report holds the sample indices and per-candidate probes
+            {lang: {"model", "texts", "scores", "fits", "share", "seconds"}}
+        """
+        sample = _sample_indices(len(crops), sample_size)
+        report = {"sample": sample, "probes": {}}
+        if not sample:
+            return [candidates[0]], report
+
+        models_seen = set()
+        for lang in candidates:
+            model_name = recognition_model_kwargs(lang)["model_name"]
+            if model_name in models_seen:
+                continue
+            models_seen.add(model_name)
+
+            texts, scores, seconds = self.recognize([crops[i] for i in sample], lang)
+            fits = [score * script_match(text, model_name) for text, score in zip(texts, scores)]
+            report["probes"][lang] = {"model": model_name, "texts": texts, "scores": scores,
+                                      "fits": fits, "share": 0.0, "seconds": seconds}
+            if min(fits) >= min_region_score:
+                break
+
+        # Each sampled region votes for the language that read it best
+        probes = report["probes"]
+        for k in range(len(sample)):
+            winner = max(probes, key=lambda lang: probes[lang]["fits"][k])
+            probes[winner]["share"] += 1 / len(sample)
+
+        def mean_fit(lang):
+            return sum(probes[lang]["fits"]) / len(sample)
+
+        ranked = sorted(probes, key=lambda lang: (probes[lang]["share"], mean_fit(lang)), reverse=True)
+        languages = [ranked[0]] + [lang for lang in ranked[1:] if probes[lang]["share"] >= mixed_share]
+        return languages, report
+
+    def run_auto(self, image_path, candidates=DEFAULT_CANDIDATES, sample_size=8,
+                 min_region_score=0.8, mixed_share=0.25):
+        """
+        Detect once, identify the script, recognize each region once
+
+        The identified primary language reads every region (reusing what the
+        pre-pass already read). On mixed-script pages, regions the primary
+        model reads poorly are routed to the other identified languages and
+        keep whichever reading fits best.
+
+        Args:
+            image_path: Path to the image
+            candidates, sample_size, min_region_score, mixed_share: See
+                identify_languages()
+
+        Returns:
+            (result, report): OCRPageResult and a dictionary with the chosen
+            languages, regions per language, recognition counts and timings
+        """
+        polys, crops, timings = self.detect(str(image_path))
+
+        start = time.perf_counter()
+        languages, identification = self.identify_languages(
+            crops, candidates, sample_size, min_region_score, mixed_share)
+        timings["identification"] = time.perf_counter() - start
+
+        primary = languages[0]
+        primary_model = recognition_model_kwargs(primary)["model_name"]
+        count = len(crops)
+        texts, scores = [None] * count, [0.0] * count
+
+        probe = identification["probes"].get(primary)
+        if probe:
+            for k, idx in enumerate(identification["sample"]):
+                texts[idx], scores[idx] = probe["texts"][k], probe["scores"][k]
+
+        start = time.perf_counter()
+        todo = [i for i in range(count) if texts[i] is None]
+        todo_texts, todo_scores, _ = self.recognize([crops[i] for i in todo], primary)
+        for i, text, score in zip(todo, todo_texts, todo_scores):
+            texts[i], scores[i] = text, score
+        recognitions = count
+
+        fits = [score * script_match(text, primary_model) for text, score in zip(texts, scores)]
+        region_languages = [primary] * count
+        for lang in languages[1:]:
+            weak = [i for i in range(count) if fits[i] < min_region_score]
+            if not weak:
+                break
+            model_name = recognition_model_kwargs(lang)["model_name"]
+            alt_texts, alt_scores, _ = self.recognize([crops[i] for i in weak], lang)
+            recognitions += len(weak)
+            for i, text, score in zip(weak, alt_texts, alt_scores):
+                fit = score * script_match(text, model_name)
+                if fit > fits[i]:
+                    texts[i], scores[i], fits[i], region_languages[i] = text, score, fit, lang
+        timings["recognition"] = time.perf_counter() - start
+
+        probe_recognitions = sum(len(p["texts"]) for lang, p in identification["probes"].items()
+                                 if lang != primary)
+        report = {
+            "languages": languages,
+            "region_languages": {lang: region_languages.count(lang) for lang in languages},
+            "probes": {lang: {"model": p["model"], "share": p["share"],
+                              "mean_fit": sum(p["fits"]) / len(p["fits"])}
+                       for lang, p in identification["probes"].items()},
+            "regions": count,
+            "recognitions": recognitions,
+            "probe_recognitions": probe_recognitions,
+            "passes_per_region": recognitions / count if count else 0.0,
+            "timings": timings
+        }
+
+        elapsed = timings["detection"] + timings["orientation"] + \
+            timings["identification"] + timings["recognition"]
+        result = OCRPageResult(image_path, texts=texts, scores=scores, polys=polys,
+                               elapsed=elapsed, error=None if texts else "No text detected")
+        return result, report
+
+
+def _sample_indices(count, sample_size):
+    """Evenly spaced indices into a list of count items"""
+    if count <= sample_size:
+        return list(range(count))
+    step = count / sample_size
+    return [int(i * step) for i in range(sample_size)]
@@ -0,0 +1,274 @@
+"""
+OCR Library API
+Run PP-OCRv5 on an image and get a structured result back; writing JSON/TXT/JPG files is optional
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+
+from ocr_stats import ScoreStats
+
+
+def _engine_options(pipeline, lang, use_profile, kwargs):
+    """Host profile settings, then pinned models, then explicit kwargs"""
+    from engine_config import pipeline_kwargs, prepare_offline_mode
+    from host_tuning import profile_kwargs
+
+    prepare_offline_mode()
+    options = profile_kwargs(pipeline) if use_profile else {}
+    options.update(pipeline_kwargs(pipeline, lang))
+    options.update(kwargs)
+    return options
+
+
+def create_ocr_engine(lang='en', use_textline_orientation=True, use_profile=True, **kwargs):
+    """
+    Initialize a PaddleOCR engine with the settings used by the test scripts
+
+    Models pinned in the engine config (see engine_config.py) are loaded from
+    their local directories without model-hoster checks, and the thread/MKL-DNN/
+    precision settings of the host profile (see host_tuning.py) are applied.
+
+    Args:
+        lang: Recognition language code
+        use_textline_orientation: Whether to classify text line orientation
+        use_profile: Apply the host profile
+        **kwargs: Extra PaddleOCR arguments (override pinned and tuned settings)
+
+    Returns:
+        PaddleOCR instance
+    """
+    options = _engine_options("ocr", lang, use_profile, kwargs)
+
+    # A pinned recognition model already fixes the language
+    if "text_recognition_model_name" not in options:
+        options["lang"] = lang
+
+    from paddleocr import PaddleOCR
+
+    return PaddleOCR(use_textline_orientation=use_textline_orientation, **options)
+
+
+def create_structure_pipeline(use_profile=True, **kwargs):
+    """
+    Initialize PP-StructureV3 with pinned local models and the host profile when configured
+
+    Args:
+        use_profile: Apply the host profile
+        **kwargs: Extra PPStructureV3 arguments (override pinned and tuned settings)
+
+    Returns:
+        PPStructureV3 instance
+    """
+    options = _engine_options("structure", None, use_profile, kwargs)
+
+    from paddleocr import PPStructureV3
+
+    return PPStructureV3(**options)
+
+
+def _box_to_list(box):
+    """Convert a polygon (array, list or tuple) to nested lists for JSON"""
+    if hasattr(box, 'tolist'):
+        return box.tolist()
+    if isinstance(box, (list, tuple)):
+        return list(box)
+    return str(box)
+
+
+class OCRPageResult:
+    """Structured OCR result for one image"""
+
+    def __init__(self, image_path, texts=None, scores=None, polys=None,
+                 raw_result=None, elapsed=0.0, error=None):
+        self.image_path = str(image_path)
+        self.texts = list(texts) if texts is not None else []
+        self.scores = scores if scores is not None else []
+        self.polys = polys if polys is not None else []
+        self.raw_result = raw_result
+        self.elapsed = elapsed
+        self.error = error
+        self.timestamp = datetime.now().isoformat()
+        self.output_files = {}
+        self.stats = ScoreStats.from_arrays(self.scores, self.texts)
+
+    @property
+    def success(self):
+        return self.error is None and len(self.texts) > 0
+
+    @property
+    def text_regions(self):
+        return len(self.texts)
+
+    @property
+    def avg_confidence(self):
+        return self.stats.average
+
+    def regions(self):
+        """Iterate over (index, text, score, box) with 1-based indices"""
+        for idx, (text, score) in enumerate(zip(self.texts, self.scores), 1):
+            box = self.polys[idx - 1] if idx - 1 < len(self.polys) else []
+            yield idx, text, float(score), box
+
+    def to_dict(self):
+        """Result in the test_basic_ocr JSON schema"""
+        return {
+            "timestamp": self.timestamp,
+            "image_path": self.image_path,
+            "total_regions": self.text_regions,
+            "statistics": self.stats.to_dict(),
+            "results": [
+                {
+                    "index": idx,
+                    "text": text,
+                    "confidence": score,
+                    "box": _box_to_list(box)
+                }
+                for idx, text, score, box in self.regions()
+            ]
+        }
+
+
+def run_ocr(image_path, ocr=None, lang='en'):
+    """
+    Run OCR on one image and return a structured result
+
+    Args:
+        image_path: Path to the image
+        ocr: Optional initialized PaddleOCR instance (reuse it across images)
+        lang: Language for a new engine when ocr is not given
+
+    Returns:
+        OCRPageResult; check .success and .error
+    """
+    if not os.path.exists(image_path):
+        return OCRPageResult(image_path, error=f"Image not found: {image_path}")
+
+    if ocr is None:
+        ocr = create_ocr_engine(lang=lang)
+
+    start_time = time.time()
+    result = ocr.predict(str(image_path))
+    elapsed = time.time() - start_time
+
+    if not result or not result[0]:
+        return OCRPageResult(image_path, elapsed=elapsed, error="No text detected")
+
+    ocr_result = result[0]
+    return OCRPageResult(
+        image_path,
+        texts=ocr_result.get('rec_texts', []),
+        scores=ocr_result.get('rec_scores', []),
+        polys=ocr_result.get('rec_polys', []),
+        raw_result=ocr_result,
+        elapsed=elapsed
+    )
+
+
+def run_recognition(image_path, polys, lang='en', use_textline_orientation=False, recognizer=None):
+    """
+    Recognize caller-supplied text regions, skipping text detection
+
+    For fixed layouts (forms, invoices) where the field positions are known.
+    Crops are recognized in one batched pass, in the order given.
+
+    Args:
+        image_path: Path to the image
+        polys: Regions as four-point polygons or [x0, y0, x1, y1] boxes
+        lang: Recognition language
+        use_textline_orientation: Turn upside-down crops upright first
+        recognizer: Optional MultilingualOCR instance (reuse it across images)
+
+    Returns:
+        OCRPageResult; raw_result holds rec_texts/rec_scores/rec_polys like a
+        PaddleOCR result
+    """
+    import cv2
+    from multilingual_ocr import MultilingualOCR
+    from text_crops import box_to_poly, crop_text_regions
+
+    if not os.path.exists(image_path):
+        return OCRPageResult(image_path, error=f"Image not found: {image_path}")
+
+    image = cv2.imread(str(image_path))
+    if image is None:
+        return OCRPageResult(image_path, error=f"Could not read image: {image_path}")
+
+    if recognizer is None:
+        recognizer = MultilingualOCR(use_textline_orientation=use_textline_orientation)
+
+    start_time = time.time()
+    polys = [box_to_poly(box) for box in polys]
+    crops = crop_text_regions(image, polys)
+    if use_textline_orientation and crops:
+        crops = recognizer.orient(crops)
+    texts, scores, _ = recognizer.recognize(crops, lang)
+    elapsed = time.time() - start_time
+
+    raw_result = {
+        "input_path": str(image_path),
+        "rec_texts": texts,
+        "rec_scores": scores,
+        "rec_polys": polys
+    }
+    return OCRPageResult(image_path, texts=texts, scores=scores, polys=polys,
+                         raw_result=raw_result, elapsed=elapsed,
+                         error=None if polys else "No regions given")
+
+
+def save_ocr_outputs(page_result, output_dir="test_results", visualization=True):
+    """
+    Write the JSON, TXT and annotated image files for a result
+
+    Args:
+        page_result: OCRPageResult from run_ocr
+        output_dir: Directory to save results
+        visualization: Whether to render the annotated image (PaddleOCR results only)
+
+    Returns:
+        Dictionary with the paths of the written files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    name_without_ext = os.path.splitext(os.path.basename(page_result.image_path))[0]
+    output_files = {}
+
+    # 1. JSON file (structured data with coordinates and confidence)
+    json_file = os.path.join(output_dir, f"{name_without_ext}.json")
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(page_result.to_dict(), f, indent=2, ensure_ascii=False)
+    output_files["json"] = json_file
+
+    # 2. Plain text file (extracted text only)
+    txt_file = os.path.join(output_dir, f"{name_without_ext}.txt")
+    with open(txt_file, 'w', encoding='utf-8') as f:
+        f.write(f"OCR Results for: {page_result.image_path}\n")
+        f.write(f"Timestamp: {datetime.now().isoformat()}\n")
+        f.write(f"Total text regions: {page_result.text_regions}\n")
+        f.write("="*60 + "\n\n")
+
+        for idx, text, score, _ in page_result.regions():
+            f.write(f"{idx}. {text}\n")
+
+        f.write("\n" + "="*60 + "\n")
+        f.write("Detailed Results with Confidence Scores:\n")
+        f.write("="*60 + "\n\n")
+
+        for idx, text, score, _ in page_result.regions():
+            f.write(f"{idx:3d}. {text:50s} (confidence: {score:.4f})\n")
+    output_files["txt"] = txt_file
+
+    # 3. Visualization image (with bounding boxes); recognition-only and reused
+    #    results carry a plain dictionary with nothing to draw with
+    if visualization and hasattr(page_result.raw_result, "save_to_img"):
+        viz_file = os.path.join(output_dir, f"{name_without_ext}_annotated.jpg")
+        try:
+            page_result.raw_result.save_to_img(viz_file)
+            output_files["image"] = viz_file
+        except Exception as e:
+            print(f"⚠ Could not create visualization: {e}")
+
+    page_result.output_files = output_files
+    return output_files
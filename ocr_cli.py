@@ -0,0 +1,210 @@
+"""
+PaddleOCR Toolkit CLI
+One entry point for the test and benchmark scripts; each subcommand imports only the
+modules it needs, so startup and --help stay fast
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import importlib
+import subprocess
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'replace')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
+    except Exception:
+        pass
+
+
+# Subcommand -> (module implementing it, one-line description)
+COMMANDS = {
+    "analyze": ("analyze_pdf_complexity", "Score PDF pages by layout complexity"),
+    "extract": ("extract_pdf_pages", "Render selected PDF pages to images"),
+    "ocr": ("test_basic_ocr", "Run PP-OCRv5 on an image (or the sample suite)"),
+    "markdown": ("convert_pages_to_markdown", "Convert pages, PDFs and TIFFs to Markdown with PP-StructureV3"),
+    "bench": ("benchmark_nanonets_comparison", "Benchmark PP-OCRv5 on a page set"),
+    "batch": ("batch_test_all", "Batch OCR over the test document folders"),
+    "recognize": ("recognize_regions", "Recognize text in known boxes (no detection)"),
+    "tables": ("table_html", "Convert table HTML to CSV/Arrow"),
+    "templates": ("template_registry", "Register form/invoice layouts and read matching pages fast"),
+    "pool": ("engine_pool", "Run jobs for several engines within a memory budget"),
+    "tune": ("host_tuning", "Benchmark engine settings on this host and save the fastest"),
+    "models": ("engine_config", "Pin models to local directories and verify them (offline start)"),
+}
+
+# One line of `python -X importtime` output
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _run_ocr(module, argv):
+    """`ocr` has no argparse main of its own: image path -> single test, none -> suite"""
+    parser = argparse.ArgumentParser(prog=f"{os.path.basename(sys.argv[0])} ocr",
+                                     description='Run PP-OCRv5 on an image and save JSON/TXT/annotated output')
+    parser.add_argument('image', nargs='?', help='Image to process (omit to run the sample suite)')
+    parser.add_argument('--output', '-o', default='test_results',
+                        help='Output directory (default: test_results)')
+    args = parser.parse_args(argv)
+
+    if args.image:
+        result = module.test_basic_ocr(args.image, output_dir=args.output)
+        sys.exit(0 if result else 1)
+    module.main()
+
+
+def run_command(command, argv, report_import=False):
+    """
+    Import the module behind a subcommand and run its main() with argv
+
+    Args:
+        command: Key of COMMANDS
+        argv: Arguments for the subcommand
+        report_import: Print how long the module import took (stderr)
+    """
+    module_name, _ = COMMANDS[command]
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    if report_import:
+        print(f"[import] {module_name}: {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+
+    if command == "ocr":
+        _run_ocr(module, argv)
+        return
+
+    # The script's own parser sees the subcommand arguments; prog reads "ocr_cli.py <command>"
+    saved_argv = sys.argv
+    sys.argv = [f"{os.path.basename(saved_argv[0])} {command}"] + list(argv)
+    try:
+        module.main()
+    finally:
+        sys.argv = saved_argv
+
+
+def _importtime(code):
+    """Run code in a fresh interpreter with -X importtime; returns (returncode, [(name, self_ms, cumulative_ms, level)])"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        # Nesting is shown by two spaces per level after the separator space
+        level = max(0, len(indent) - 1) // 2
+        modules.append((name, int(self_us) / 1000, int(cumulative_us) / 1000, level))
+    return completed.returncode, modules
+
+
+def measure_import_times(module_name):
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Modules the bare interpreter loads at startup (site, encodings, ...) are
+    left out, so the total is the cost the subcommand adds.
+
+    Args:
+        module_name: Module to import
+
+    Returns:
+        (total_ms, [(module, self_ms, cumulative_ms), ...]) where the list holds
+        the modules imported directly by the subcommand module (or alongside
+        it), slowest first; total_ms is None when the import failed. A module
+        is charged to whichever import loaded it first.
+    """
+    _, baseline = _importtime("pass")
+    startup_modules = {name for name, _, _, level in baseline if level == 0}
+
+    returncode, entries = _importtime(f"import {module_name}")
+    entries = [e for e in entries if not (e[3] == 0 and e[0] in startup_modules)]
+    if returncode != 0:
+        return None, []
+
+    total_ms = sum(cumulative for _, _, cumulative, level in entries if level == 0)
+    modules = [(name, self_ms, cumulative) for name, self_ms, cumulative, level in entries
+               if (level == 1) or (level == 0 and name != module_name)]
+    modules.sort(key=lambda m: m[2], reverse=True)
+    return total_ms, modules
+
+
+def print_import_report(commands, top=10):
+    """Print per-subcommand startup cost with the slowest imported modules"""
+    print("\n" + "="*70)
+    print("CLI IMPORT-TIME REPORT")
+    print("="*70)
+
+    for command in commands:
+        module_name, _ = COMMANDS[command]
+        total_ms, modules = measure_import_times(module_name)
+
+        if total_ms is None:
+            print(f"\n{command:10s} ({module_name}): ✗ import failed (missing dependency?)")
+            continue
+
+        print(f"\n{command:10s} ({module_name}): {total_ms:.1f} ms")
+        for name, self_ms, cumulative_ms in modules[:top]:
+            print(f"    {cumulative_ms:8.1f} ms  {name}  (self {self_ms:.1f} ms)")
+
+    print("\n" + "="*70)
+
+
+def main():
+    command_list = "\n".join(f"  {name:10s} {description}" for name, (_, description) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        description='PaddleOCR testing toolkit',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        usage='%(prog)s [--import-times] <command> [args...]',
+        epilog=f"""
+Commands:
+{command_list}
+  startup    Report import time per subcommand (fresh interpreter each)
+
+Run '%(prog)s <command> --help' for the options of a command.
+
+Examples:
+  python ocr_cli.py analyze document.pdf --top 15
+  python ocr_cli.py extract document.pdf --pages "5,12,23-25"
+  python ocr_cli.py ocr test_images/sample.jpg
+  python ocr_cli.py markdown test_documents/nanonets_comparison -o output/markdown_pages
+  python ocr_cli.py bench --input test_documents/nanonets_comparison
+  python ocr_cli.py startup --top 5
+        """
+    )
+
+    parser.add_argument('--import-times', action='store_true',
+                        help='Print how long loading the subcommand module took')
+    parser.add_argument('command', choices=list(COMMANDS) + ['startup'], metavar='command',
+                        help='Subcommand to run')
+    parser.add_argument('args', nargs=argparse.REMAINDER,
+                        help='Arguments passed to the subcommand')
+
+    args = parser.parse_args()
+
+    if args.command == 'startup':
+        startup = argparse.ArgumentParser(prog=f"{os.path.basename(sys.argv[0])} startup",
+                                          description='Report import time per subcommand')
+        startup.add_argument('commands', nargs='*',
+                             help=f'Subcommands to measure (default: all of {", ".join(COMMANDS)})')
+        startup.add_argument('--top', type=int, default=10,
+                             help='Slowest modules to list per subcommand (default: 10)')
+        startup_args = startup.parse_args(args.args)
+        unknown = [c for c in startup_args.commands if c not in COMMANDS]
+        if unknown:
+            startup.error(f"unknown command(s): {', '.join(unknown)}")
+        print_import_report(startup_args.commands or list(COMMANDS), top=startup_args.top)
+        return
+
+    run_command(args.command, args.args, report_import=args.import_times)
+
+
+if __name__ == "__main__":
+    main()
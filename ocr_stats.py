@@ -0,0 +1,140 @@
+"""
+OCR Score Statistics
+Vectorized confidence and text-length statistics that merge from page to category to run level
+"""
+
+import numpy as np
+
+
+# Bucket edges for the confidence distribution: low < 0.7 <= medium < 0.9 <= high
+DEFAULT_BUCKET_EDGES = (0.7, 0.9)
+
+
+def parse_bucket_edges(edge_string):
+    """
+    Parse a comma-separated list of bucket edges (e.g. "0.5,0.7,0.9")
+
+    Args:
+        edge_string: String with increasing edges between 0 and 1
+
+    Returns:
+        Tuple of floats
+    """
+    edges = tuple(float(e) for e in edge_string.split(',') if e.strip())
+    if not edges or list(edges) != sorted(set(edges)):
+        raise ValueError(f"Bucket edges must be strictly increasing: {edge_string}")
+    return edges
+
+
+def bucket_labels(edges=DEFAULT_BUCKET_EDGES):
+    """
+    Labels for the confidence buckets, lowest bucket first
+
+    The default edges produce the labels used throughout the reports:
+    "low (<0.7)", "medium (0.7-0.9)", "high (≥0.9)".
+    """
+    edges = tuple(edges)
+    labels = [f"low (<{edges[0]:g})"]
+    for lower, upper in zip(edges, edges[1:]):
+        name = "medium" if len(edges) == 2 else "band"
+        labels.append(f"{name} ({lower:g}-{upper:g})")
+    labels.append(f"high (≥{edges[-1]:g})")
+    return labels
+
+
+class ScoreStats:
+    """
+    Mergeable summary of recognition scores and text lengths
+
+    Built in one vectorized pass over a page's rec_scores / rec_texts; partial
+    results combine with merge() (or +=) so category and run totals never need
+    the per-region arrays again.
+    """
+
+    def __init__(self, edges=DEFAULT_BUCKET_EDGES):
+        self.edges = tuple(edges)
+        self.count = 0
+        self.score_sum = 0.0
+        self.min_score = None
+        self.max_score = None
+        self.total_characters = 0
+        self.bucket_counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+
+    @classmethod
+    def from_arrays(cls, scores, texts=None, edges=DEFAULT_BUCKET_EDGES):
+        """
+        Compute statistics for one page
+
+        Args:
+            scores: Sequence or array of confidence scores
+            texts: Optional sequence of recognized strings (for character counts)
+            edges: Confidence bucket edges
+
+        Returns:
+            ScoreStats instance
+        """
+        stats = cls(edges)
+        scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+
+        stats.count = int(scores.size)
+        if stats.count:
+            stats.score_sum = float(scores.sum())
+            stats.min_score = float(scores.min())
+            stats.max_score = float(scores.max())
+            buckets = np.searchsorted(np.asarray(stats.edges), scores, side='right')
+            stats.bucket_counts = np.bincount(buckets, minlength=len(stats.edges) + 1)
+
+        if texts is not None and len(texts):
+            stats.total_characters = int(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)).sum())
+
+        return stats
+
+    @property
+    def average(self):
+        return self.score_sum / self.count if self.count else 0
+
+    def merge(self, other):
+        """Fold another ScoreStats (same edges) into this one and return self"""
+        if other.edges != self.edges:
+            raise ValueError(f"Cannot merge stats with bucket edges {other.edges} into {self.edges}")
+
+        self.count += other.count
+        self.score_sum += other.score_sum
+        self.total_characters += other.total_characters
+        self.bucket_counts = self.bucket_counts + other.bucket_counts
+
+        if other.min_score is not None:
+            self.min_score = other.min_score if self.min_score is None else min(self.min_score, other.min_score)
+            self.max_score = other.max_score if self.max_score is None else max(self.max_score, other.max_score)
+
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def confidence_scores(self, digits=4):
+        """Average/min/max block as used in the JSON reports"""
+        return {
+            "average": round(self.average, digits),
+            "min": round(self.min_score or 0, digits),
+            "max": round(self.max_score or 0, digits)
+        }
+
+    def confidence_distribution(self):
+        """Bucket counts keyed by label, highest bucket first as in the reports"""
+        labels = bucket_labels(self.edges)
+        return {label: int(count) for label, count in reversed(list(zip(labels, self.bucket_counts)))}
+
+    def to_dict(self, digits=4):
+        """Serializable form of all statistics"""
+        return {
+            "text_regions": self.count,
+            "total_characters": self.total_characters,
+            "confidence_scores": self.confidence_scores(digits),
+            "confidence_distribution": self.confidence_distribution()
+        }
+
+
+def rounded_scores(scores, digits=4):
+    """Round an array of scores in one vectorized step and return plain floats"""
+    return np.round(np.asarray(scores, dtype=np.float64), digits).tolist()
@@ -0,0 +1,291 @@
+"""
+Running Header/Footer Caching
+Find text lines near the top and bottom edge that are identical on every page of a PDF document
+(running headers, footers, letterheads), OCR them once per document and stitch each page's result
+from the cached bands plus OCR of the lines that change (body, page numbers)
+"""
+
+import os
+import time
+
+import numpy as np
+
+from input_discovery import find_page_source
+
+
+# Width pages are compared at (heights scale with the aspect ratio)
+COMPARE_WIDTH = 400
+
+# A document needs this many pages before bands are trusted to be running content
+MIN_PAGES = 3
+
+# Share of the page height at the top and bottom where running lines are looked for
+MAX_BAND_SHARE = 0.2
+
+# Gray level below which a pixel counts as ink
+INK_LEVEL = 160
+
+# A line is running content only if no window of INK_WINDOW columns has more than
+# MAX_CHANGED_INK ink pixels that differ from the first page (a changed digit does)
+INK_WINDOW = 8
+MAX_CHANGED_INK = 2
+
+
+def _load_small(path, width=COMPARE_WIDTH):
+    """Grayscale page at the comparison width, and the full-resolution (width, height)"""
+    from PIL import Image
+
+    with Image.open(str(path)) as pil:
+        size = pil.size
+        pil.draft('L', (width, int(width * pil.height / pil.width)))
+        gray = pil.convert('L').resize((width, max(int(round(width * size[1] / size[0])), 1)),
+                                       Image.BILINEAR)
+    return np.asarray(gray, dtype=np.float32), size
+
+
+def _line_runs(ink):
+    """(start, end) row ranges of consecutive ink rows"""
+    rows = np.flatnonzero(ink)
+    if not len(rows):
+        return []
+    breaks = np.flatnonzero(np.diff(rows) > 1)
+    starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], [rows[-1]])) + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _ink_matches(changed):
+    """Whether a line's changed-ink pixels stay within MAX_CHANGED_INK in every column window"""
+    columns = np.concatenate(([0], changed.sum(axis=0).cumsum()))
+    window = min(INK_WINDOW, len(columns) - 1)
+    return int((columns[window:] - columns[:-window]).max()) <= MAX_CHANGED_INK
+
+
+def find_stable_bands(paths):
+    """
+    Split a document's pages into cached bands and varying segments
+
+    Text lines are runs of rows with ink on any page. A line near the top or
+    bottom edge (within MAX_BAND_SHARE of the height) whose rows match on
+    ink mask matches on every page is running content. Ink is compared pixel
+    by pixel in narrow column windows, so a page number on the same row as
+    a running title keeps the whole line varying. Blank gaps are split at their middle,
+    so every segment keeps some margin around its text.
+
+    Args:
+        paths: Page images of one document (same page size)
+
+    Returns:
+        List of (top, bottom, cached) full-resolution row ranges, top to
+        bottom, covering every text line; rows blank on all pages are left out
+    """
+    pages = []
+    sizes = set()
+    for path in paths:
+        gray, size = _load_small(path)
+        pages.append(gray)
+        sizes.add(size)
+    if len(sizes) != 1:
+        raise ValueError("Pages of a document must share one size")
+    (_, height), = sizes
+
+    masks = np.stack(pages) < INK_LEVEL
+    # Pixels whose ink differs from the first page on any page
+    changed = (masks != masks[0]).any(axis=0)
+    ink = masks.any(axis=(0, 2))
+
+    rows = masks.shape[1]
+    limit = int(rows * MAX_BAND_SHARE)
+    lines = _line_runs(ink)
+
+    segments = []
+    for idx, (start, end) in enumerate(lines):
+        top = 0 if idx == 0 else (lines[idx - 1][1] + start) // 2
+        bottom = rows if idx == len(lines) - 1 else (end + lines[idx + 1][0]) // 2
+        cached = (end <= limit or start >= rows - limit) and _ink_matches(changed[start:end])
+        if segments and segments[-1][2] == cached:
+            segments[-1][1] = bottom
+        else:
+            segments.append([top, bottom, cached])
+
+    scale = height / rows
+    return [(int(top * scale), min(int(bottom * scale), height), cached) for top, bottom, cached in segments]
+
+
+def _first_result(results):
+    """(texts, scores, polys) of a predict() call; empty lists when nothing was found"""
+    results = list(results) if results is not None else []
+    if not results or not results[0]:
+        return [], [], []
+    result = results[0]
+    return (list(result.get('rec_texts', [])), list(result.get('rec_scores', [])),
+            list(result.get('rec_polys', [])))
+
+
+def _shift(polys, offset):
+    return [np.asarray(poly) + np.array([0, offset], dtype=np.asarray(poly).dtype) for poly in polys]
+
+
+class DocumentBands:
+    """
+    Running bands of one document and their cached OCR results
+
+    The cached bands are recognized on the first page that needs them; every
+    page then only runs OCR on its varying segments.
+    """
+
+    def __init__(self, pdf, pages, segments):
+        self.pdf = pdf
+        self.pages = pages
+        self.segments = segments
+        self._cache = None
+        self.band_seconds = 0.0
+        self.pages_done = 0
+
+    @property
+    def has_bands(self):
+        return any(cached for _, _, cached in self.segments)
+
+    @property
+    def cached_rows(self):
+        return sum(bottom - top for top, bottom, cached in self.segments if cached)
+
+    @staticmethod
+    def _ocr_segment(engine, image, top, bottom):
+        texts, scores, polys = _first_result(engine.predict(np.ascontiguousarray(image[top:bottom])))
+        return texts, scores, _shift(polys, top)
+
+    def predict(self, engine, image_path):
+        """
+        OCR a page of the document
+
+        Args:
+            engine: PaddleOCR instance (or SupervisedEngine)
+            image_path: Page image
+
+        Returns:
+            List with one result dictionary (rec_texts, rec_scores, rec_polys
+            in page coordinates, top to bottom) plus a "bands" entry
+            describing what came from the cache
+        """
+        import cv2
+
+        image = cv2.imread(str(image_path))
+        if image is None:
+            raise ValueError(f"Could not read image: {image_path}")
+
+        cached = self._cache is not None
+        if not cached:
+            start = time.perf_counter()
+            self._cache = {(top, bottom): self._ocr_segment(engine, image, top, bottom)
+                           for top, bottom, is_band in self.segments if is_band}
+            self.band_seconds = time.perf_counter() - start
+
+        texts, scores, polys = [], [], []
+        band_regions = 0
+        for top, bottom, is_band in self.segments:
+            if is_band:
+                segment = self._cache[(top, bottom)]
+                band_regions += len(segment[0])
+            else:
+                segment = self._ocr_segment(engine, image, top, bottom)
+            texts += segment[0]
+            scores += segment[1]
+            polys += segment[2]
+        self.pages_done += 1
+
+        return [{
+            "rec_texts": texts,
+            "rec_scores": scores,
+            "rec_polys": polys,
+            "bands": {
+                "document": os.path.basename(self.pdf),
+                "cached_px": self.cached_rows,
+                "band_regions": band_regions,
+                "cached": cached
+            }
+        }]
+
+    def report(self):
+        saved = self.band_seconds * max(self.pages_done - 1, 0)
+        return {
+            "document": self.pdf,
+            "pages": len(self.pages),
+            "bands": [[top, bottom] for top, bottom, cached in self.segments if cached],
+            "band_regions": sum(len(texts) for texts, _, _ in self._cache.values()) if self._cache else 0,
+            "band_ocr_seconds": round(self.band_seconds, 3),
+            "estimated_time_saved_seconds": round(saved, 2)
+        }
+
+
+class BandPlanner:
+    """
+    Document-level pre-pass over a page list
+
+    Pages rendered from the same PDF (page_sources.json written by
+    extract_pdf_pages.py) at the same size form a document; documents of at
+    least min_pages pages are checked for stable header and footer bands.
+    Other pages are OCRed whole.
+    """
+
+    def __init__(self, min_pages=MIN_PAGES):
+        self.min_pages = min_pages
+        self.documents = []
+        self._by_page = {}
+        self.detect_seconds = 0.0
+
+    @classmethod
+    def build(cls, paths, min_pages=MIN_PAGES):
+        from PIL import Image
+
+        planner = cls(min_pages)
+        start = time.perf_counter()
+
+        groups = {}
+        for path in paths:
+            path = str(path)
+            source = find_page_source(path)
+            if source is None:
+                continue
+            try:
+                with Image.open(path) as pil:
+                    size = pil.size
+            except OSError:
+                continue
+            groups.setdefault((source["pdf"], size), []).append(path)
+
+        for (pdf, _), pages in groups.items():
+            if len(pages) < min_pages:
+                continue
+            try:
+                segments = find_stable_bands(pages)
+            except (OSError, ValueError):
+                continue
+            document = DocumentBands(pdf, pages, segments)
+            if not document.has_bands:
+                continue
+            planner.documents.append(document)
+            for page in pages:
+                planner._by_page[page] = document
+
+        planner.detect_seconds = time.perf_counter() - start
+        return planner
+
+    def document_of(self, path):
+        """DocumentBands a page belongs to, or None when it is OCRed whole"""
+        return self._by_page.get(str(path))
+
+    @property
+    def pages(self):
+        return len(self._by_page)
+
+    def summary(self):
+        documents = [document.report() for document in self.documents]
+        return {
+            "documents": len(documents),
+            "pages": self.pages,
+            "detect_seconds": round(self.detect_seconds, 3),
+            "band_ocr_seconds": round(sum(d["band_ocr_seconds"] for d in documents), 2),
+            "estimated_time_saved_seconds": round(sum(d["estimated_time_saved_seconds"] for d in documents), 2),
+            "details": documents
+        }
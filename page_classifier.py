@@ -0,0 +1,403 @@
+"""
+Page Classifier
+Cheap page-class signals (plain text, table, figure, full) from PDF complexity metrics
+or a fast image pre-pass, used to decide which document-parsing modules a page needs
+"""
+
+import os
+import time
+
+import numpy as np
+
+
+PAGE_CLASSES = ("text", "table", "figure", "full")
+
+# Width the image pre-pass works at; enough to see text layout and photos
+PREPASS_WIDTH = 600
+
+# Width table rules are looked for at; thin or light borders fade out below it
+RULE_WIDTH = 1200
+
+# A rule pixel is this much darker than the pixels RULE_REACH px to both sides
+# of it, so light borders count and filled cells (shaded headers) do not
+RULE_CONTRAST = 40
+RULE_REACH = 4
+
+# Minimum rule lengths: horizontal as a share of the width, vertical as a
+# share of the height (at least MIN_VERTICAL_RULE_PX, above text height)
+MIN_HORIZONTAL_RULE = 0.25
+MIN_VERTICAL_RULE = 0.03
+MIN_VERTICAL_RULE_PX = 24
+
+
+def classify_from_complexity(complexity):
+    """
+    Map analyze_page_complexity() output to a page class
+
+    Args:
+        complexity: Dictionary from analyze_pdf_complexity.analyze_page_complexity
+
+    Returns:
+        One of PAGE_CLASSES, or None when the page has no text layer (scanned
+        page) and the image pre-pass should decide instead
+    """
+    if complexity.get("text_length", 0) == 0:
+        return None
+
+    # Some rule or grid evidence without a clear table: keep every module
+    if complexity.get("uncertain"):
+        return "full"
+
+    tables = complexity.get("tables_likely", False)
+    images = complexity.get("images", 0) > 0
+
+    if tables and images:
+        return "full"
+    if tables:
+        return "table"
+    if images:
+        return "figure"
+    return "text"
+
+
+def widen_class(page_class, other):
+    """Narrowest page class whose module gates cover both classes"""
+    if other in (None, "text", page_class):
+        return page_class
+    if page_class == "text":
+        return other
+    return "full"
+
+
+def _open_gray(image, width):
+    """Open a path or BGR/RGB array as a grayscale PIL image at least width wide (when it is)"""
+    from PIL import Image
+
+    if isinstance(image, np.ndarray):
+        gray = image.mean(axis=2) if image.ndim == 3 else image.astype(np.float32)
+        return Image.fromarray(gray.astype(np.uint8))
+
+    pil = Image.open(str(image))
+    # JPEG draft mode decodes directly at reduced size
+    pil.draft('L', (width, width * 2))
+    return pil.convert('L')
+
+
+def _resize_gray(pil, width, resample=None):
+    """Grayscale PIL image -> float array at most width wide"""
+    if pil.width > width:
+        pil = pil.resize((width, max(1, round(pil.height * width / pil.width))), resample)
+    return np.asarray(pil, dtype=np.float32)
+
+
+def _load_gray(image, width=PREPASS_WIDTH):
+    """Load a path or BGR/RGB array as a small grayscale float array"""
+    return _resize_gray(_open_gray(image, width), width)
+
+
+def analyze_image_complexity(image):
+    """
+    Fast image pre-pass producing the same signals as analyze_page_complexity
+
+    Table rules show up as long thin lines darker than their surroundings
+    (see _find_rules); photos and charts show up as large areas of mid-tone
+    pixels, which scanned text lacks. A page with some rule evidence that
+    does not add up to a table is marked uncertain.
+
+    Args:
+        image: Path to an image or an image array
+
+    Returns:
+        Dictionary with tables_likely, uncertain, images, ink_ratio,
+        horizontal_rules, vertical_rules, multi_column_lines and midtone_ratio
+    """
+    from PIL import Image
+
+    pil = _open_gray(image, RULE_WIDTH)
+    gray = _resize_gray(pil, PREPASS_WIDTH)
+    # The rule pass runs at a fixed scale; the box filter makes thin lines fade
+    # to gray instead of dropping out, small images are scaled up
+    fine = np.asarray(pil.resize((RULE_WIDTH, max(1, round(pil.height * RULE_WIDTH / pil.width))),
+                                 Image.BOX if pil.width > RULE_WIDTH else Image.BILINEAR),
+                      dtype=np.float32)
+    height, width = gray.shape
+
+    dark = gray < 128
+    ink_ratio = float(dark.mean())
+
+    # Table borders and rules
+    horizontal_rules, vertical_rules = _find_rules(fine)
+
+    # Photos and charts: many pixels neither paper-white nor ink-black
+    midtone = (gray > 60) & (gray < 200)
+    midtone_ratio = float(midtone.mean())
+
+    # Borderless tables: several text lines split into 3+ aligned column segments
+    aligned_rows = _count_multi_column_lines(dark, min_segments=3)
+
+    tables_likely = ((horizontal_rules >= 2 and vertical_rules >= 2)
+                     or horizontal_rules >= 3
+                     or aligned_rows >= 3)
+    # A single horizontal rule is usually a header/footer separator
+    uncertain = not tables_likely and (vertical_rules >= 1 or horizontal_rules >= 2
+                                       or aligned_rows >= 2)
+    has_images = midtone_ratio > 0.15
+
+    return {
+        "tables_likely": bool(tables_likely),
+        "uncertain": bool(uncertain),
+        "images": int(has_images),
+        "text_length": int(ink_ratio * height * width),
+        "ink_ratio": round(ink_ratio, 4),
+        "horizontal_rules": horizontal_rules,
+        "vertical_rules": vertical_rules,
+        "multi_column_lines": aligned_rows,
+        "midtone_ratio": round(midtone_ratio, 4)
+    }
+
+
+def _count_runs(mask):
+    """Number of contiguous True runs in a 1-D boolean array"""
+    if not mask.any():
+        return 0
+    edges = np.diff(mask.astype(np.int8), prepend=0)
+    return int((edges == 1).sum())
+
+
+def _thin_lines(gray, axis):
+    """Pixels darker by RULE_CONTRAST than the pixels RULE_REACH away on both sides along axis"""
+    k = RULE_REACH
+    pad = [(0, 0), (0, 0)]
+    pad[axis] = (k, k)
+    padded = np.pad(gray, pad, mode='edge')
+    if axis == 0:
+        before, after = padded[:-2 * k], padded[2 * k:]
+    else:
+        before, after = padded[:, :-2 * k], padded[:, 2 * k:]
+    return gray < np.minimum(before, after) - RULE_CONTRAST
+
+
+def _has_run(mask, length):
+    """Per row of a 2-D boolean array: whether it holds length consecutive True values"""
+    if mask.shape[1] < length:
+        return np.zeros(mask.shape[0], dtype=bool)
+    cumsum = np.cumsum(np.pad(mask.astype(np.int32), ((0, 0), (1, 0))), axis=1)
+    return ((cumsum[:, length:] - cumsum[:, :-length]) == length).any(axis=1)
+
+
+def _find_rules(gray):
+    """
+    Count horizontal and vertical rules (morphological line test)
+
+    A horizontal rule is an unbroken run of thin-line pixels at least
+    MIN_HORIZONTAL_RULE of the width long, a vertical rule likewise at least
+    MIN_VERTICAL_RULE of the height; adjacent rows (columns) count once.
+
+    Returns:
+        (horizontal_rules, vertical_rules)
+    """
+    height, width = gray.shape
+    rows = _has_run(_thin_lines(gray, 0), max(2, int(width * MIN_HORIZONTAL_RULE)))
+    cols = _has_run(_thin_lines(gray, 1).T,
+                    max(MIN_VERTICAL_RULE_PX, int(height * MIN_VERTICAL_RULE)))
+    return _count_runs(rows), _count_runs(cols)
+
+
+def _count_multi_column_lines(dark, min_segments=3, gap_fraction=0.03):
+    """
+    Count text lines whose ink splits into at least min_segments blocks
+
+    Gaps narrower than gap_fraction of the page width (word spacing) are
+    bridged, so only column-sized gaps separate segments.
+    """
+    height, width = dark.shape
+    line_rows = dark.mean(axis=1) > 0.002
+    if not line_rows.any():
+        return 0
+
+    edges = np.diff(line_rows.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    min_gap = max(2, int(width * gap_fraction))
+
+    count = 0
+    for start, end in zip(starts, ends):
+        ink_cols = np.flatnonzero(dark[start:end].any(axis=0))
+        if len(ink_cols) < 2:
+            continue
+        segments = 1 + int((np.diff(ink_cols) > min_gap).sum())
+        if segments >= min_segments:
+            count += 1
+    return count
+
+
+def classify_image(image):
+    """Page class for an image path or array using the image pre-pass"""
+    complexity = analyze_image_complexity(image)
+    complexity["text_length"] = max(complexity["text_length"], 1)
+    return classify_from_complexity(complexity)
+
+
+def iter_pdf_page_classes(pdf_path):
+    """
+    Classify every page of a PDF from its text layer, without rendering
+
+    Args:
+        pdf_path: Path to the PDF
+
+    Yields:
+        (page_number, page_class or None) with 1-based page numbers; None marks
+        pages without a text layer that need the image pre-pass
+    """
+    import fitz  # PyMuPDF
+    from analyze_pdf_complexity import analyze_page_complexity
+
+    with fitz.open(str(pdf_path)) as pdf_document:
+        for page_idx in range(pdf_document.page_count):
+            complexity = analyze_page_complexity(pdf_document[page_idx])
+            yield page_idx + 1, classify_from_complexity(complexity)
+
+
+def is_pdf(path):
+    return os.path.splitext(str(path))[1].lower() == '.pdf'
+
+
+# PP-StructureV3 predict() flags per page class; sub-pipelines a class cannot
+# contain are switched off, "full" keeps the pipeline defaults
+MODULE_GATES = {
+    "text": {
+        "use_table_recognition": False,
+        "use_formula_recognition": False,
+        "use_seal_recognition": False,
+        "use_chart_recognition": False
+    },
+    "table": {
+        "use_formula_recognition": False,
+        "use_seal_recognition": False,
+        "use_chart_recognition": False
+    },
+    "figure": {
+        "use_table_recognition": False,
+        "use_formula_recognition": False,
+        "use_seal_recognition": False
+    },
+    "full": {}
+}
+
+
+class GatedPipeline:
+    """
+    PP-StructureV3 wrapper that runs only the sub-pipelines a page needs
+
+    All variants share one resident pipeline: the gates are passed as
+    predict() flags, so no extra models are loaded. Pages are classified by
+    the image pre-pass; a class from the caller (e.g. a PDF text layer, which
+    does not see drawn table borders) is a hint the pre-pass can only widen.
+
+    With calibrate > 0 the first pages of each class are also run with every
+    module enabled, giving a measured baseline for the time-saved report.
+    """
+
+    def __init__(self, pipeline, calibrate=0):
+        self.pipeline = pipeline
+        self.calibrate = calibrate
+        self.class_stats = {
+            page_class: {"pages": 0, "time": 0.0, "classify_time": 0.0,
+                          "sampled_pages": 0, "sampled_time": 0.0, "baseline_time": 0.0}
+            for page_class in PAGE_CLASSES
+        }
+
+    def classify(self, image):
+        """Page class for an image path or array, recording the pre-pass cost"""
+        start_time = time.time()
+        page_class = classify_image(image)
+        return page_class, time.time() - start_time
+
+    def predict(self, input, page_class=None, confirmed=False):
+        """
+        Run the pipeline with the modules gated for the page class
+
+        Args:
+            input: Image path or array (one page)
+            page_class: One of PAGE_CLASSES, or None to run the image pre-pass
+            confirmed: page_class already includes the image pre-pass (no
+                       second pre-pass runs)
+
+        Returns:
+            List of pipeline results, as PPStructureV3.predict
+        """
+        classify_time = 0.0
+        if page_class is None:
+            page_class, classify_time = self.classify(input)
+        elif page_class != "full" and not confirmed:
+            image_class, classify_time = self.classify(input)
+            page_class = widen_class(page_class, image_class)
+
+        stats = self.class_stats[page_class]
+        gates = MODULE_GATES[page_class]
+
+        start_time = time.time()
+        output = list(self.pipeline.predict(input=input, **gates))
+        elapsed = time.time() - start_time
+
+        stats["pages"] += 1
+        stats["time"] += elapsed
+        stats["classify_time"] += classify_time
+
+        if gates and stats["sampled_pages"] < self.calibrate:
+            start_time = time.time()
+            list(self.pipeline.predict(input=input))
+            stats["baseline_time"] += time.time() - start_time
+            stats["sampled_time"] += elapsed
+            stats["sampled_pages"] += 1
+
+        return output
+
+    def concatenate_markdown_pages(self, markdown_list):
+        return self.pipeline.concatenate_markdown_pages(markdown_list)
+
+    def report(self):
+        """
+        Per-class page counts, timings and estimated time saved
+
+        Time saved is extrapolated from the calibration samples of each class
+        (full-pipeline time minus gated time, per page) and is None for classes
+        without samples.
+
+        Returns:
+            Dictionary keyed by page class (classes with no pages are omitted)
+        """
+        report = {}
+        for page_class, stats in self.class_stats.items():
+            if not stats["pages"]:
+                continue
+
+            entry = {
+                "pages": stats["pages"],
+                "avg_time": stats["time"] / stats["pages"],
+                "classify_time": stats["classify_time"],
+                "time_saved": None
+            }
+            if stats["sampled_pages"]:
+                saved_per_page = (stats["baseline_time"] - stats["sampled_time"]) / stats["sampled_pages"]
+                entry["baseline_avg_time"] = stats["baseline_time"] / stats["sampled_pages"]
+                entry["time_saved"] = saved_per_page * stats["pages"] - stats["classify_time"]
+            report[page_class] = entry
+        return report
+
+    @staticmethod
+    def merge_reports(reports):
+        """Combine report() dictionaries from several pipelines (watch-mode workers)"""
+        merged = {}
+        for report in reports:
+            for page_class, entry in report.items():
+                total = merged.setdefault(page_class, {"pages": 0, "total_time": 0.0,
+                                                       "classify_time": 0.0, "time_saved": None})
+                total["pages"] += entry["pages"]
+                total["total_time"] += entry["avg_time"] * entry["pages"]
+                total["classify_time"] += entry["classify_time"]
+                if entry["time_saved"] is not None:
+                    total["time_saved"] = (total["time_saved"] or 0.0) + entry["time_saved"]
+        for entry in merged.values():
+            entry["avg_time"] = entry.pop("total_time") / entry["pages"]
+        return merged
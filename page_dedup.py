@@ -0,0 +1,149 @@
+"""
+Near-Duplicate Page Detection
+Perceptual-hash pre-pass that clusters visually identical or near-identical pages (cover sheets,
+boilerplate, re-scans) so a batch OCRs each cluster once and reuses the result for the rest
+"""
+
+import time
+
+import numpy as np
+
+
+# Hamming distance (of 64 bits) under which two pages count as the same page
+DEFAULT_THRESHOLD = 4
+
+HASH_SIZE = 8
+_SAMPLE_SIZE = 32
+
+
+def _dct_matrix(n):
+    """Orthonormal DCT-II matrix"""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+_DCT = _dct_matrix(_SAMPLE_SIZE)
+
+
+def perceptual_hash(image_path):
+    """
+    64-bit DCT perceptual hash of an image
+
+    Returns:
+        (hash as a uint64, (width, height) in pixels)
+    """
+    from PIL import Image
+
+    with Image.open(str(image_path)) as pil:
+        size = pil.size
+        # JPEG draft mode decodes directly at reduced size
+        pil.draft('L', (_SAMPLE_SIZE * 4, _SAMPLE_SIZE * 4))
+        gray = pil.convert('L').resize((_SAMPLE_SIZE, _SAMPLE_SIZE), Image.BILINEAR)
+
+    pixels = np.asarray(gray, dtype=np.float64)
+    low = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE].flatten()
+    # The DC term only carries overall brightness: compare against the median of the rest
+    bits = low > np.median(low[1:])
+    return np.packbits(bits).view('>u8')[0].astype(np.uint64), size
+
+
+def hamming_distances(value, hashes):
+    """Bit differences between one hash and an array of hashes"""
+    xor = np.bitwise_xor(np.asarray(hashes, dtype=np.uint64), np.uint64(value))
+    return np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+class DuplicateClusters:
+    """
+    Near-duplicate clusters of a page list
+
+    The first page of a cluster (in input order) is its representative; it
+    is the one that gets OCRed.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.representative = {}      # page -> representative page
+        self.members = {}             # representative -> [pages]
+        self.hash_seconds = 0.0
+        self.errors = 0
+
+    @classmethod
+    def build(cls, paths, threshold=DEFAULT_THRESHOLD):
+        """
+        Hash every page and cluster greedily against the representatives
+
+        Only pages of the same pixel size cluster together: a reused result
+        carries boxes in its representative's pixel space. Pages that cannot
+        be read stay in their own cluster.
+        """
+        clusters = cls(threshold)
+        rep_paths, rep_hashes, rep_sizes = [], [], []
+
+        start = time.perf_counter()
+        for path in paths:
+            path = str(path)
+            try:
+                value, size = perceptual_hash(path)
+            except (OSError, ValueError):
+                clusters.errors += 1
+                clusters._add(path, path)
+                continue
+
+            if rep_hashes:
+                distances = hamming_distances(value, rep_hashes)
+                distances[[rep_size != size for rep_size in rep_sizes]] = 65
+                best = int(np.argmin(distances))
+                if distances[best] <= threshold:
+                    clusters._add(path, rep_paths[best])
+                    continue
+
+            rep_paths.append(path)
+            rep_hashes.append(value)
+            rep_sizes.append(size)
+            clusters._add(path, path)
+
+        clusters.hash_seconds = time.perf_counter() - start
+        return clusters
+
+    def _add(self, path, representative):
+        self.representative[path] = representative
+        self.members.setdefault(representative, []).append(path)
+
+    def representative_of(self, path):
+        """Representative page, or None when the page is its own representative"""
+        representative = self.representative.get(str(path))
+        return None if representative in (None, str(path)) else representative
+
+    def needs_result(self, path):
+        """Whether a page's OCR result will be reused by other pages"""
+        return len(self.members.get(str(path), ())) > 1
+
+    @property
+    def duplicates(self):
+        return len(self.representative) - len(self.members)
+
+    def summary(self, time_saved=0.0, reused=None):
+        """
+        Cluster statistics
+
+        Args:
+            time_saved: OCR seconds the reused results saved
+            reused: Pages that actually reused a result (fewer than duplicates
+                    when a representative failed); defaults to duplicates
+        """
+        pages = len(self.representative)
+        return {
+            "threshold": self.threshold,
+            "pages": pages,
+            "clusters": len(self.members),
+            "duplicates": self.duplicates,
+            "reused": self.duplicates if reused is None else reused,
+            "dedupe_ratio": round(self.duplicates / pages, 4) if pages else 0.0,
+            "largest_cluster": max((len(m) for m in self.members.values()), default=0),
+            "hash_seconds": round(self.hash_seconds, 3),
+            "time_saved_seconds": round(time_saved, 2)
+        }
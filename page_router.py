@@ -0,0 +1,282 @@
+"""
+Page Router
+Send simple text pages to plain PP-OCRv5 with lightweight markdown and only complex
+pages (tables, figures) to PP-StructureV3
+"""
+
+import time
+
+from page_classifier import analyze_image_complexity, classify_from_complexity, widen_class
+
+
+# Page classes plain OCR handles well enough; everything else needs layout analysis
+OCR_PAGE_CLASSES = ("text",)
+
+# Horizontal rules a plain-OCR page may have (a header or footer separator)
+MAX_OCR_HORIZONTAL_RULES = 1
+
+# A line this much taller than the median line is rendered as a heading
+HEADING_HEIGHT_RATIO = 1.5
+
+# Vertical gap (in median line heights) that starts a new paragraph
+PARAGRAPH_GAP_RATIO = 0.8
+
+
+def _poly_bounds(poly):
+    """(x_min, y_min, x_max, y_max) of a polygon given as points"""
+    xs = [float(point[0]) for point in poly]
+    ys = [float(point[1]) for point in poly]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def ocr_lines_to_markdown(texts, polys):
+    """
+    Build simple markdown from OCR text lines
+
+    Regions on the same visual line are joined left to right, lines separated
+    by a large vertical gap start a new paragraph, and short lines that are much
+    taller than the median line become headings.
+
+    Args:
+        texts: Recognized texts (rec_texts)
+        polys: Matching polygons (rec_polys)
+
+    Returns:
+        Markdown string
+    """
+    regions = []
+    for text, poly in zip(texts, polys):
+        text = str(text).strip()
+        if text:
+            regions.append((_poly_bounds(poly), text))
+    if not regions:
+        return ""
+
+    # Group regions into visual lines by vertical overlap
+    regions.sort(key=lambda r: (r[0][1], r[0][0]))
+    lines = []
+    for bounds, text in regions:
+        x_min, y_min, x_max, y_max = bounds
+        if lines:
+            line = lines[-1]
+            overlap = min(line["y_max"], y_max) - max(line["y_min"], y_min)
+            if overlap > 0.5 * min(line["y_max"] - line["y_min"], y_max - y_min):
+                line["parts"].append((x_min, text))
+                line["y_min"] = min(line["y_min"], y_min)
+                line["y_max"] = max(line["y_max"], y_max)
+                continue
+        lines.append({"parts": [(x_min, text)], "y_min": y_min, "y_max": y_max})
+
+    heights = sorted(line["y_max"] - line["y_min"] for line in lines)
+    median_height = max(heights[len(heights) // 2], 1.0)
+
+    blocks = []
+    paragraph = []
+    previous_bottom = None
+    for line in lines:
+        text = " ".join(part for _, part in sorted(line["parts"]))
+        height = line["y_max"] - line["y_min"]
+
+        if previous_bottom is not None and \
+                line["y_min"] - previous_bottom > PARAGRAPH_GAP_RATIO * median_height and paragraph:
+            blocks.append(" ".join(paragraph))
+            paragraph = []
+        previous_bottom = line["y_max"]
+
+        if height > HEADING_HEIGHT_RATIO * median_height and len(text) < 80:
+            if paragraph:
+                blocks.append(" ".join(paragraph))
+                paragraph = []
+            blocks.append(f"## {text}")
+            continue
+
+        paragraph.append(text)
+
+    if paragraph:
+        blocks.append(" ".join(paragraph))
+
+    return "\n\n".join(blocks) + "\n"
+
+
+def is_plain_text(complexity):
+    """
+    Whether image pre-pass signals leave no doubt that a page is plain text
+
+    Any table, grid, column or image evidence keeps the page on
+    PP-StructureV3, where a missed table costs time rather than content.
+    """
+    return (not complexity.get("tables_likely")
+            and not complexity.get("uncertain")
+            and not complexity.get("images")
+            and complexity.get("horizontal_rules", 0) <= MAX_OCR_HORIZONTAL_RULES
+            and complexity.get("vertical_rules", 0) == 0
+            and complexity.get("multi_column_lines", 0) == 0)
+
+
+class OCRMarkdownResult:
+    """Minimal stand-in for a PP-StructureV3 page result (only .markdown)"""
+
+    def __init__(self, markdown_text):
+        # (paragraph starts at page top, paragraph ends at page bottom): no merging
+        self.markdown = {
+            "markdown_texts": markdown_text,
+            "markdown_images": {},
+            "page_continuation_flags": (True, True)
+        }
+
+
+class PageRouter:
+    """
+    Route each page to plain OCR or PP-StructureV3
+
+    Pages whose class is in ocr_classes, and whose image pre-pass shows no
+    rule, grid, column or image evidence (is_plain_text), go to a PaddleOCR
+    engine (created on first use) and get markdown from ocr_lines_to_markdown;
+    the rest go to the structure pipeline, which may itself be a
+    GatedPipeline. Timing per route is recorded for the routing report.
+    """
+
+    def __init__(self, structure_pipeline, ocr_engine=None, lang='en', ocr_classes=OCR_PAGE_CLASSES):
+        self.structure_pipeline = structure_pipeline
+        self.ocr_engine = ocr_engine
+        self.lang = lang
+        self.ocr_classes = set(ocr_classes)
+        self.route_stats = {
+            route: {"pages": 0, "time": 0.0} for route in ("ocr", "structure")
+        }
+        self.classify_time = 0.0
+        self.class_counts = {}
+        self.kept_on_structure = 0
+
+    def _ocr(self):
+        if self.ocr_engine is None:
+            from ocr_api import create_ocr_engine
+            self.ocr_engine = create_ocr_engine(lang=self.lang)
+        return self.ocr_engine
+
+    def route(self, page_class):
+        return "ocr" if page_class in self.ocr_classes else "structure"
+
+    def predict(self, input, page_class=None):
+        """
+        Run the engine chosen for the page
+
+        Args:
+            input: Image path or array (one page)
+            page_class: Page class if already known (e.g. from a PDF text layer),
+                        None to run the image pre-pass
+
+        Returns:
+            List of results with a .markdown dictionary
+        """
+        complexity = None
+        if page_class is None:
+            start_time = time.time()
+            complexity = analyze_image_complexity(input)
+            complexity["text_length"] = max(complexity["text_length"], 1)
+            page_class = classify_from_complexity(complexity)
+            self.classify_time += time.time() - start_time
+        self.class_counts[page_class] = self.class_counts.get(page_class, 0) + 1
+
+        route = self.route(page_class)
+        if route == "ocr":
+            # A text-layer class says nothing about drawn table borders: confirm on the image
+            if complexity is None:
+                start_time = time.time()
+                complexity = analyze_image_complexity(input)
+                complexity["text_length"] = max(complexity["text_length"], 1)
+                self.classify_time += time.time() - start_time
+                page_class = widen_class(page_class, classify_from_complexity(complexity))
+            if not is_plain_text(complexity):
+                route = "structure"
+                self.kept_on_structure += 1
+        start_time = time.time()
+
+        if route == "ocr":
+            result = self._ocr().predict(input)
+            if result and result[0]:
+                ocr_result = result[0]
+                markdown_text = ocr_lines_to_markdown(ocr_result.get('rec_texts', []),
+                                                      ocr_result.get('rec_polys', []))
+            else:
+                markdown_text = ""
+            output = [OCRMarkdownResult(markdown_text)]
+        elif hasattr(self.structure_pipeline, 'class_stats'):
+            # GatedPipeline: hand over the class so it is not classified twice
+            output = self.structure_pipeline.predict(input=input, page_class=page_class,
+                                                     confirmed=complexity is not None)
+        else:
+            output = list(self.structure_pipeline.predict(input=input))
+
+        stats = self.route_stats[route]
+        stats["pages"] += 1
+        stats["time"] += time.time() - start_time
+        return output
+
+    def concatenate_markdown_pages(self, markdown_list):
+        return self.structure_pipeline.concatenate_markdown_pages(markdown_list)
+
+    def report(self):
+        """
+        Routing mix and throughput
+
+        The all-structure estimate assumes routed-away pages would have taken
+        the average PP-StructureV3 page time; it is None until at least one page
+        went through PP-StructureV3.
+
+        Returns:
+            Dictionary with per-route pages/time/pages_per_second, page class
+            counts, text pages kept on PP-StructureV3 because of rule/grid
+            evidence, and estimated throughput gain
+        """
+        total_pages = sum(s["pages"] for s in self.route_stats.values())
+        total_time = sum(s["time"] for s in self.route_stats.values()) + self.classify_time
+
+        routes = {}
+        for route, stats in self.route_stats.items():
+            routes[route] = {
+                "pages": stats["pages"],
+                "share": stats["pages"] / total_pages if total_pages else 0.0,
+                "time": stats["time"],
+                "pages_per_second": stats["pages"] / stats["time"] if stats["time"] else None
+            }
+
+        report = {
+            "routes": routes,
+            "page_classes": dict(self.class_counts),
+            "kept_on_structure": self.kept_on_structure,
+            "classify_time": self.classify_time,
+            "pages_per_second": total_pages / total_time if total_time else None,
+            "estimated_structure_only_time": None,
+            "throughput_gain": None
+        }
+
+        structure = self.route_stats["structure"]
+        if structure["pages"] and total_time:
+            estimate = structure["time"] / structure["pages"] * total_pages
+            report["estimated_structure_only_time"] = estimate
+            report["throughput_gain"] = estimate / total_time
+        return report
+
+    @staticmethod
+    def merge_reports(reports):
+        """Combine report() dictionaries from several routers (watch-mode workers)"""
+        routes = {route: {"pages": 0, "time": 0.0} for route in ("ocr", "structure")}
+        page_classes = {}
+        classify_time = 0.0
+        kept_on_structure = 0
+        for report in reports:
+            for route, entry in report["routes"].items():
+                routes[route]["pages"] += entry["pages"]
+                routes[route]["time"] += entry["time"]
+            for page_class, count in report["page_classes"].items():
+                page_classes[page_class] = page_classes.get(page_class, 0) + count
+            classify_time += report["classify_time"]
+            kept_on_structure += report.get("kept_on_structure", 0)
+
+        merged = PageRouter(structure_pipeline=None)
+        merged.route_stats = routes
+        merged.class_counts = page_classes
+        merged.classify_time = classify_time
+        merged.kept_on_structure = kept_on_structure
+        return merged.report()
@@ -0,0 +1,206 @@
+"""
+Per-Page Timeout Watchdog
+Run engine inference in a supervised worker process so one pathological page (a huge table, a
+corrupted image) cannot hang a whole run: on a missed deadline the worker is killed and replaced
+"""
+
+import time
+import multiprocessing
+
+
+# Seconds a fresh worker may take to build its engine (model download/loading)
+DEFAULT_START_TIMEOUT = 600
+
+# Result keys kept when a full result object cannot be sent back from the worker
+RESULT_KEYS = ("rec_texts", "rec_scores", "rec_polys", "rec_boxes")
+
+
+class PageTimeout(Exception):
+    """A page missed its deadline; the worker that ran it has been replaced"""
+
+    def __init__(self, input_path, elapsed):
+        super().__init__(f"Timed out after {elapsed:.1f}s: {input_path}")
+        self.input_path = input_path
+        self.elapsed = elapsed
+
+
+def _build_engine(pipeline, engine_kwargs):
+    from ocr_api import create_ocr_engine, create_structure_pipeline
+
+    if pipeline == "structure":
+        return create_structure_pipeline(**engine_kwargs)
+    return create_ocr_engine(**engine_kwargs)
+
+
+def _send_result(conn, results):
+    """Send predict results; fall back to plain dicts when an object does not pickle"""
+    try:
+        conn.send(("ok", results))
+    except Exception:
+        plain = [{key: res[key] for key in RESULT_KEYS if key in res} for res in results]
+        conn.send(("ok", plain))
+
+
+def _worker_main(conn, pipeline, engine_kwargs):
+    """Worker process: build the engine once, then serve predict requests until None"""
+    try:
+        start = time.perf_counter()
+        engine = _build_engine(pipeline, engine_kwargs)
+        conn.send(("ready", time.perf_counter() - start))
+    except Exception as e:
+        conn.send(("error", f"Engine failed to start: {e}"))
+        return
+
+    while True:
+        try:
+            input_path = conn.recv()
+        except EOFError:
+            return
+        if input_path is None:
+            return
+        try:
+            results = list(engine.predict(input_path))
+        except Exception as e:
+            conn.send(("error", str(e)))
+            continue
+        _send_result(conn, results)
+
+
+class SupervisedEngine:
+    """
+    Engine proxy whose predict() runs in a worker process under a deadline
+
+    Usable wherever a PaddleOCR / PPStructureV3 instance is expected:
+    predict() returns the list of results, raises PageTimeout when the page
+    takes longer than timeout seconds and RuntimeError when inference fails.
+    The engine is built once per worker, so only a timeout or a crash costs
+    a reload.
+    """
+
+    def __init__(self, pipeline="ocr", timeout=120, start_timeout=DEFAULT_START_TIMEOUT,
+                 **engine_kwargs):
+        """
+        Args:
+            pipeline: "ocr" (create_ocr_engine) or "structure" (create_structure_pipeline)
+            timeout: Seconds allowed per page
+            start_timeout: Seconds allowed for a worker to build its engine
+            **engine_kwargs: Passed to the engine factory in the worker
+        """
+        self.pipeline = pipeline
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.engine_kwargs = engine_kwargs
+        # spawn: forking a process that already runs inference threads is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._ready = False
+        self.pages = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.workers_started = 0
+        self.init_seconds = 0.0
+
+    def start(self):
+        """Launch a worker (its engine loads in the background)"""
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main, args=(child_conn, self.pipeline, self.engine_kwargs), daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._ready = False
+        self.workers_started += 1
+
+    def wait_ready(self):
+        """
+        Block until the worker's engine is built
+
+        Returns:
+            Seconds the engine took to initialize
+        """
+        if self._process is None:
+            self.start()
+        if self._ready:
+            return 0.0
+
+        if not self._conn.poll(self.start_timeout):
+            self._kill()
+            raise RuntimeError(f"Engine did not start within {self.start_timeout}s")
+        try:
+            status, value = self._conn.recv()
+        except EOFError:
+            self._kill()
+            raise RuntimeError("Engine worker exited during startup")
+        if status != "ready":
+            self._kill()
+            raise RuntimeError(value)
+
+        self._ready = True
+        self.init_seconds += value
+        return value
+
+    def _kill(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+            self._conn.close()
+        self._process = None
+        self._conn = None
+        self._ready = False
+
+    def predict(self, input_path):
+        self.wait_ready()
+        self.pages += 1
+
+        # Image arrays (page crops) are pickled to the worker as they are
+        is_array = hasattr(input_path, "shape")
+        label = f"<{'x'.join(map(str, input_path.shape))} array>" if is_array else str(input_path)
+        start = time.perf_counter()
+        self._conn.send(input_path if is_array else label)
+        if not self._conn.poll(self.timeout):
+            elapsed = time.perf_counter() - start
+            self.timeouts += 1
+            print(f"  ⚠ Page exceeded {self.timeout:.0f}s; restarting worker")
+            self._kill()
+            self.start()
+            raise PageTimeout(label, elapsed)
+
+        try:
+            status, value = self._conn.recv()
+        except EOFError:
+            self.crashes += 1
+            self._kill()
+            self.start()
+            raise RuntimeError("Engine worker crashed; restarted")
+
+        if status == "error":
+            raise RuntimeError(value)
+        return value
+
+    def close(self):
+        """Stop the worker"""
+        if self._process is not None and self._process.is_alive():
+            try:
+                self._conn.send(None)
+                self._process.join(timeout=5)
+            except (OSError, EOFError):
+                pass
+        self._kill()
+
+    def stats(self):
+        """Pages, timeouts, crashes and worker restarts"""
+        return {
+            "page_timeout_seconds": self.timeout,
+            "pages": self.pages,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "worker_restarts": max(self.workers_started - 1, 0)
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -5,12 +5,21 @@ Quick PaddleOCR Test - Minimal version for troubleshooting
 print("Testing PaddleOCR installation...")
 
 try:
+    from engine_config import prepare_offline_mode
+    prepare_offline_mode()
+    
     from paddleocr import PaddleOCR
+    from ocr_api import create_ocr_engine
     print("✓ PaddleOCR imported successfully")
     
-    # Initialize with minimal config
+    from host_tuning import profile_kwargs
+    
+    # Initialize with minimal config (pinned local models from ocr_models.json if present);
+    # MKL-DNN stays off unless the host profile found it faster
     print("\nInitializing PaddleOCR (this may take a minute)...")
-    ocr = PaddleOCR(lang='en', device='cpu', enable_mkldnn=False)
+    safe_defaults = {} if profile_kwargs("ocr") else {"enable_mkldnn": False}
+    ocr = create_ocr_engine(lang='en', use_textline_orientation=None,
+                            device='cpu', **safe_defaults)
     print("✓ PaddleOCR initialized successfully")
     
     # Test with a sample image if available
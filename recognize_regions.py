@@ -0,0 +1,125 @@
+"""
+Recognition-Only OCR for Known Layouts
+Read text from caller-supplied boxes (form fields, invoice slots) without running text
+detection; only recognition (and optionally line orientation) runs, batched per image
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'replace')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
+    except Exception:
+        pass
+
+
+def load_boxes(path):
+    """
+    Read regions from a JSON file
+
+    Accepted layouts:
+        [[x0, y0, x1, y1], [[x, y], [x, y], [x, y], [x, y]], ...]
+        {"field name": [x0, y0, x1, y1], ...}
+
+    Returns:
+        (names, boxes) where names is None for a plain list
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        return list(data.keys()), list(data.values())
+    if isinstance(data, list):
+        return None, data
+    raise ValueError(f"{path}: expected a list of boxes or an object of named boxes")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Recognize text in known regions of images (no text detection)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Named form fields, boxes as [x0, y0, x1, y1] in image pixels
+  #   fields.json: {"name": [120, 210, 640, 250], "email": [120, 280, 640, 320]}
+  python recognize_regions.py test_documents/forms/registration_form.jpg --boxes fields.json
+
+  # Same layout over many pages, upside-down scans fixed first
+  python recognize_regions.py scans/*.jpg --boxes invoice_slots.json --orientation -o test_results/fields
+
+Output per image: <name>.json / <name>.txt in the test_basic_ocr schema, plus
+<name>_fields.json (field -> text, confidence) when the boxes are named.
+        """
+    )
+
+    parser.add_argument('images', nargs='+', help='Images sharing the same layout')
+    parser.add_argument('--boxes', '-b', required=True,
+                        help='JSON file with the regions (list, or object of named regions)')
+    parser.add_argument('--lang', default='en', help='Recognition language (default: en)')
+    parser.add_argument('--orientation', action='store_true',
+                        help='Classify line orientation and turn upside-down crops upright')
+    parser.add_argument('--output', '-o', default='test_results',
+                        help='Output directory (default: test_results)')
+
+    args = parser.parse_args()
+
+    try:
+        names, boxes = load_boxes(args.boxes)
+    except (OSError, ValueError) as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    from multilingual_ocr import MultilingualOCR
+    from ocr_api import run_recognition, save_ocr_outputs
+
+    print(f"Regions: {len(boxes)} from {args.boxes} (recognition only, lang={args.lang})")
+    recognizer = MultilingualOCR(use_textline_orientation=args.orientation)
+
+    failed = 0
+    for image_path in args.images:
+        print(f"\n{image_path}")
+        print("-" * 60)
+        try:
+            page_result = run_recognition(image_path, boxes, lang=args.lang,
+                                          use_textline_orientation=args.orientation,
+                                          recognizer=recognizer)
+        except ValueError as e:
+            print(f"✗ {e}")
+            failed += 1
+            continue
+
+        if page_result.error:
+            print(f"✗ {page_result.error}")
+            failed += 1
+            continue
+
+        labels = names or [str(idx) for idx in range(1, len(boxes) + 1)]
+        for label, text, score in zip(labels, page_result.texts, page_result.scores):
+            print(f"  {label:20s} {text}  ({score:.4f})")
+
+        output_files = save_ocr_outputs(page_result, args.output, visualization=False)
+        if names:
+            fields_file = os.path.join(
+                args.output, f"{os.path.splitext(os.path.basename(image_path))[0]}_fields.json")
+            fields = {name: {"text": text, "confidence": float(score)}
+                      for name, text, score in zip(names, page_result.texts, page_result.scores)}
+            with open(fields_file, 'w', encoding='utf-8') as f:
+                json.dump(fields, f, indent=2, ensure_ascii=False)
+            output_files["fields"] = fields_file
+
+        print(f"✓ {page_result.text_regions} regions in {page_result.elapsed * 1000:.0f} ms → "
+              f"{', '.join(output_files.values())}")
+
+    if failed:
+        print(f"\n✗ {failed}/{len(args.images)} images failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+OCR Result Stream
+Append one compact JSON record per page to a single (optionally gzip-compressed) JSONL file,
+and derive the classic per-page JSON/TXT files from it on demand
+"""
+
+import os
+import sys
+import gzip
+import json
+import argparse
+from datetime import datetime
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'replace')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
+    except Exception:
+        pass
+
+
+STREAM_FILENAME = "page_results.jsonl"
+
+
+def get_stream_path(output_dir, compress=False):
+    """
+    Get the path of the result stream inside an output directory
+
+    Args:
+        output_dir: Directory holding the results
+        compress: Whether the stream is gzip-compressed
+
+    Returns:
+        Path to the JSONL (or JSONL.GZ) stream file
+    """
+    filename = STREAM_FILENAME + (".gz" if compress else "")
+    return os.path.join(output_dir, filename)
+
+
+def open_stream(path, mode='rt'):
+    """Open a JSONL stream, transparently handling .gz files"""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def build_page_record(image_path, result_data):
+    """
+    Build the per-page record shared by the JSON files and the JSONL stream
+
+    Args:
+        image_path: Path to source image
+        result_data: Dictionary with OCR results and metrics
+
+    Returns:
+        Dictionary in the per-page JSON schema
+    """
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "source_image": str(image_path),
+        "image_name": os.path.basename(image_path),
+        "ocr_metrics": result_data["metrics"],
+        "performance_metrics": result_data["performance"]
+    }
+
+
+def write_page_json(record, json_file):
+    """Write a page record as a pretty-printed JSON file"""
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(record, f, indent=2, ensure_ascii=False)
+
+
+def write_page_text(record, txt_file, texts=None, confidences=None):
+    """
+    Write the extracted text of a page record as a TXT file
+
+    Args:
+        record: Page record from build_page_record
+        txt_file: Path of the TXT file to write
+        texts: Texts to write when they are not inline in the record (columnar results)
+        confidences: Scores matching texts
+    """
+    metrics = record["ocr_metrics"]
+    if texts is None:
+        texts = metrics.get("extracted_texts", [])
+        confidences = metrics.get("confidence_list", [])
+
+    with open(txt_file, 'w', encoding='utf-8') as f:
+        f.write(f"OCR Results for: {record['image_name']}\n")
+        f.write(f"Timestamp: {record['timestamp']}\n")
+        f.write("="*70 + "\n\n")
+
+        f.write("EXTRACTED TEXT:\n")
+        f.write("-"*70 + "\n")
+        for text in texts:
+            f.write(f"{text}\n")
+
+        f.write("\n" + "="*70 + "\n")
+        f.write("DETAILED RESULTS WITH CONFIDENCE:\n")
+        f.write("="*70 + "\n\n")
+
+        for idx, (text, conf) in enumerate(zip(texts, confidences), 1):
+            f.write(f"{idx:3d}. [{conf:.4f}] {text}\n")
+
+
+class ResultStreamWriter:
+    """Write compact page records to a JSONL stream"""
+
+    def __init__(self, path, append=False):
+        """
+        Args:
+            path: Stream path (.jsonl or .jsonl.gz)
+            append: Continue an existing stream (incremental/resumed runs)
+                    instead of starting a new one
+        """
+        self.path = path
+        self.records_written = 0
+
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        # Append mode: gzip members concatenate into a valid multi-member file,
+        # so incremental runs keep a single readable stream
+        self._file = open_stream(path, 'at' if append else 'wt')
+
+    def write(self, record):
+        """Append one record as a single compact JSON line"""
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        self._file.write("\n")
+        self.records_written += 1
+
+    def close(self):
+        """Flush and close the stream"""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def iter_result_stream(path):
+    """
+    Iterate over the records of a JSONL stream
+
+    Args:
+        path: Path to the JSONL (or JSONL.GZ) stream
+
+    Yields:
+        One page record dictionary per line
+    """
+    with open_stream(path, 'rt') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def derive_page_files(stream_path, output_dir, pages=None, formats=('json', 'txt')):
+    """
+    Recreate per-page JSON/TXT files from a result stream
+
+    Args:
+        stream_path: Path to the JSONL stream
+        output_dir: Directory to write the derived files
+        pages: Optional collection of image names (or stems) to derive; all pages if None
+        formats: Which file types to write ('json', 'txt')
+
+    Returns:
+        List of written file paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    wanted = None
+    if pages:
+        wanted = set(pages) | {os.path.splitext(p)[0] for p in pages}
+
+    written = []
+    for record in iter_result_stream(stream_path):
+        image_name = record["image_name"]
+        name_without_ext = os.path.splitext(image_name)[0]
+
+        if wanted is not None and image_name not in wanted and name_without_ext not in wanted:
+            continue
+
+        # Columnar results keep their payload in a side file; inline it again
+        columns_file = record.get("columns_file")
+        if columns_file and os.path.exists(columns_file):
+            from columnar_results import ColumnarPage
+            record["ocr_metrics"].update(ColumnarPage.load(columns_file).to_json_fields())
+
+        if 'json' in formats:
+            json_file = os.path.join(output_dir, f"{name_without_ext}.json")
+            write_page_json(record, json_file)
+            written.append(json_file)
+
+        if 'txt' in formats and record["ocr_metrics"].get("success"):
+            txt_file = os.path.join(output_dir, f"{name_without_ext}.txt")
+            write_page_text(record, txt_file)
+            written.append(txt_file)
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Derive per-page JSON/TXT files from a JSONL result stream',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Derive all pages
+  python result_stream.py test_results/nanonets_comparison/page_results.jsonl.gz -o derived
+
+  # Derive selected pages as text only
+  python result_stream.py page_results.jsonl --pages "page_003,page_052" --format txt
+        """
+    )
+
+    parser.add_argument('stream', help='Path to page_results.jsonl[.gz]')
+    parser.add_argument('--output', '-o', default='test_results/derived',
+                        help='Output directory for derived files (default: test_results/derived)')
+    parser.add_argument('--pages', '-p',
+                        help='Comma-separated image names or stems to derive (default: all)')
+    parser.add_argument('--format', choices=['json', 'txt', 'both'], default='both',
+                        help='Which per-page files to write (default: both)')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.stream):
+        print(f"Error: Stream file not found: {args.stream}")
+        sys.exit(1)
+
+    pages = [p.strip() for p in args.pages.split(',')] if args.pages else None
+    formats = ('json', 'txt') if args.format == 'both' else (args.format,)
+
+    written = derive_page_files(args.stream, args.output, pages=pages, formats=formats)
+    print(f"✓ Derived {len(written)} files into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
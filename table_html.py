@@ -0,0 +1,415 @@
+"""
+Table HTML Converter
+Turn the table HTML produced by PP-StructureV3 into CSV or Arrow with the standard-library
+HTML tokenizer, expanding rowspan/colspan, without pandas or BeautifulSoup
+"""
+
+import os
+import io
+import csv
+import sys
+import time
+import argparse
+from collections import deque
+from html.parser import HTMLParser
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'replace')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
+    except Exception:
+        pass
+
+
+# Cap on spans so malformed HTML cannot allocate huge grids
+MAX_SPAN = 1000
+
+
+def _span(value):
+    try:
+        return min(max(int(value), 1), MAX_SPAN)
+    except (TypeError, ValueError):
+        return 1
+
+
+class TableRowParser(HTMLParser):
+    """
+    Incremental table tokenizer
+
+    Completed rows are queued in .rows as (table_index, cells) as soon as
+    their </tr> (or the next <tr>) is seen; cells covered by a rowspan or
+    colspan repeat the spanning cell's text, as pandas.read_html does. Text
+    inside nested tables is folded into the enclosing cell.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = deque()
+        self.table_index = -1
+        self.depth = 0
+        self.row = None
+        self.cell = None
+        self.cell_spans = (1, 1)
+        self.pending = {}   # column -> (rows remaining, text) carried by rowspan
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self.depth += 1
+            if self.depth == 1:
+                self.table_index += 1
+                self.pending = {}
+            elif self.cell is not None:
+                self.cell.append(' ')
+            return
+        if self.depth != 1:
+            if tag == 'br' and self.cell is not None:
+                self.cell.append(' ')
+            return
+
+        if tag == 'tr':
+            self._end_row()
+            self.row = []
+        elif tag in ('td', 'th'):
+            self._end_cell()
+            if self.row is None:
+                self.row = []
+            attrs = dict(attrs)
+            self.cell = []
+            self.cell_spans = (_span(attrs.get('rowspan')), _span(attrs.get('colspan')))
+        elif tag == 'br' and self.cell is not None:
+            self.cell.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag == 'table':
+            if self.depth == 1:
+                self._end_row()
+                # Rowspans reaching past the last row still produce rows
+                while self.pending:
+                    self.row = []
+                    self._end_row()
+            self.depth = max(0, self.depth - 1)
+        elif self.depth != 1:
+            return
+        elif tag in ('td', 'th'):
+            self._end_cell()
+        elif tag == 'tr':
+            self._end_row()
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+    def _end_cell(self):
+        if self.cell is None:
+            return
+        text = " ".join("".join(self.cell).split())
+        self.row.append((text, *self.cell_spans))
+        self.cell = None
+
+    def _end_row(self):
+        self._end_cell()
+        if self.row is None:
+            return
+
+        cells = []
+        column = 0
+        queue = deque(self.row)
+        while queue or any(col >= column for col in self.pending):
+            carried = self.pending.get(column)
+            if carried is not None:
+                remaining, text = carried
+                cells.append(text)
+                if remaining > 1:
+                    self.pending[column] = (remaining - 1, text)
+                else:
+                    del self.pending[column]
+                column += 1
+                continue
+            if not queue:
+                # Gap before a carried cell further right
+                cells.append("")
+                column += 1
+                continue
+
+            text, rowspan, colspan = queue.popleft()
+            for _ in range(colspan):
+                cells.append(text)
+                if rowspan > 1:
+                    self.pending[column] = (rowspan - 1, text)
+                column += 1
+
+        self.row = None
+        self.rows.append((self.table_index, cells))
+
+
+def iter_table_rows(source, chunk_size=1 << 16):
+    """
+    Stream rows out of table HTML
+
+    Args:
+        source: HTML string, or a file object opened in text mode
+        chunk_size: Characters fed to the tokenizer at a time
+
+    Yields:
+        (table_index, cells) with 0-based table indices; cells is a list of str
+    """
+    stream = io.StringIO(source) if isinstance(source, str) else source
+    parser = TableRowParser()
+
+    for chunk in iter(lambda: stream.read(chunk_size), ''):
+        parser.feed(chunk)
+        while parser.rows:
+            yield parser.rows.popleft()
+
+    parser.close()
+    if parser.depth == 1:
+        # Truncated HTML: flush the open table
+        parser.handle_endtag('table')
+    while parser.rows:
+        yield parser.rows.popleft()
+
+
+def parse_tables(source):
+    """
+    Parse every table in the HTML into a list of rows
+
+    Returns:
+        List of tables, each a list of rows padded to the same width
+    """
+    tables = []
+    for table_index, cells in iter_table_rows(source):
+        while len(tables) <= table_index:
+            tables.append([])
+        tables[table_index].append(cells)
+
+    for rows in tables:
+        width = max((len(r) for r in rows), default=0)
+        for r in rows:
+            r.extend([""] * (width - len(r)))
+    return tables
+
+
+def write_csv(rows, csv_file):
+    """
+    Write rows to a CSV file (ragged rows are padded)
+
+    Returns:
+        (row count, column count)
+    """
+    rows = list(rows)
+    width = max((len(r) for r in rows), default=0)
+    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for r in rows:
+            writer.writerow(r + [""] * (width - len(r)))
+    return len(rows), width
+
+
+def _column_names(header, width):
+    """Unique, non-empty column names from a header row"""
+    names = []
+    seen = {}
+    for idx in range(width):
+        name = header[idx] if idx < len(header) and header[idx] else f"column_{idx + 1}"
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(name if count == 0 else f"{name}_{count}")
+    return names
+
+
+def write_arrow(rows, arrow_file, header=True):
+    """
+    Write rows to an Arrow IPC file with string columns (requires pyarrow)
+
+    Args:
+        rows: List of rows (lists of str)
+        arrow_file: Output .arrow path
+        header: Use the first row as column names
+
+    Returns:
+        (row count, column count), not counting the header row
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("Arrow output needs pyarrow: pip install pyarrow")
+
+    rows = list(rows)
+    width = max((len(r) for r in rows), default=0)
+    names = _column_names(rows[0] if header and rows else [], width)
+    body = rows[1:] if header else rows
+
+    columns = [pa.array([r[idx] if idx < len(r) else "" for r in body], type=pa.string())
+               for idx in range(width)]
+    table = pa.Table.from_arrays(columns, names=names)
+
+    with pa.OSFile(str(arrow_file), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return len(body), width
+
+
+def convert_table_html(html, output_base, fmt="csv"):
+    """
+    Convert every table in an HTML string to <output_base>[_N].csv/.arrow
+
+    Args:
+        html: Table HTML (e.g. element['res']['html'] or table_res_list html)
+        output_base: Output path without extension
+        fmt: "csv" or "arrow"
+
+    Returns:
+        List of (output_file, rows, columns)
+    """
+    tables = parse_tables(html)
+    written = []
+    for idx, rows in enumerate(tables):
+        suffix = "" if len(tables) == 1 else f"_{idx + 1}"
+        output_file = f"{output_base}{suffix}.{fmt}"
+        if fmt == "arrow":
+            n_rows, n_cols = write_arrow(rows, output_file)
+        else:
+            n_rows, n_cols = write_csv(rows, output_file)
+        written.append((output_file, n_rows, n_cols))
+    return written
+
+
+def _legacy_table_rows(html):
+    """The BeautifulSoup + pandas path from test_document_parsing (for benchmarking)"""
+    from bs4 import BeautifulSoup
+    import pandas as pd
+
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table')
+    rows = []
+    for tr in table.find_all('tr'):
+        rows.append([td.get_text(strip=True) for td in tr.find_all(['td', 'th'])])
+    return pd.DataFrame(rows[1:], columns=rows[0] if rows else None)
+
+
+def _collect_html_inputs(paths):
+    """Table HTML strings from .html files and markdown files with inline <table>s"""
+    from input_discovery import iter_files
+
+    inputs = []
+    for root in paths:
+        for path in iter_files(root, extensions={'.html', '.htm', '.md'}, recursive=True):
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            if '<table' in text.lower():
+                inputs.append((path, text))
+    return inputs
+
+
+def benchmark(paths, repeat=20, output_dir=None):
+    """
+    Time the stdlib converter against BeautifulSoup + pandas on the same tables
+
+    Args:
+        paths: Files or directories with table HTML (.html, or .md with inline tables)
+        repeat: Conversions per file
+        output_dir: Optional directory for the CSV files of one stdlib pass
+
+    Returns:
+        Dictionary with timings in milliseconds
+    """
+    inputs = _collect_html_inputs(paths)
+    if not inputs:
+        print("No table HTML found. Run test_document_parsing.py <image> --table or")
+        print("convert_pages_to_markdown.py on test_documents/tables first.")
+        return {}
+
+    results = {"files": len(inputs), "repeat": repeat}
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path, html in inputs:
+            for _, _ in iter_table_rows(html):
+                pass
+    results["stdlib_ms_per_file"] = (time.perf_counter() - start) * 1000 / (repeat * len(inputs))
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        for path, html in inputs:
+            base = os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0])
+            convert_table_html(html, base)
+
+    start = time.perf_counter()
+    try:
+        import bs4  # noqa: F401
+        import pandas  # noqa: F401
+        results["legacy_import_ms"] = (time.perf_counter() - start) * 1000
+    except ImportError as e:
+        print(f"⚠ Skipping BeautifulSoup + pandas comparison: {e}")
+        return results
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path, html in inputs:
+            _legacy_table_rows(html)
+    results["legacy_ms_per_file"] = (time.perf_counter() - start) * 1000 / (repeat * len(inputs))
+    results["speedup"] = results["legacy_ms_per_file"] / max(results["stdlib_ms_per_file"], 1e-9)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert PP-StructureV3 table HTML to CSV/Arrow without pandas or BeautifulSoup',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # HTML table -> CSV (one file per table)
+  python table_html.py to-csv test_results/table_recognition/table_1.html
+
+  # HTML table -> Arrow IPC (first row becomes the column names)
+  python table_html.py to-arrow test_results/table_recognition/table_1.html -o table_1.arrow
+
+  # Compare with BeautifulSoup + pandas on saved tables
+  python table_html.py bench test_results/table_recognition output/markdown_pages
+        """
+    )
+
+    parser.add_argument('command', choices=['to-csv', 'to-arrow', 'bench'],
+                        help='Conversion or benchmark')
+    parser.add_argument('inputs', nargs='+',
+                        help='HTML file(s); for bench also directories and markdown files')
+    parser.add_argument('--output', '-o',
+                        help='Output path (default: next to the input); for bench a CSV directory')
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='Conversions per file in bench mode (default: 20)')
+
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        results = benchmark(args.inputs, repeat=args.repeat, output_dir=args.output)
+        if not results:
+            sys.exit(1)
+        print(f"Files:                    {results['files']}")
+        print(f"stdlib parser:            {results['stdlib_ms_per_file']:.3f} ms/file")
+        if 'legacy_ms_per_file' in results:
+            print(f"BeautifulSoup + pandas:   {results['legacy_ms_per_file']:.3f} ms/file "
+                  f"(+{results['legacy_import_ms']:.0f} ms imports)")
+            print(f"Speedup:                  {results['speedup']:.1f}x")
+        return
+
+    fmt = 'arrow' if args.command == 'to-arrow' else 'csv'
+    for input_file in args.inputs:
+        if not os.path.exists(input_file):
+            print(f"✗ Input file not found: {input_file}")
+            continue
+
+        base = os.path.splitext(args.output or input_file)[0]
+        with open(input_file, 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        written = convert_table_html(html, base, fmt=fmt)
+        if not written:
+            print(f"⚠ No table found in {input_file}")
+        for output_file, n_rows, n_cols in written:
+            print(f"✓ {output_file} ({n_rows} rows, {n_cols} columns)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,529 @@
+"""
+Form and Invoice Template Registry
+Register fixed layouts (anchor patches + field boxes), match incoming pages with a cheap
+image-alignment check, and read matched pages with recognition only on the aligned field boxes;
+unmatched pages fall back to full OCR
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'replace')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
+    except Exception:
+        pass
+
+
+DEFAULT_REGISTRY_DIR = "templates"
+
+# Width pages and templates are compared at
+ALIGN_WIDTH = 400
+
+# Anchors picked automatically when a template is registered without any
+AUTO_ANCHORS = 4
+ANCHOR_CELL = 48            # anchor patch size at ALIGN_WIDTH
+
+# Match criteria
+SEARCH_MARGIN = 24          # pixels at ALIGN_WIDTH an anchor may have moved
+MIN_ANCHOR_SCORE = 0.8      # normalized cross-correlation per anchor
+MAX_ANCHOR_SPREAD = 4.0     # pixels at ALIGN_WIDTH anchors may disagree on the shift
+MAX_ASPECT_DIFF = 0.03
+
+# Gaussian blur (pixels at ALIGN_WIDTH) applied before matching: strokes sharpened by the
+# downscale otherwise decorrelate under half-pixel shifts
+BLUR_RADIUS = 1.0
+
+# Field boxes for the sample documents made by create_sample_documents.py (800x1000 pixels)
+SAMPLE_TEMPLATES = {
+    "registration_form": {
+        "image": "test_documents/forms/registration_form.jpg",
+        "fields": {
+            name: [205, 96 + 60 * row, 750, 122 + 60 * row]
+            for row, name in enumerate([
+                "first_name", "last_name", "email", "phone", "address", "city",
+                "state", "zip_code", "country", "company", "job_title", "department"
+            ])
+        }
+    },
+    "sample_invoice": {
+        "image": "test_documents/invoices/sample_invoice.jpg",
+        "fields": {
+            "invoice_number": [45, 96, 420, 124],
+            "date": [45, 131, 420, 159],
+            "due_date": [45, 166, 420, 194],
+            "bill_to": [45, 271, 420, 299],
+            "from": [45, 446, 420, 474],
+            "subtotal": [675, 821, 795, 851],
+            "tax": [675, 861, 795, 891],
+            "total_due": [675, 901, 795, 931]
+        }
+    }
+}
+
+
+def load_gray(image, width=ALIGN_WIDTH):
+    """Load a path as a blurred grayscale float array scaled to width; returns (array, scale)"""
+    from PIL import Image, ImageFilter
+
+    with Image.open(str(image)) as pil:
+        original_width = pil.width
+        # JPEG draft mode decodes directly at reduced size
+        pil.draft('L', (width, width))
+        gray = pil.convert('L')
+    gray = gray.resize((width, max(1, round(gray.height * width / gray.width))))
+    gray = gray.filter(ImageFilter.GaussianBlur(BLUR_RADIUS))
+    return np.asarray(gray, dtype=np.float32), width / original_width
+
+
+def _overlaps(box, boxes):
+    x0, y0, x1, y1 = box
+    return any(x0 < bx1 and bx0 < x1 and y0 < by1 and by0 < y1 for bx0, by0, bx1, by1 in boxes)
+
+
+def pick_anchors(gray, scale, fields, count=AUTO_ANCHORS, cell=ANCHOR_CELL):
+    """
+    Choose distinctive static patches as anchors
+
+    Cells overlapping a field box are skipped (their content changes per
+    page), and so are cells near the border, which a shifted scan can push
+    out of view. Texture is the weaker of the horizontal and vertical
+    gradient energy, so a lone rule line (which matches anywhere along its
+    length) does not qualify. The most textured cell of each image quadrant
+    is taken, then the next most textured overall.
+
+    Returns:
+        Anchor boxes [x0, y0, x1, y1] in template pixels
+    """
+    height, width = gray.shape
+    field_boxes = [[v * scale for v in box] for box in fields.values()]
+
+    cells = []
+    margin = SEARCH_MARGIN // 2
+    for y in range(margin, height - cell - margin + 1, cell // 4):
+        for x in range(margin, width - cell - margin + 1, cell // 4):
+            box = [x, y, x + cell, y + cell]
+            if _overlaps(box, field_boxes):
+                continue
+            patch = gray[y:y + cell, x:x + cell]
+            texture = min(float(np.abs(np.diff(patch, axis=0)).mean()),
+                          float(np.abs(np.diff(patch, axis=1)).mean()))
+            if texture > 2:
+                cells.append((texture, box))
+    cells.sort(key=lambda c: c[0], reverse=True)
+
+    chosen = []
+    for quadrant in range(4):
+        qx, qy = quadrant % 2, quadrant // 2
+        for texture, box in cells:
+            if (box[0] >= width / 2) == bool(qx) and (box[1] >= height / 2) == bool(qy) \
+                    and not _overlaps(box, chosen):
+                chosen.append(box)
+                break
+    for texture, box in cells:
+        if len(chosen) >= count:
+            break
+        if not _overlaps(box, chosen):
+            chosen.append(box)
+
+    return [[round(v / scale) for v in box] for box in chosen[:count]]
+
+
+def _box_sums(integral, height, width):
+    """Sums of every height x width window from a zero-padded integral image"""
+    return (integral[height:, width:] - integral[:-height, width:]
+            - integral[height:, :-width] + integral[:-height, :-width])
+
+
+def _best_match(window, patch):
+    """
+    Normalized cross-correlation of patch over window; returns (score, dy, dx)
+
+    The correlation runs through the FFT and the window statistics through
+    integral images, so a search costs about as much as a few FFTs.
+    """
+    window = window.astype(np.float64)
+    patch_h, patch_w = patch.shape
+    window_h, window_w = window.shape
+
+    patch_centered = patch - patch.mean()
+    patch_norm = np.sqrt((patch_centered ** 2).sum())
+
+    shape = (window_h + patch_h - 1, window_w + patch_w - 1)
+    spectrum = np.fft.rfft2(window, shape) * np.fft.rfft2(patch_centered[::-1, ::-1], shape)
+    numerator = np.fft.irfft2(spectrum, shape)[patch_h - 1:window_h, patch_w - 1:window_w]
+
+    integral = np.pad(window.cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+    integral_sq = np.pad((window ** 2).cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+    sums = _box_sums(integral, patch_h, patch_w)
+    variance = np.maximum(_box_sums(integral_sq, patch_h, patch_w) - sums ** 2 / patch.size, 0.0)
+    denominator = np.sqrt(variance) * patch_norm
+
+    scores = np.where(denominator > 1e-6, numerator / np.maximum(denominator, 1e-6), 0.0)
+    dy, dx = np.unravel_index(int(np.argmax(scores)), scores.shape)
+    return float(scores[dy, dx]), int(dy), int(dx)
+
+
+class Template:
+    """One registered layout: reference anchors and field boxes in template pixels"""
+
+    def __init__(self, name, size, anchors, fields, reference, lang='en'):
+        self.name = name
+        self.size = size
+        self.anchors = anchors
+        self.fields = fields
+        self.reference = reference
+        self.lang = lang
+        self._gray = None
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        reference = os.path.join(os.path.dirname(path), data["reference"])
+        return cls(data["name"], data["size"], data["anchors"], data["fields"],
+                   reference, data.get("lang", 'en'))
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "size": self.size,
+            "lang": self.lang,
+            "reference": os.path.basename(self.reference),
+            "anchors": self.anchors,
+            "fields": self.fields
+        }
+
+    def _reference_gray(self):
+        if self._gray is None:
+            self._gray, self._scale = load_gray(self.reference)
+        return self._gray, self._scale
+
+    def match(self, page_gray, page_scale, page_size):
+        """
+        Alignment check against a page
+
+        Args:
+            page_gray: Page at ALIGN_WIDTH (load_gray)
+            page_scale: ALIGN_WIDTH / page width
+            page_size: (width, height) of the page in pixels
+
+        Returns:
+            (matched, details): details has the anchor scores and, on a match,
+            the shift (page pixels) and scale mapping template boxes onto the page
+        """
+        details = {"template": self.name, "anchor_scores": []}
+
+        template_aspect = self.size[1] / self.size[0]
+        page_aspect = page_size[1] / page_size[0]
+        if abs(page_aspect - template_aspect) / template_aspect > MAX_ASPECT_DIFF:
+            details["reason"] = "aspect ratio"
+            return False, details
+
+        reference, ref_scale = self._reference_gray()
+        shifts = []
+        for x0, y0, x1, y1 in self.anchors:
+            ax0, ay0 = round(x0 * ref_scale), round(y0 * ref_scale)
+            ax1, ay1 = round(x1 * ref_scale), round(y1 * ref_scale)
+            patch = reference[ay0:ay1, ax0:ax1]
+
+            wx0, wy0 = max(ax0 - SEARCH_MARGIN, 0), max(ay0 - SEARCH_MARGIN, 0)
+            wx1 = min(ax1 + SEARCH_MARGIN, page_gray.shape[1])
+            wy1 = min(ay1 + SEARCH_MARGIN, page_gray.shape[0])
+            window = page_gray[wy0:wy1, wx0:wx1]
+            if patch.size == 0 or window.shape[0] < patch.shape[0] or window.shape[1] < patch.shape[1]:
+                details["anchor_scores"].append(0.0)
+                continue
+
+            score, dy, dx = _best_match(window, patch)
+            details["anchor_scores"].append(round(score, 3))
+            shifts.append((wx0 + dx - ax0, wy0 + dy - ay0))
+
+        scores = details["anchor_scores"]
+        if not scores or min(scores) < MIN_ANCHOR_SCORE:
+            details["reason"] = "anchor mismatch"
+            return False, details
+
+        shifts = np.asarray(shifts, dtype=np.float32)
+        shift = np.median(shifts, axis=0)
+        if np.abs(shifts - shift).max() > MAX_ANCHOR_SPREAD:
+            details["reason"] = "inconsistent shift"
+            return False, details
+
+        details["shift"] = [round(float(v) / page_scale, 1) for v in shift]
+        details["scale"] = page_size[0] / self.size[0]
+        return True, details
+
+    def aligned_fields(self, details):
+        """Field boxes mapped onto a matched page"""
+        scale, (dx, dy) = details["scale"], details["shift"]
+        return {name: [x0 * scale + dx, y0 * scale + dy, x1 * scale + dx, y1 * scale + dy]
+                for name, (x0, y0, x1, y1) in self.fields.items()}
+
+
+class TemplateRegistry:
+    """Directory of templates (<name>.json + <name>.png reference image)"""
+
+    def __init__(self, directory=DEFAULT_REGISTRY_DIR):
+        self.directory = Path(directory)
+        self.templates = []
+        if self.directory.is_dir():
+            for path in sorted(self.directory.glob("*.json")):
+                try:
+                    self.templates.append(Template.load(str(path)))
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"⚠ Skipping template {path}: {e}")
+
+    def register(self, name, image_path, fields, anchors=None, lang='en'):
+        """
+        Add (or replace) a template
+
+        Args:
+            name: Template name
+            image_path: Reference page of the layout
+            fields: {field name: [x0, y0, x1, y1]} in reference pixels
+            anchors: Static regions to align on (default: picked automatically)
+            lang: Recognition language for the fields
+
+        Returns:
+            The Template
+        """
+        from PIL import Image
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with Image.open(image_path) as pil:
+            size = [pil.width, pil.height]
+            reference = self.directory / f"{name}.png"
+            pil.convert('L').save(reference)
+
+        if anchors is None:
+            gray, scale = load_gray(reference)
+            anchors = pick_anchors(gray, scale, fields)
+
+        template = Template(name, size, anchors, fields, str(reference), lang)
+        with open(self.directory / f"{name}.json", 'w', encoding='utf-8') as f:
+            json.dump(template.to_dict(), f, indent=2)
+
+        self.templates = [t for t in self.templates if t.name != name] + [template]
+        return template
+
+    def match(self, image_path):
+        """
+        First template whose alignment check passes
+
+        Returns:
+            (template, details) or (None, None)
+        """
+        if not self.templates:
+            return None, None
+
+        from PIL import Image
+        with Image.open(str(image_path)) as pil:
+            page_size = (pil.width, pil.height)
+        page_gray, page_scale = load_gray(image_path)
+
+        for template in self.templates:
+            matched, details = template.match(page_gray, page_scale, page_size)
+            if matched:
+                return template, details
+        return None, None
+
+
+def process_pages(image_paths, registry, output_dir="test_results/templates", baseline=False):
+    """
+    Read pages through the registry: template fast path, full OCR otherwise
+
+    Args:
+        image_paths: Pages to process
+        registry: TemplateRegistry
+        output_dir: Where per-page JSON/TXT (and _fields.json) go
+        baseline: Also run full OCR on matched pages to measure the time saved
+
+    Returns:
+        Report dictionary (hits, misses, hit rate, per-path latency, time saved)
+    """
+    from multilingual_ocr import MultilingualOCR
+    from ocr_api import create_ocr_engine, run_ocr, run_recognition, save_ocr_outputs
+
+    recognizer = MultilingualOCR(use_textline_orientation=False)
+    ocr = None
+    report = {"pages": 0, "hits": 0, "misses": 0, "templates": {},
+              "template_seconds": 0.0, "full_ocr_seconds": 0.0, "baseline_seconds": 0.0}
+
+    for image_path in image_paths:
+        report["pages"] += 1
+        print(f"\n{image_path}")
+
+        start = time.perf_counter()
+        template, details = registry.match(image_path)
+        if template is not None:
+            boxes = template.aligned_fields(details)
+            page_result = run_recognition(image_path, list(boxes.values()), lang=template.lang,
+                                          recognizer=recognizer)
+            elapsed = time.perf_counter() - start
+            report["hits"] += 1
+            report["template_seconds"] += elapsed
+            report["templates"][template.name] = report["templates"].get(template.name, 0) + 1
+            print(f"  ✓ Template {template.name} (shift {details['shift']}, "
+                  f"anchors {min(details['anchor_scores']):.2f}+) - {elapsed * 1000:.0f} ms")
+
+            output_files = save_ocr_outputs(page_result, output_dir, visualization=False)
+            fields_file = os.path.join(output_dir, f"{Path(image_path).stem}_fields.json")
+            with open(fields_file, 'w', encoding='utf-8') as f:
+                json.dump({"template": template.name,
+                           "fields": {name: {"text": text, "confidence": float(score)}
+                                      for name, text, score in zip(boxes, page_result.texts,
+                                                                   page_result.scores)}},
+                          f, indent=2, ensure_ascii=False)
+            for name, text in zip(boxes, page_result.texts):
+                print(f"    {name:16s} {text}")
+
+            if baseline:
+                if ocr is None:
+                    ocr = create_ocr_engine(lang='en')
+                base_start = time.perf_counter()
+                run_ocr(image_path, ocr)
+                report["baseline_seconds"] += time.perf_counter() - base_start
+            continue
+
+        if ocr is None:
+            ocr = create_ocr_engine(lang='en')
+        page_result = run_ocr(image_path, ocr)
+        elapsed = time.perf_counter() - start
+        report["misses"] += 1
+        report["full_ocr_seconds"] += elapsed
+        print(f"  - No template; full OCR: {page_result.text_regions} regions - {elapsed * 1000:.0f} ms")
+        if page_result.success:
+            save_ocr_outputs(page_result, output_dir)
+
+    hits, misses = report["hits"], report["misses"]
+    report["hit_rate"] = hits / report["pages"] if report["pages"] else 0.0
+    report["template_ms_per_page"] = report["template_seconds"] * 1000 / hits if hits else None
+    report["full_ocr_ms_per_page"] = report["full_ocr_seconds"] * 1000 / misses if misses else None
+
+    # Full-OCR cost of the matched pages: measured with baseline, else estimated from the misses
+    if hits and baseline:
+        report["time_saved_seconds"] = report["baseline_seconds"] - report["template_seconds"]
+    elif hits and misses:
+        report["time_saved_seconds"] = hits * report["full_ocr_seconds"] / misses - report["template_seconds"]
+    else:
+        report["time_saved_seconds"] = None
+    return report
+
+
+def print_report(report):
+    print("\n" + "="*60)
+    print("TEMPLATE FAST PATH")
+    print("="*60)
+    print(f"Pages:      {report['pages']}")
+    print(f"Hit rate:   {report['hit_rate']:.1%} ({report['hits']} template, {report['misses']} full OCR)")
+    for name, count in report["templates"].items():
+        print(f"  {name:20s} {count}")
+    if report["template_ms_per_page"] is not None:
+        print(f"Template path:  {report['template_ms_per_page']:.0f} ms/page")
+    if report["full_ocr_ms_per_page"] is not None:
+        print(f"Full OCR path:  {report['full_ocr_ms_per_page']:.0f} ms/page")
+    if report["time_saved_seconds"] is not None:
+        print(f"Time saved:     {report['time_saved_seconds']:.2f}s")
+    else:
+        print("Time saved:     n/a (use --baseline to measure)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Register fixed layouts and read matching pages with recognition only',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Register the invoice and registration form from create_sample_documents.py
+  python template_registry.py register-samples
+
+  # Register a layout: fields.json is {"field": [x0, y0, x1, y1], ...} in pixels
+  python template_registry.py register purchase_order scans/po_blank.png --fields fields.json
+
+  # Process pages (template fast path, full OCR for the rest)
+  python template_registry.py run test_documents/forms test_documents/invoices
+
+  # Also time full OCR on matched pages to measure the saving
+  python template_registry.py run test_documents/invoices --baseline
+        """
+    )
+
+    parser.add_argument('command', choices=['register', 'register-samples', 'list', 'run'],
+                        help='Action to perform')
+    parser.add_argument('args', nargs='*',
+                        help='register: NAME IMAGE; run: images or directories')
+    parser.add_argument('--fields', help='JSON file with the field boxes (register)')
+    parser.add_argument('--anchors', help='JSON list of anchor boxes (register; default: automatic)')
+    parser.add_argument('--lang', default='en', help='Recognition language of the fields (register)')
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY_DIR,
+                        help=f'Template directory (default: {DEFAULT_REGISTRY_DIR})')
+    parser.add_argument('--output', '-o', default='test_results/templates',
+                        help='Output directory (run; default: test_results/templates)')
+    parser.add_argument('--baseline', action='store_true',
+                        help='Also run full OCR on matched pages to measure the time saved (run)')
+
+    args = parser.parse_args()
+    registry = TemplateRegistry(args.registry)
+
+    if args.command == 'register-samples':
+        for name, sample in SAMPLE_TEMPLATES.items():
+            if not os.path.exists(sample["image"]):
+                print(f"✗ {sample['image']} not found (run: python create_sample_documents.py)")
+                continue
+            template = registry.register(name, sample["image"], sample["fields"])
+            print(f"✓ Registered {name}: {len(template.fields)} fields, {len(template.anchors)} anchors")
+        return
+
+    if args.command == 'register':
+        if len(args.args) != 2 or not args.fields:
+            parser.error("register needs NAME IMAGE and --fields")
+        name, image_path = args.args
+        with open(args.fields, 'r', encoding='utf-8') as f:
+            fields = json.load(f)
+        anchors = None
+        if args.anchors:
+            with open(args.anchors, 'r', encoding='utf-8') as f:
+                anchors = json.load(f)
+        template = registry.register(name, image_path, fields, anchors, args.lang)
+        print(f"✓ Registered {name}: {len(template.fields)} fields, {len(template.anchors)} anchors")
+        return
+
+    if args.command == 'list':
+        if not registry.templates:
+            print(f"No templates in {args.registry}")
+        for template in registry.templates:
+            print(f"  {template.name:20s} {template.size[0]}x{template.size[1]}  "
+                  f"{len(template.fields)} fields  {len(template.anchors)} anchors")
+        return
+
+    from input_discovery import discover_inputs
+
+    if not registry.templates:
+        print(f"⚠ No templates in {args.registry}; every page will use full OCR")
+    pages = list(discover_inputs(args.args or ["test_documents"], recursive=True))
+    if not pages:
+        print("✗ No images found")
+        sys.exit(1)
+
+    report = process_pages(pages, registry, args.output, baseline=args.baseline)
+    print_report(report)
+
+    os.makedirs(args.output, exist_ok=True)
+    report_file = os.path.join(args.output, "template_report.json")
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Report saved: {report_file}")
+
+
+if __name__ == "__main__":
+    main()
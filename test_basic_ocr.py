@@ -5,135 +5,78 @@ Tests text detection and recognition capabilities
 
 import os
 import sys
-from pathlib import Path
-import json
-from datetime import datetime
 
-def test_basic_ocr(image_path, output_dir="test_results"):
+from ocr_api import create_ocr_engine, run_ocr, save_ocr_outputs
+from page_watchdog import PageTimeout
+
+def test_basic_ocr(image_path, output_dir="test_results", ocr=None):
     """
     Test basic OCR functionality
     
     Args:
         image_path: Path to the test image
         output_dir: Directory to save results
+        ocr: Optional initialized PaddleOCR instance to reuse
+        
+    Returns:
+        OCRPageResult on success, False otherwise
     """
     try:
-        from paddleocr import PaddleOCR
-        import cv2
-        import numpy as np
-        from PIL import Image, ImageDraw, ImageFont
-        
         print("\n" + "="*60)
         print("Testing Basic OCR (PP-OCRv5)")
         print("="*60)
         
-        # Create output directory
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Initialize PaddleOCR
-        print("\nInitializing PaddleOCR...")
-        ocr = PaddleOCR(
-            use_textline_orientation=True,
-            lang='en'
-        )
-        
         # Check if image exists
         if not os.path.exists(image_path):
             print(f"✗ Image not found: {image_path}")
             print("Please provide a valid image path or use download_test_images() first")
             return False
         
+        # Initialize PaddleOCR
+        if ocr is None:
+            print("\nInitializing PaddleOCR...")
+            ocr = create_ocr_engine(lang='en')
+        
         print(f"✓ Processing image: {image_path}")
         
         # Perform OCR
-        result = ocr.predict(image_path)
+        page_result = run_ocr(image_path, ocr)
         
         # Process results
-        if result and result[0]:
-            ocr_result = result[0]
-            
-            # Extract texts and scores from OCRResult object
-            texts = ocr_result.get('rec_texts', [])
-            scores = ocr_result.get('rec_scores', [])
-            boxes = ocr_result.get('rec_polys', [])
-            
-            print(f"✓ Found {len(texts)} text regions\n")
-            
-            # Save results to JSON
-            output_data = {
-                "timestamp": datetime.now().isoformat(),
-                "image_path": str(image_path),
-                "total_regions": len(texts),
-                "results": []
-            }
+        if page_result.success:
+            print(f"✓ Found {page_result.text_regions} text regions\n")
             
             print("Detected Text:")
             print("-" * 60)
-            for idx, (text, score) in enumerate(zip(texts, scores), 1):
-                box = boxes[idx-1] if idx-1 < len(boxes) else []
+            for idx, text, score, box in page_result.regions():
+                box_list = box.tolist() if hasattr(box, 'tolist') else box
                 
                 print(f"{idx}. Text: '{text}'")
                 print(f"   Confidence: {score:.4f}")
-                if hasattr(box, 'tolist'):
-                    box_list = box.tolist()
-                else:
-                    box_list = box
                 print(f"   Box: {box_list[:4] if len(str(box_list)) > 100 else box_list}\n")
-                
-                output_data["results"].append({
-                    "index": idx,
-                    "text": text,
-                    "confidence": float(score),
-                    "box": box_list if hasattr(box, 'tolist') else (list(box) if isinstance(box, (list, tuple)) else str(box))
-                })
             
-            # Save results in multiple formats
-            input_basename = os.path.basename(image_path)
-            name_without_ext = os.path.splitext(input_basename)[0]
+            conf_dist = ", ".join(f"{label}: {count}" for label, count in page_result.stats.confidence_distribution().items())
+            print(f"Average confidence: {page_result.avg_confidence:.2%} ({conf_dist})")
             
             print("\n" + "="*60)
             print("Saving Results")
             print("="*60)
             
-            # 1. Save JSON file (structured data with coordinates and confidence)
-            json_file = os.path.join(output_dir, f"{name_without_ext}.json")
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-            print(f"✓ JSON saved to: {json_file}")
-            
-            # 2. Save plain text file (extracted text only)
-            txt_file = os.path.join(output_dir, f"{name_without_ext}.txt")
-            with open(txt_file, 'w', encoding='utf-8') as f:
-                f.write(f"OCR Results for: {image_path}\n")
-                f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-                f.write(f"Total text regions: {len(texts)}\n")
-                f.write("="*60 + "\n\n")
-                
-                # Write all extracted text
-                for idx, (text, score) in enumerate(zip(texts, scores), 1):
-                    f.write(f"{idx}. {text}\n")
-                
-                f.write("\n" + "="*60 + "\n")
-                f.write("Detailed Results with Confidence Scores:\n")
-                f.write("="*60 + "\n\n")
-                
-                for idx, (text, score) in enumerate(zip(texts, scores), 1):
-                    f.write(f"{idx:3d}. {text:50s} (confidence: {score:.4f})\n")
-            print(f"✓ Text saved to: {txt_file}")
-            
-            # 3. Save visualization image (with bounding boxes)
-            try:
-                viz_file = os.path.join(output_dir, f"{name_without_ext}_annotated.jpg")
-                ocr_result.save_to_img(viz_file)
-                print(f"✓ Visualization saved to: {viz_file}")
-            except Exception as e:
-                print(f"⚠ Could not create visualization: {e}")
+            # Save results in multiple formats
+            output_files = save_ocr_outputs(page_result, output_dir)
+            print(f"✓ JSON saved to: {output_files['json']}")
+            print(f"✓ Text saved to: {output_files['txt']}")
+            if 'image' in output_files:
+                print(f"✓ Visualization saved to: {output_files['image']}")
             
-            return True
+            return page_result
         else:
             print("✗ No text detected in the image")
             return False
             
+    except PageTimeout:
+        # The caller records the timeout and carries on with the next page
+        raise
     except ImportError as e:
         print(f"✗ Import error: {e}")
         print("Please install required packages: pip install paddleocr[all]")
@@ -132,8 +132,7 @@ def test_table_recognition(image_path, output_dir="test_results/table_recognitio
     """
     try:
         from paddleocr import PPStructure
-        import pandas as pd
-        from bs4 import BeautifulSoup
+        from table_html import convert_table_html
         
         print("\n" + "="*60)
         print("Testing Table Recognition")
@@ -174,22 +173,12 @@ def test_table_recognition(image_path, output_dir="test_results/table_recognitio
                         f.write(html)
                     print(f"  HTML saved to: {html_file}")
                     
-                    # Try to convert to CSV
+                    # Try to convert to CSV (rowspan/colspan cells are repeated)
                     try:
-                        soup = BeautifulSoup(html, 'html.parser')
-                        table = soup.find('table')
-                        if table:
-                            rows = []
-                            for tr in table.find_all('tr'):
-                                cells = [td.get_text(strip=True) for td in tr.find_all(['td', 'th'])]
-                                rows.append(cells)
-                            
-                            if rows:
-                                df = pd.DataFrame(rows[1:], columns=rows[0] if rows else None)
-                                csv_file = os.path.join(output_dir, f"table_{tables_found}.csv")
-                                df.to_csv(csv_file, index=False, encoding='utf-8')
-                                print(f"  CSV saved to: {csv_file}")
-                                print(f"  Rows: {len(df)}, Columns: {len(df.columns)}")
+                        csv_base = os.path.join(output_dir, f"table_{tables_found}")
+                        for csv_file, n_rows, n_cols in convert_table_html(html, csv_base):
+                            print(f"  CSV saved to: {csv_file}")
+                            print(f"  Rows: {max(n_rows - 1, 0)}, Columns: {n_cols}")
                     except Exception as e:
                         print(f"  ⚠ Could not convert to CSV: {e}")
         
@@ -202,7 +191,7 @@ def test_table_recognition(image_path, output_dir="test_results/table_recognitio
             
     except ImportError as e:
         print(f"✗ Import error: {e}")
-        print("Please install: pip install paddleocr[all] beautifulsoup4")
+        print("Please install: pip install paddleocr[all]")
         return False
     except Exception as e:
         print(f"✗ Error during table recognition: {e}")
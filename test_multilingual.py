@@ -18,7 +18,7 @@ def test_multilingual_ocr(image_path, language='en', output_dir="test_results/mu
         output_dir: Directory to save results
     """
     try:
-        from paddleocr import PaddleOCR
+        from ocr_api import create_ocr_engine
         
         print("\n" + "="*60)
         print(f"Testing Multilingual OCR - Language: {language}")
@@ -29,10 +29,7 @@ def test_multilingual_ocr(image_path, language='en', output_dir="test_results/mu
         
         # Initialize PaddleOCR with specified language
         print(f"\nInitializing PaddleOCR for {language}...")
-        ocr = PaddleOCR(
-            use_textline_orientation=True,
-            lang=language
-        )
+        ocr = create_ocr_engine(lang=language, use_textline_orientation=True)
         
         if not os.path.exists(image_path):
             print(f"✗ Image not found: {image_path}")
@@ -102,68 +99,184 @@ def test_multilingual_ocr(image_path, language='en', output_dir="test_results/mu
         return False
 
 
+
+def test_multilingual_detect_once(image_path, languages, output_dir="test_results/multilingual"):
+    """
+    Compare several languages on one image, detecting text only once
+
+    Detection and line orientation run a single time; each language then
+    only runs its recognition model over the cached crops.
+
+    Args:
+        image_path: Path to the test image
+        languages: List of language codes
+        output_dir: Directory to save results
+    """
+    try:
+        from multilingual_ocr import MultilingualOCR
+
+        print("\n" + "="*60)
+        print(f"Multilingual OCR (detect once) - Languages: {', '.join(languages)}")
+        print("="*60)
+
+        if not os.path.exists(image_path):
+            print(f"✗ Image not found: {image_path}")
+            return False
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        print(f"✓ Processing image: {image_path}")
+        results, timings = MultilingualOCR(use_textline_orientation=True).run(image_path, languages)
+
+        shared = timings["detection"] + timings["orientation"]
+        print(f"\nDetection:   {timings['detection']:.2f}s (once)")
+        print(f"Orientation: {timings['orientation']:.2f}s (once)")
+
+        print(f"\n{'Language':<14}{'Regions':>8}{'Avg conf':>10}{'Rec time':>10}  First line")
+        print("-" * 60)
+        comparison = {
+            "timestamp": datetime.now().isoformat(),
+            "image_path": str(image_path),
+            "detection_time": timings["detection"],
+            "orientation_time": timings["orientation"],
+            "languages": {}
+        }
+        for language, result in results.items():
+            if result.error and not result.texts:
+                print(f"{language:<14}  ✗ {result.error}")
+                comparison["languages"][language] = {"error": result.error}
+                continue
+
+            first_line = result.texts[0][:24] if result.texts else ""
+            print(f"{language:<14}{result.text_regions:>8}{result.avg_confidence:>10.4f}"
+                  f"{result.elapsed:>9.2f}s  {first_line}")
+
+            output_data = {
+                "timestamp": result.timestamp,
+                "language": language,
+                "image_path": str(image_path),
+                "total_regions": result.text_regions,
+                "results": [
+                    {"index": idx, "text": text, "confidence": float(score),
+                     "box": box.tolist() if hasattr(box, 'tolist') else list(box)}
+                    for idx, text, score, box in result.regions()
+                ]
+            }
+            result_file = os.path.join(output_dir, f"ocr_results_{language}.json")
+            with open(result_file, 'w', encoding='utf-8') as f:
+                json.dump(output_data, f, indent=2, ensure_ascii=False)
+
+            comparison["languages"][language] = {
+                "regions": result.text_regions,
+                "avg_confidence": result.avg_confidence,
+                "recognition_time": result.elapsed,
+                "result_file": result_file
+            }
+
+        total = shared + sum(timings["recognition"].values())
+        print("-" * 60)
+        print(f"Total: {total:.2f}s for {len(languages)} languages "
+              f"(detection would have run {len(languages)}x with one engine per language)")
+
+        comparison_file = os.path.join(output_dir, "language_comparison.json")
+        with open(comparison_file, 'w', encoding='utf-8') as f:
+            json.dump(comparison, f, indent=2, ensure_ascii=False)
+        print(f"\n✓ Results saved to: {output_dir}")
+
+        return any(result.success for result in results.values())
+
+    except Exception as e:
+        print(f"✗ Error during OCR: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+
+def test_multilingual_auto(image_path, candidates=None, output_dir="test_results/multilingual"):
+    """
+    OCR with the recognition language picked by a script-identification pre-pass
+
+    Args:
+        image_path: Path to the test image
+        candidates: Language codes to consider (default: DEFAULT_CANDIDATES)
+        output_dir: Directory to save results
+    """
+    try:
+        from multilingual_ocr import DEFAULT_CANDIDATES, SUPPORTED_LANGUAGES, MultilingualOCR
+
+        candidates = candidates or list(DEFAULT_CANDIDATES)
+        unknown = [lang for lang in candidates if lang not in SUPPORTED_LANGUAGES]
+        if unknown:
+            print(f"✗ Unsupported language(s): {', '.join(unknown)} (see --list-languages)")
+            return False
+
+        print("\n" + "="*60)
+        print(f"Multilingual OCR (auto) - Candidates: {', '.join(candidates)}")
+        print("="*60)
+
+        if not os.path.exists(image_path):
+            print(f"✗ Image not found: {image_path}")
+            return False
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        print(f"✓ Processing image: {image_path}")
+        result, report = MultilingualOCR(use_textline_orientation=True).run_auto(image_path, candidates)
+
+        print("\nScript identification:")
+        for lang, probe in report["probes"].items():
+            print(f"  {lang:14} {probe['model']:32} fit {probe['mean_fit']:.3f}  wins {probe['share']:.0%}")
+        chosen = ", ".join(f"{lang} ({report['region_languages'][lang]} regions)"
+                           for lang in report["languages"])
+        print(f"✓ Recognized with: {chosen}")
+        print(f"  Recognizer passes per region: {report['passes_per_region']:.2f} "
+              f"(+{report['probe_recognitions']} probe crops)")
+
+        timings = report["timings"]
+        print(f"  Detection {timings['detection']:.2f}s, orientation {timings['orientation']:.2f}s, "
+              f"identification {timings['identification']:.2f}s, recognition {timings['recognition']:.2f}s")
+
+        if not result.success:
+            print("✗ No text detected in the image")
+            return False
+
+        print(f"\n✓ Found {result.text_regions} text regions\n")
+        print("Detected Text:")
+        print("-" * 60)
+        for idx, text, score, _ in result.regions():
+            print(f"{idx}. {text} (confidence: {score:.4f})")
+
+        output_data = {
+            "timestamp": result.timestamp,
+            "language": "auto",
+            "languages": report["languages"],
+            "region_languages": report["region_languages"],
+            "image_path": str(image_path),
+            "total_regions": result.text_regions,
+            "results": [
+                {"index": idx, "text": text, "confidence": score,
+                 "box": box.tolist() if hasattr(box, 'tolist') else list(box)}
+                for idx, text, score, box in result.regions()
+            ]
+        }
+        result_file = os.path.join(output_dir, "ocr_results_auto.json")
+        with open(result_file, 'w', encoding='utf-8') as f:
+            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        print(f"\n✓ Results saved to: {result_file}")
+
+        return True
+
+    except Exception as e:
+        print(f"✗ Error during OCR: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def list_supported_languages():
     """List all supported languages in PaddleOCR"""
-    languages = {
-        'ch': 'Chinese & English',
-        'en': 'English',
-        'french': 'French',
-        'german': 'German',
-        'korean': 'Korean',
-        'japan': 'Japanese',
-        'chinese_cht': 'Traditional Chinese',
-        'it': 'Italian',
-        'es': 'Spanish',
-        'pt': 'Portuguese',
-        'ru': 'Russian',
-        'ar': 'Arabic',
-        'hi': 'Hindi',
-        'ug': 'Uyghur',
-        'fa': 'Persian',
-        'ur': 'Urdu',
-        'rs_latin': 'Serbian (Latin)',
-        'oc': 'Occitan',
-        'mr': 'Marathi',
-        'ne': 'Nepali',
-        'rsc': 'Serbian (Cyrillic)',
-        'bg': 'Bulgarian',
-        'uk': 'Ukrainian',
-        'be': 'Belarusian',
-        'te': 'Telugu',
-        'kn': 'Kannada',
-        'ta': 'Tamil',
-        'af': 'Afrikaans',
-        'az': 'Azerbaijani',
-        'bs': 'Bosnian',
-        'cs': 'Czech',
-        'cy': 'Welsh',
-        'da': 'Danish',
-        'et': 'Estonian',
-        'ga': 'Irish',
-        'hr': 'Croatian',
-        'hu': 'Hungarian',
-        'id': 'Indonesian',
-        'is': 'Icelandic',
-        'ku': 'Kurdish',
-        'lt': 'Lithuanian',
-        'lv': 'Latvian',
-        'mi': 'Maori',
-        'ms': 'Malay',
-        'mt': 'Maltese',
-        'nl': 'Dutch',
-        'no': 'Norwegian',
-        'pl': 'Polish',
-        'ro': 'Romanian',
-        'sk': 'Slovak',
-        'sl': 'Slovenian',
-        'sq': 'Albanian',
-        'sv': 'Swedish',
-        'sw': 'Swahili',
-        'tl': 'Tagalog',
-        'tr': 'Turkish',
-        'uz': 'Uzbek',
-        'vi': 'Vietnamese',
-    }
+    from multilingual_ocr import SUPPORTED_LANGUAGES
     
     print("\n" + "="*60)
     print("Supported Languages in PaddleOCR (100+ languages)")
@@ -172,7 +285,7 @@ def list_supported_languages():
     main_langs = ['ch', 'en', 'french', 'german', 'korean', 'japan', 'chinese_cht', 
                   'it', 'es', 'pt', 'ru', 'ar', 'hi']
     for lang in main_langs:
-        print(f"  {lang:15} - {languages[lang]}")
+        print(f"  {lang:15} - {SUPPORTED_LANGUAGES[lang]}")
     
     print("\nTo see the full list of 100+ supported languages, visit:")
     print("https://github.com/PaddlePaddle/PaddleOCR/blob/main/doc/doc_en/multi_languages_en.md")
@@ -190,15 +303,26 @@ def main():
         else:
             image_path = sys.argv[1]
             language = sys.argv[2] if len(sys.argv) > 2 else 'en'
-            test_multilingual_ocr(image_path, language)
+            if language == 'auto':
+                candidates = sys.argv[3].split(',') if len(sys.argv) > 3 else None
+                test_multilingual_auto(image_path, candidates)
+            elif ',' in language:
+                languages = [lang.strip() for lang in language.split(',') if lang.strip()]
+                test_multilingual_detect_once(image_path, languages)
+            else:
+                test_multilingual_ocr(image_path, language)
     else:
         print("\nUsage:")
         print("  python test_multilingual.py <image_path> [language_code]")
+        print("  python test_multilingual.py <image_path> <lang1,lang2,...>   (detect once, compare languages)")
+        print("  python test_multilingual.py <image_path> auto [lang1,lang2,...]   (identify the script first)")
         print("  python test_multilingual.py --list-languages")
         print("\nExamples:")
         print("  python test_multilingual.py document.jpg en")
         print("  python test_multilingual.py chinese_doc.jpg ch")
         print("  python test_multilingual.py french_text.jpg french")
+        print("  python test_multilingual.py signage.jpg en,french,german")
+        print("  python test_multilingual.py unknown_doc.jpg auto")
         list_supported_languages()
 
 
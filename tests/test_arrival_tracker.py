@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip("paddleocr")
+
+from convert_pages_to_markdown import ArrivalTracker
+
+
+def _settle(tracker, path):
+    tracker.poll([path], now=0.0)
+    return tracker.poll([path], now=10.0)
+
+
+def test_claimed_until_complete(tmp_path):
+    path = tmp_path / "page.png"
+    path.write_bytes(b"png")
+    tracker = ArrivalTracker(settle_seconds=1.0)
+
+    assert _settle(tracker, str(path)) == [(str(path), 0.0)]
+    assert tracker.poll([str(path)], now=20.0) == []
+    tracker.complete(str(path))
+    assert tracker.poll([str(path)], now=30.0) == []
+
+
+def test_failed_file_retried_then_waits_for_change(tmp_path):
+    path = tmp_path / "page.png"
+    path.write_bytes(b"png")
+    tracker = ArrivalTracker(settle_seconds=1.0, retries=1)
+
+    _settle(tracker, str(path))
+    assert tracker.fail(str(path)) is True
+    assert tracker.fail(str(path)) is False
+    assert tracker.poll([str(path)], now=20.0) == []
+
+    # Rewritten after the failure: picked up again
+    path.write_bytes(b"png, complete")
+    tracker.poll([str(path)], now=30.0)
+    assert tracker.poll([str(path)], now=40.0) == [(str(path), 30.0)]
@@ -0,0 +1,40 @@
+import numpy as np
+from PIL import Image
+
+import benchmark_nanonets_comparison as benchmark
+import ocr_api
+
+
+class FlakyEngine:
+    """OCR stand-in whose first predict() raises"""
+
+    def __init__(self):
+        self.pages = []
+
+    def predict(self, image_path):
+        self.pages.append(image_path)
+        if len(self.pages) == 1:
+            raise RuntimeError("decoder crashed")
+        return [{"rec_texts": ["Invoice"], "rec_scores": [0.95],
+                 "rec_polys": [np.array([[0, 0], [40, 0], [40, 10], [0, 10]])]}]
+
+
+def test_duplicates_of_a_failed_page_are_ocred_themselves(tmp_path, monkeypatch):
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    for name in ("page_001.png", "page_002.png"):
+        Image.open("test_documents/invoices/sample_invoice.jpg").save(pages / name)
+
+    engine = FlakyEngine()
+    monkeypatch.setattr(ocr_api, "create_ocr_engine", lambda **kwargs: engine)
+
+    summary = benchmark.benchmark_all_pages(str(pages), output_dir=str(tmp_path / "out"),
+                                            dedup_threshold=4)
+
+    # The failure is not copied into the duplicate, which is OCRed on its own
+    assert len(engine.pages) == 2
+    assert summary["dedup"]["reused"] == 0
+    assert summary["dedup"]["time_saved_seconds"] == 0
+    pages = summary["detailed_results"]
+    assert [page["success"] for page in pages] == [False, True]
+    assert "duplicate_of" not in pages[1]
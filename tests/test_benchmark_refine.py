@@ -0,0 +1,52 @@
+import numpy as np
+
+import benchmark_nanonets_comparison as benchmark
+
+
+class Engine:
+    def predict(self, image_path):
+        return [{"rec_texts": ["Invoice", "Tota1"], "rec_scores": [0.98, 0.4],
+                 "rec_polys": [np.array([[0, 0], [40, 0], [40, 10], [0, 10]])] * 2}]
+
+
+class BrokenRefiner:
+    threshold = 0.7
+
+    def refine(self, image_path, texts, scores, polys):
+        raise RuntimeError("cannot open source PDF")
+
+
+class Refiner:
+    threshold = 0.7
+
+    def refine(self, image_path, texts, scores, polys):
+        return (["Invoice", "Total"], [0.98, 0.95],
+                {"threshold": 0.7, "candidates": 1, "improved": 1, "source": "upsampled", "seconds": 0.01})
+
+
+class Drawable(dict):
+    def save_to_img(self, path):
+        raise AssertionError("a refined page must not be drawn with first-pass readings")
+
+
+def test_refinement_error_keeps_first_pass_result():
+    result = benchmark.perform_ocr_with_metrics("page.png", Engine(), refiner=BrokenRefiner())
+    metrics = result["metrics"]
+    assert metrics["success"]
+    assert metrics["extracted_texts"] == ["Invoice", "Tota1"]
+    assert metrics["confidence_list"] == [0.98, 0.4]
+    assert "cannot open source PDF" in metrics["refinement"]["error"]
+    assert metrics["refinement"]["improved"] == 0
+
+    aggregator = benchmark.SummaryAggregator()
+    aggregator.add("page.png", result)
+    assert aggregator.successful == 1
+    assert aggregator.refinement["errors"] == 1
+
+
+def test_refined_page_is_not_visualized(tmp_path):
+    result = benchmark.perform_ocr_with_metrics("page.png", Engine(), refiner=Refiner())
+    assert result["metrics"]["extracted_texts"] == ["Invoice", "Total"]
+    result["ocr_result"] = Drawable(result["ocr_result"])
+    benchmark.save_results(str(tmp_path / "page.png"), result, str(tmp_path))
+    assert (tmp_path / "page.txt").exists()
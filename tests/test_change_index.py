@@ -0,0 +1,62 @@
+import os
+
+from input_discovery import ChangeIndex, filter_changed
+
+
+def _touch(path, seconds):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + int(seconds * 1e9)))
+
+
+def test_new_done_and_modified_files(tmp_path):
+    page = tmp_path / "page.png"
+    page.write_bytes(b"first")
+    index = ChangeIndex(str(tmp_path / "index.json"))
+    assert index.is_changed(str(page))
+
+    index.mark_done(str(page))
+    assert not index.is_changed(str(page))
+
+    # Same size, new content and mtime
+    page.write_bytes(b"other")
+    _touch(page, 5)
+    assert index.is_changed(str(page))
+
+
+def test_touched_but_identical_file_is_unchanged(tmp_path):
+    page = tmp_path / "page.png"
+    page.write_bytes(b"content")
+    index = ChangeIndex(str(tmp_path / "index.json"))
+    index.mark_done(str(page))
+    index.save()
+
+    _touch(page, 5)
+    reloaded = ChangeIndex(str(tmp_path / "index.json"))
+    assert not reloaded.is_changed(str(page))
+    # The refreshed mtime is written back
+    assert reloaded.dirty
+    reloaded.save()
+    assert not ChangeIndex(str(tmp_path / "index.json")).dirty
+
+
+def test_index_survives_reload_and_filters(tmp_path):
+    done, new = tmp_path / "done.png", tmp_path / "new.png"
+    done.write_bytes(b"a")
+    new.write_bytes(b"b")
+    index_file = str(tmp_path / "sub" / "index.json")
+
+    index = ChangeIndex(index_file)
+    index.mark_done(str(done))
+    index.save()
+    assert not os.path.exists(index_file + ".tmp")
+
+    reloaded = ChangeIndex(index_file)
+    assert list(filter_changed([str(done), str(new)], reloaded)) == [str(new)]
+    assert list(filter_changed([str(done)], None)) == [str(done)]
+
+
+def test_unreadable_index_starts_empty(tmp_path, capsys):
+    index_file = tmp_path / "index.json"
+    index_file.write_text("{not json", encoding="utf-8")
+    assert ChangeIndex(str(index_file)).entries == {}
+    assert "Ignoring unreadable input index" in capsys.readouterr().out
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from columnar_results import PYARROW_AVAILABLE, ColumnarPage, columnar_to_json, json_to_columnar
+
+METRICS = {
+    "extracted_texts": ["Invoice", "Größe: 12 €", "", "日本語"],
+    "confidence_list": [0.9876, 0.5, 0.0, 1.0],
+    "bounding_boxes": [
+        [[10, 20], [110, 20], [110, 40], [10, 40]],
+        [[0, 50], [300, 50], [300, 80], [0, 80]],
+        [[5, 90], [6, 90], [6, 91], [5, 91]],
+        [[40000, 100], [40100, 100], [40100, 130], [40000, 130], [40050, 140]]
+    ]
+}
+
+
+def _page():
+    return ColumnarPage.from_json_fields(METRICS)
+
+
+def test_json_fields_round_trip():
+    page = _page()
+    assert len(page) == 4
+    assert page.to_json_fields() == METRICS
+    # The 40000 coordinate does not fit int16
+    assert page.poly_points.dtype == np.int32
+
+
+def test_small_coordinates_use_int16():
+    page = ColumnarPage.from_ocr_result(["a"], [0.9], [np.array([[1.4, 2.6], [3, 4], [5, 6], [7, 8]])])
+    assert page.poly_points.dtype == np.int16
+    assert page.poly(0).tolist() == [[1, 3], [3, 4], [5, 6], [7, 8]]
+
+
+def test_empty_page_round_trip(tmp_path):
+    page = ColumnarPage.from_ocr_result([], [], [])
+    path = str(tmp_path / "empty.npz")
+    page.save(path)
+    loaded = ColumnarPage.load(path)
+    assert len(loaded) == 0
+    assert loaded.to_json_fields() == {"extracted_texts": [], "confidence_list": [], "bounding_boxes": []}
+
+
+@pytest.mark.parametrize("name", [
+    "page.npz",
+    pytest.param("page.arrow", marks=pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed"))
+])
+def test_file_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    _page().save(path)
+    assert ColumnarPage.load(path).to_json_fields() == METRICS
+
+
+def test_json_file_conversion(tmp_path):
+    import json
+
+    source = tmp_path / "page.json"
+    source.write_text(json.dumps({"image": "page.png", "ocr_metrics": dict(METRICS, success=True)}),
+                      encoding="utf-8")
+    columnar = str(tmp_path / "page.npz")
+    json_to_columnar(str(source), columnar)
+
+    data = columnar_to_json(columnar, str(tmp_path / "back.json"), json_template=str(source))
+    assert data["image"] == "page.png"
+    assert {key: data["ocr_metrics"][key] for key in METRICS} == METRICS
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from engine_config import init_config, load_model_config, pipeline_kwargs
+
+
+def _model_cache(tmp_path):
+    for name in ("PP-OCRv5_server_det", "PP-OCRv5_server_rec", "en_PP-OCRv5_mobile_rec",
+                 "latin_PP-OCRv5_mobile_rec", "PP-LCNet_x1_0_textline_ori", "PP-DocLayout_plus-L"):
+        (tmp_path / "models" / name).mkdir(parents=True)
+    return tmp_path / "models"
+
+
+def test_init_pins_recognition_per_language(tmp_path):
+    config = init_config(_model_cache(tmp_path), lang="en")
+    pipelines = config["pipelines"]
+    assert "text_recognition_model_name" not in pipelines["ocr"]
+    assert pipelines["ocr:en"]["text_recognition_model_name"] == "en_PP-OCRv5_mobile_rec"
+    assert pipelines["ocr"]["text_detection_model_name"] == "PP-OCRv5_server_det"
+
+
+@pytest.mark.parametrize("lang", ["french", "de", "fr"])
+def test_init_resolves_script_family_models(tmp_path, lang):
+    config = init_config(_model_cache(tmp_path), lang=lang)
+    assert config["pipelines"][f"ocr:{lang}"]["text_recognition_model_name"] == "latin_PP-OCRv5_mobile_rec"
+
+
+@pytest.mark.parametrize("lang", ["ru", "klingon"])
+def test_init_refuses_to_pin_another_languages_model(tmp_path, lang):
+    # eslav_PP-OCRv5_mobile_rec is not in the cache; the server model reads Chinese/English
+    with pytest.raises(ValueError):
+        init_config(_model_cache(tmp_path), lang=lang)
+
+
+def test_other_languages_do_not_inherit_a_recognition_model(tmp_path):
+    config_file = tmp_path / "ocr_models.json"
+    config_file.write_text(json.dumps({
+        "pipelines": {
+            # Config written before recognition models were pinned per language
+            "ocr": {"text_detection_model_name": "PP-OCRv5_server_det",
+                    "text_recognition_model_name": "en_PP-OCRv5_mobile_rec"},
+            "ocr:fr": {"text_recognition_model_name": "latin_PP-OCRv5_mobile_rec"}
+        }
+    }))
+    config = load_model_config(str(config_file))
+
+    assert "text_recognition_model_name" not in pipeline_kwargs("ocr", "korean", config)
+    assert pipeline_kwargs("ocr", "fr", config)["text_recognition_model_name"] == "latin_PP-OCRv5_mobile_rec"
+    assert pipeline_kwargs("ocr", "korean", config)["text_detection_model_name"] == "PP-OCRv5_server_det"
+    # Without a language (shared modules) the plain entry is used as written
+    assert pipeline_kwargs("ocr", None, config)["text_recognition_model_name"] == "en_PP-OCRv5_mobile_rec"
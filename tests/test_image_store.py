@@ -0,0 +1,67 @@
+import os
+
+from PIL import Image
+
+from image_store import BLOB_DIRNAME, ImageStore, rewrite_links
+
+
+def _image(value):
+    return Image.new("RGB", (8, 8), (value, value, value))
+
+
+class FlakyImage:
+    """PIL stand-in whose first save() fails"""
+
+    def __init__(self, image):
+        self.image = image
+        self.mode, self.size = image.mode, image.size
+        self.failures = 1
+
+    def tobytes(self):
+        return self.image.tobytes()
+
+    def save(self, path):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.image.save(path)
+
+
+def test_links_relative_to_markdown_in_subfolder(tmp_path):
+    for dedup in (False, True):
+        out = tmp_path / f"dedup_{dedup}"
+        with ImageStore(out, dedup=dedup, workers=0) as store:
+            rewrites = store.save_all({"imgs/a.jpg": _image(10)}, markdown_dir=out / "sub" / "dir")
+        link = rewrites["imgs/a.jpg"]
+        assert link.startswith("../../")
+        assert os.path.exists(os.path.normpath(out / "sub" / "dir" / link))
+
+
+def test_root_markdown_keeps_links_without_dedup(tmp_path):
+    with ImageStore(tmp_path, workers=0) as store:
+        assert store.save_all({"imgs/a.jpg": _image(10)}) == {}
+    assert (tmp_path / "imgs" / "a.jpg").exists()
+
+
+def test_dedup_stores_identical_images_once(tmp_path):
+    with ImageStore(tmp_path, dedup=True, workers=2) as store:
+        first = store.save_all({"imgs/a.jpg": _image(10)})
+        second = store.save_all({"imgs/b.jpg": _image(10)})
+    assert first["imgs/a.jpg"] == second["imgs/b.jpg"]
+    assert store.images_seen == 2 and store.images_written == 1
+    assert len(os.listdir(tmp_path / BLOB_DIRNAME)) == 1
+
+
+def test_failed_write_is_retried_by_next_duplicate(tmp_path):
+    store = ImageStore(tmp_path, dedup=True, workers=0)
+    link = store.save("imgs/a.jpg", FlakyImage(_image(10)))
+    assert store.errors and not (tmp_path / link).exists()
+
+    assert store.save("imgs/b.jpg", _image(10)) == link
+    assert (tmp_path / link).exists()
+    assert store.images_written == 1
+
+
+def test_rewrite_links():
+    text = '<img src="imgs/a.jpg"> ![x](imgs/a.jpg)'
+    assert rewrite_links(text, {"imgs/a.jpg": "../imgs/a.jpg"}) == '<img src="../imgs/a.jpg"> ![x](../imgs/a.jpg)'
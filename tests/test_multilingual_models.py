@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+import engine_config
+from multilingual_ocr import REC_MODELS, recognition_model_kwargs
+
+
+@pytest.fixture
+def pinned_config(tmp_path, monkeypatch):
+    config_file = tmp_path / "ocr_models.json"
+    config_file.write_text(json.dumps({
+        "pipelines": {
+            "ocr": {"text_recognition_model_name": "en_PP-OCRv5_mobile_rec",
+                    "text_recognition_model_dir": "en_PP-OCRv5_mobile_rec"},
+            "ocr:french": {"text_recognition_model_name": "latin_PP-OCRv5_mobile_rec",
+                           "text_recognition_model_dir": "latin_local"}
+        }
+    }))
+    monkeypatch.setenv(engine_config.CONFIG_ENV, str(config_file))
+    monkeypatch.setattr(engine_config, "_config_cache", {})
+
+
+def test_languages_resolve_to_their_own_models(pinned_config):
+    assert recognition_model_kwargs("korean") == {"model_name": REC_MODELS["korean"]}
+    assert recognition_model_kwargs("en") == {"model_name": REC_MODELS["en"]}
+
+    french = recognition_model_kwargs("french")
+    assert french["model_name"] == "latin_PP-OCRv5_mobile_rec"
+    assert french["model_dir"].endswith("latin_local")
+
+
+def test_unknown_language():
+    with pytest.raises(ValueError):
+        recognition_model_kwargs("klingon")
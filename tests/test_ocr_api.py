@@ -0,0 +1,26 @@
+from ocr_api import OCRPageResult, save_ocr_outputs
+
+POLY = [[0, 0], [40, 0], [40, 10], [0, 10]]
+
+
+class Drawable(dict):
+    def save_to_img(self, path):
+        with open(path, "wb") as f:
+            f.write(b"jpg")
+
+
+def test_plain_dict_result_skips_visualization(tmp_path, capsys):
+    # Shape of a run_recognition result
+    raw = {"rec_texts": ["Total"], "rec_scores": [0.9], "rec_polys": [POLY]}
+    result = OCRPageResult(tmp_path / "form.png", texts=["Total"], scores=[0.9], polys=[POLY], raw_result=raw)
+
+    files = save_ocr_outputs(result, str(tmp_path / "out"))
+    assert set(files) == {"json", "txt"}
+    assert "Could not create visualization" not in capsys.readouterr().out
+
+
+def test_paddleocr_result_is_visualized(tmp_path):
+    result = OCRPageResult(tmp_path / "page.png", texts=["Total"], scores=[0.9], polys=[POLY],
+                           raw_result=Drawable())
+    files = save_ocr_outputs(result, str(tmp_path / "out"))
+    assert open(files["image"], "rb").read() == b"jpg"
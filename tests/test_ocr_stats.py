@@ -0,0 +1,48 @@
+import pytest
+
+from ocr_stats import ScoreStats, bucket_labels, parse_bucket_edges
+
+
+def test_scores_on_edges_go_to_the_upper_bucket():
+    stats = ScoreStats.from_arrays([0.1, 0.6999, 0.7, 0.85, 0.9, 1.0], texts=["ab", "c", "", "def", "g", "hi"])
+    assert stats.confidence_distribution() == {
+        "high (≥0.9)": 2,
+        "medium (0.7-0.9)": 2,
+        "low (<0.7)": 2
+    }
+    assert stats.total_characters == 9
+    assert stats.confidence_scores() == {"average": 0.7083, "min": 0.1, "max": 1.0}
+
+
+def test_custom_edges_label_bands():
+    edges = parse_bucket_edges("0.5,0.7,0.9")
+    assert bucket_labels(edges) == ["low (<0.5)", "band (0.5-0.7)", "band (0.7-0.9)", "high (≥0.9)"]
+    stats = ScoreStats.from_arrays([0.4, 0.5, 0.8, 0.95], edges=edges)
+    assert list(stats.confidence_distribution().values()) == [1, 1, 1, 1]
+
+
+@pytest.mark.parametrize("text", ["0.9,0.7", "0.7,0.7", ""])
+def test_edges_must_increase(text):
+    with pytest.raises(ValueError):
+        parse_bucket_edges(text)
+
+
+def test_merge_matches_single_pass():
+    first = ScoreStats.from_arrays([0.95, 0.3], texts=["abc", "de"])
+    second = ScoreStats.from_arrays([0.8], texts=["f"])
+    empty = ScoreStats.from_arrays([])
+
+    merged = ScoreStats()
+    merged += first
+    merged += empty
+    merged += second
+    assert merged.to_dict() == ScoreStats.from_arrays([0.95, 0.3, 0.8], texts=["abc", "de", "f"]).to_dict()
+
+
+def test_merge_rejects_other_edges():
+    with pytest.raises(ValueError):
+        ScoreStats().merge(ScoreStats(edges=(0.5,)))
+
+
+def test_empty_stats():
+    assert ScoreStats().to_dict()["confidence_scores"] == {"average": 0, "min": 0, "max": 0}
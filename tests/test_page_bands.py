@@ -0,0 +1,65 @@
+from PIL import Image, ImageDraw, ImageFont
+
+from page_bands import find_stable_bands
+
+SIZE = (1275, 1650)
+FONT = ImageFont.load_default(size=28)
+
+HEADER_Y = 60
+ZONE_BODY_Y = 250
+FOOTER_Y = 1560
+
+
+def _page(path, number):
+    image = Image.new("L", SIZE, 255)
+    draw = ImageDraw.Draw(image)
+    # Running title and page number share one row
+    draw.text((100, HEADER_Y), "ACME Corp - Annual Report 2024", font=FONT, fill=0)
+    draw.text((1050, HEADER_Y), f"Page {number}", font=FONT, fill=0)
+    # Body text reaching into the top band zone
+    draw.text((100, ZONE_BODY_Y), f"Section {number}: results of quarter {number + 1}", font=FONT, fill=0)
+    for row in range(8):
+        draw.text((100, 500 + 80 * row), f"Body line {row} of page {number} with varying words {number * row}",
+                  font=FONT, fill=0)
+    draw.text((100, FOOTER_Y), "Confidential - ACME Corp internal use only", font=FONT, fill=0)
+    image.save(path)
+    return str(path)
+
+
+def _cached_at(segments, row):
+    return any(top <= row < bottom and cached for top, bottom, cached in segments)
+
+
+def _segment_at(segments, row):
+    return next((top, bottom, cached) for top, bottom, cached in segments if top <= row < bottom)
+
+
+def test_identical_footer_is_cached_and_varying_lines_are_not(tmp_path):
+    pages = [_page(tmp_path / f"page_{n}.png", n) for n in range(1, 5)]
+    segments = find_stable_bands(pages)
+
+    assert _cached_at(segments, FOOTER_Y + 10)
+    assert not _cached_at(segments, HEADER_Y + 10)
+    assert not _cached_at(segments, ZONE_BODY_Y + 10)
+    assert not _cached_at(segments, 800)
+
+
+def test_page_number_alone_keeps_the_header_row_varying(tmp_path):
+    pages = []
+    for n in (1, 2, 3):
+        path = tmp_path / f"page_{n}.png"
+        image = Image.new("L", SIZE, 255)
+        draw = ImageDraw.Draw(image)
+        draw.text((100, HEADER_Y), "ACME Corp - Annual Report 2024 - Confidential draft for review",
+                  font=FONT, fill=0)
+        draw.text((1150, HEADER_Y), str(n + 5), font=FONT, fill=0)
+        draw.text((100, 800), "Body", font=FONT, fill=0)
+        draw.text((100, FOOTER_Y), "Confidential - ACME Corp internal use only", font=FONT, fill=0)
+        image.save(path)
+        pages.append(str(path))
+
+    segments = find_stable_bands(pages)
+    assert not _cached_at(segments, HEADER_Y + 10)
+    assert _cached_at(segments, FOOTER_Y + 10)
+    assert segments == sorted(segments)
+    assert _segment_at(segments, FOOTER_Y + 10)[1] <= SIZE[1]
@@ -0,0 +1,81 @@
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from conftest import REPO_ROOT
+from page_classifier import GatedPipeline, analyze_image_complexity, classify_image, widen_class
+
+PAGES_DIR = os.path.join(REPO_ROOT, "test_documents", "nanonets_comparison")
+MARKDOWN_DIR = os.path.join(REPO_ROOT, "output", "markdown_pages")
+
+
+def _pages_with_tables():
+    names = []
+    for md_file in sorted(glob.glob(os.path.join(MARKDOWN_DIR, "page_*.md"))):
+        with open(md_file, encoding="utf-8") as f:
+            if "<table" in f.read():
+                names.append(os.path.splitext(os.path.basename(md_file))[0])
+    return names
+
+
+@pytest.mark.parametrize("name", _pages_with_tables())
+def test_committed_table_pages_keep_table_recognition(name):
+    # PP-StructureV3 found a table on these pages; gating must not switch it off
+    assert classify_image(os.path.join(PAGES_DIR, f"{name}.png")) in ("table", "full")
+
+
+def test_light_bordered_tables_are_tables():
+    for name in ("page_052", "page_138", "page_255"):
+        assert analyze_image_complexity(os.path.join(PAGES_DIR, f"{name}.png"))["tables_likely"]
+
+
+def test_plain_text_page():
+    assert classify_image(os.path.join(PAGES_DIR, "page_003.png")) == "text"
+
+
+def test_thin_light_grid_is_a_table():
+    page = np.full((1650, 1275), 255, dtype=np.uint8)
+    for y in (300, 360, 420, 480):
+        page[y, 100:1100] = 170
+    for x in (100, 400, 700, 1100):
+        page[300:481, x] = 170
+    assert analyze_image_complexity(page)["tables_likely"]
+
+
+def test_single_separator_is_not_evidence():
+    page = np.full((1650, 1275), 255, dtype=np.uint8)
+    page[1550, 100:1175] = 150
+    complexity = analyze_image_complexity(page)
+    assert not complexity["tables_likely"] and not complexity["uncertain"]
+
+
+class FakeStructure:
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, input, **gates):
+        self.calls.append(gates)
+        return [object()]
+
+
+def test_text_layer_class_cannot_turn_off_a_ruled_table():
+    # The text layer of a PDF page does not see drawn borders and may say "text"
+    pipeline = GatedPipeline(FakeStructure())
+    pipeline.predict(os.path.join(PAGES_DIR, "page_255.png"), page_class="text")
+    assert pipeline.pipeline.calls[0].get("use_table_recognition", True)
+    assert pipeline.report()["table"]["pages"] == 1
+
+
+def test_text_layer_class_kept_when_the_image_agrees():
+    pipeline = GatedPipeline(FakeStructure())
+    pipeline.predict(os.path.join(PAGES_DIR, "page_003.png"), page_class="text")
+    assert pipeline.pipeline.calls[0]["use_table_recognition"] is False
+
+
+def test_widen_class():
+    assert widen_class("text", "table") == "table"
+    assert widen_class("figure", "text") == "figure"
+    assert widen_class("figure", "table") == "full"
+    assert widen_class("table", "table") == "table"
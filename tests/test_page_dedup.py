@@ -0,0 +1,33 @@
+from PIL import Image
+
+from page_dedup import DuplicateClusters, hamming_distances, perceptual_hash
+
+SAMPLE = "test_documents/invoices/sample_invoice.jpg"
+
+
+def test_identical_copy_clusters(tmp_path):
+    copy = tmp_path / "copy.png"
+    Image.open(SAMPLE).save(copy)
+    clusters = DuplicateClusters.build([SAMPLE, copy])
+    assert clusters.representative_of(copy) == SAMPLE
+    assert clusters.needs_result(SAMPLE)
+    assert clusters.duplicates == 1
+
+
+def test_half_resolution_copy_does_not_cluster(tmp_path):
+    half = tmp_path / "half.png"
+    with Image.open(SAMPLE) as pil:
+        pil.resize((pil.width // 2, pil.height // 2)).save(half)
+    # Same picture to the hash, but reused boxes would be in the wrong pixel space
+    assert hamming_distances(perceptual_hash(half)[0], [perceptual_hash(SAMPLE)[0]])[0] <= 4
+    clusters = DuplicateClusters.build([SAMPLE, half])
+    assert clusters.representative_of(half) is None
+    assert clusters.duplicates == 0
+
+
+def test_unreadable_page_is_its_own_cluster(tmp_path):
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+    clusters = DuplicateClusters.build([SAMPLE, broken])
+    assert clusters.errors == 1
+    assert clusters.representative_of(broken) is None
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from conftest import REPO_ROOT
+from page_classifier import GatedPipeline
+from page_router import PageRouter, is_plain_text
+
+PAGES_DIR = os.path.join(REPO_ROOT, "test_documents", "nanonets_comparison")
+
+
+class FakeStructure:
+    def __init__(self):
+        self.pages = []
+
+    def predict(self, input):
+        self.pages.append(input)
+        return [object()]
+
+
+class FakeGated:
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, input, **gates):
+        self.calls.append(gates)
+        return [object()]
+
+
+class FakeOCR:
+    def __init__(self):
+        self.pages = []
+
+    def predict(self, input):
+        self.pages.append(input)
+        return [{"rec_texts": ["text"], "rec_polys": [[[0, 0], [10, 0], [10, 10], [0, 10]]]}]
+
+
+def _router():
+    return PageRouter(FakeStructure(), ocr_engine=FakeOCR())
+
+
+@pytest.mark.parametrize("name", ["page_052", "page_138", "page_255"])
+def test_table_pages_stay_on_structure(name):
+    router = _router()
+    path = os.path.join(PAGES_DIR, f"{name}.png")
+    router.predict(path)
+    assert router.structure_pipeline.pages == [path]
+
+
+def test_text_layer_class_is_confirmed_on_the_image():
+    # A PDF text layer may call a page with drawn table borders "text"
+    router = _router()
+    router.predict(os.path.join(PAGES_DIR, "page_255.png"), page_class="text")
+    assert router.ocr_engine.pages == []
+    assert router.report()["kept_on_structure"] == 1
+
+
+def test_page_kept_on_structure_gets_table_recognition(monkeypatch):
+    import page_classifier
+
+    gated = GatedPipeline(FakeGated())
+    router = PageRouter(gated, ocr_engine=FakeOCR())
+    # The router's pre-pass already widened the class: no second pre-pass
+    monkeypatch.setattr(page_classifier, "classify_image", lambda image: pytest.fail("second pre-pass"))
+    router.predict(os.path.join(PAGES_DIR, "page_255.png"), page_class="text")
+    assert gated.pipeline.calls[0].get("use_table_recognition", True)
+
+
+def test_plain_text_page_goes_to_ocr():
+    router = _router()
+    router.predict(os.path.join(PAGES_DIR, "page_003.png"))
+    assert len(router.ocr_engine.pages) == 1
+
+
+def test_rule_evidence_is_not_plain_text():
+    base = {"tables_likely": False, "uncertain": False, "images": 0,
+            "horizontal_rules": 1, "vertical_rules": 0, "multi_column_lines": 0}
+    assert is_plain_text(base)
+    assert not is_plain_text(dict(base, vertical_rules=1))
+    assert not is_plain_text(dict(base, horizontal_rules=2))
+    assert not is_plain_text(dict(base, multi_column_lines=1))
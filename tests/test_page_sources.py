@@ -0,0 +1,35 @@
+import json
+import os
+
+import input_discovery
+from input_discovery import PAGE_SOURCES_FILENAME, find_page_source, save_page_sources
+
+
+def test_sidecar_parsed_once_per_directory(tmp_path, monkeypatch):
+    pdf = tmp_path / "doc.pdf"
+    pdf.write_bytes(b"%PDF")
+    save_page_sources(str(tmp_path), {f"p{i}.png": {"pdf": str(pdf), "page": i, "dpi": 300}
+                                      for i in range(50)})
+
+    loads = []
+    original = input_discovery.load_page_sources
+    monkeypatch.setattr(input_discovery, "load_page_sources",
+                        lambda directory: loads.append(directory) or original(directory))
+
+    for i in range(50):
+        assert find_page_source(str(tmp_path / f"p{i}.png"))["page"] == i
+    assert len(loads) == 1
+
+
+def test_rewritten_sidecar_is_reloaded(tmp_path):
+    pdf = tmp_path / "doc.pdf"
+    pdf.write_bytes(b"%PDF")
+    save_page_sources(str(tmp_path), {"a.png": {"pdf": str(pdf), "page": 0, "dpi": 300}})
+    assert find_page_source(str(tmp_path / "b.png")) is None
+
+    save_page_sources(str(tmp_path), {"b.png": {"pdf": str(pdf), "page": 1, "dpi": 300}})
+    sidecar = tmp_path / PAGE_SOURCES_FILENAME
+    stat = os.stat(sidecar)
+    os.utime(sidecar, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert find_page_source(str(tmp_path / "b.png"))["page"] == 1
+    assert json.loads(sidecar.read_text())["a.png"]["page"] == 0
@@ -0,0 +1,22 @@
+from result_stream import ResultStreamWriter, iter_result_stream
+
+
+def _write(path, names, append=False):
+    with ResultStreamWriter(str(path), append=append) as writer:
+        for name in names:
+            writer.write({"image_name": name})
+
+
+def test_rerun_starts_a_new_stream(tmp_path):
+    path = tmp_path / "page_results.jsonl"
+    _write(path, ["a.png", "b.png"])
+    _write(path, ["a.png", "b.png"])
+    assert [r["image_name"] for r in iter_result_stream(str(path))] == ["a.png", "b.png"]
+
+
+def test_append_continues_stream(tmp_path):
+    for name in ("page_results.jsonl", "page_results.jsonl.gz"):
+        path = tmp_path / name
+        _write(path, ["a.png"])
+        _write(path, ["b.png"], append=True)
+        assert [r["image_name"] for r in iter_result_stream(str(path))] == ["a.png", "b.png"]
@@ -0,0 +1,45 @@
+from table_html import MAX_SPAN, iter_table_rows, parse_tables
+
+
+def test_rowspan_and_colspan_repeat_text():
+    html = """
+    <table>
+      <tr><th rowspan="2">Item</th><th colspan="2">Price</th></tr>
+      <tr><th>Net</th><th>Gross</th></tr>
+      <tr><td>Pen</td><td>1.00</td><td>1.19</td></tr>
+    </table>
+    """
+    assert parse_tables(html) == [[
+        ["Item", "Price", "Price"],
+        ["Item", "Net", "Gross"],
+        ["Pen", "1.00", "1.19"]
+    ]]
+
+
+def test_rowspan_in_middle_column_leaves_no_gap():
+    html = ("<table><tr><td>a</td><td rowspan=3>b</td><td>c</td></tr>"
+            "<tr><td>d</td><td>e</td></tr><tr><td>f</td><td>g</td></tr></table>")
+    assert parse_tables(html) == [[["a", "b", "c"], ["d", "b", "e"], ["f", "b", "g"]]]
+
+
+def test_rowspan_past_last_row_adds_rows():
+    html = "<table><tr><td rowspan=3>x</td><td>y</td></tr></table>"
+    assert parse_tables(html) == [[["x", "y"], ["x", ""], ["x", ""]]]
+
+
+def test_bad_and_huge_spans_are_clamped():
+    html = f"<table><tr><td colspan='zero'>a</td><td colspan={MAX_SPAN * 10}>b</td></tr></table>"
+    (row,), = parse_tables(html)
+    assert len(row) == 1 + MAX_SPAN
+    assert row[0] == "a" and row[-1] == "b"
+
+
+def test_nested_tables_and_breaks_fold_into_cell():
+    html = ("<table><tr><td>outer<br>line<table><tr><td>inner</td></tr></table></td>"
+            "<td>x &amp; y</td></tr></table><table><tr><td>second</td></tr></table>")
+    assert list(iter_table_rows(html)) == [(0, ["outer line inner", "x & y"]), (1, ["second"])]
+
+
+def test_chunked_and_truncated_input():
+    html = "<table><tr><td>one</td><td>two</td></tr><tr><td>three"
+    assert list(iter_table_rows(html, chunk_size=5)) == [(0, ["one", "two"]), (0, ["three"])]
@@ -0,0 +1,60 @@
+import pytest
+from PIL import Image
+
+from template_registry import SAMPLE_TEMPLATES, TemplateRegistry, load_gray
+
+INVOICE = SAMPLE_TEMPLATES["sample_invoice"]
+FORM = SAMPLE_TEMPLATES["registration_form"]
+
+
+@pytest.fixture(scope="module")
+def registry(tmp_path_factory):
+    registry = TemplateRegistry(tmp_path_factory.mktemp("templates"))
+    registry.register("sample_invoice", INVOICE["image"], INVOICE["fields"])
+    return registry
+
+
+def _pasted(image_path, shift, target):
+    with Image.open(image_path) as src:
+        canvas = Image.new("RGB", src.size, (255, 255, 255))
+        canvas.paste(src.convert("RGB"), shift)
+    canvas.save(target)
+    return canvas.size
+
+
+@pytest.mark.parametrize("shift", [(15, 20), (3, 0), (0, 9), (21, 27), (30, 30)])
+def test_shifted_copy_matches(registry, tmp_path, shift):
+    target = tmp_path / "shifted.jpg"
+    size = _pasted(INVOICE["image"], shift, target)
+    gray, scale = load_gray(target)
+    matched, details = registry.templates[0].match(gray, scale, size)
+    assert matched, details
+    assert abs(details["shift"][0] - shift[0]) <= 2
+    assert abs(details["shift"][1] - shift[1]) <= 2
+
+
+def test_other_layout_does_not_match(registry, tmp_path):
+    target = tmp_path / "form.png"
+    size = _pasted(FORM["image"], (0, 0), target)
+    gray, scale = load_gray(target)
+    matched, details = registry.templates[0].match(gray, scale, size)
+    assert not matched
+
+
+def test_load_gray_closes_the_file(monkeypatch, tmp_path):
+    # Pillow keeps multi-frame files open after loading until they are closed
+    scan = tmp_path / "scan.tif"
+    with Image.open(INVOICE["image"]) as page:
+        page.save(scan, save_all=True, append_images=[page.copy()])
+
+    handles = []
+    original_open = Image.open
+
+    def spy_open(*args, **kwargs):
+        opened = original_open(*args, **kwargs)
+        handles.append(opened.fp)
+        return opened
+
+    monkeypatch.setattr(Image, "open", spy_open)
+    load_gray(scan)
+    assert [handle.closed for handle in handles] == [True]
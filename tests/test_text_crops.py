@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from text_crops import box_to_poly, sort_polys
+
+
+def _box(x, y, width=50, height=20):
+    return np.float32([[x, y], [x + width, y], [x + width, y + height], [x, y + height]])
+
+
+def test_reading_order_within_and_across_lines():
+    # Second line first, and a slightly higher box to the right on line one
+    polys = [_box(300, 104), _box(10, 100), _box(160, 95), _box(10, 200)]
+    order = [(int(p[0][0]), int(p[0][1])) for p in sort_polys(polys)]
+    assert order == [(10, 100), (160, 95), (300, 104), (10, 200)]
+
+
+def test_lines_further_apart_than_tolerance_stay_apart():
+    order = [(int(p[0][0]), int(p[0][1])) for p in sort_polys([_box(10, 130), _box(200, 100)])]
+    assert order == [(200, 100), (10, 130)]
+
+
+
+def test_box_to_poly_accepts_points_and_boxes():
+    assert box_to_poly([1, 2, 3, 4]).tolist() == [[1, 2], [3, 2], [3, 4], [1, 4]]
+    points = [[0, 0], [5, 0], [5, 5], [0, 5]]
+    assert np.array_equal(box_to_poly(points), np.float32(points))
+    with pytest.raises(ValueError):
+        box_to_poly([1, 2, 3])
@@ -0,0 +1,90 @@
+"""
+Text Region Crops
+Order detected text polygons in reading order and cut them out as upright line images for
+the recognition models
+"""
+
+import numpy as np
+
+
+# Boxes whose top edges are this close (pixels) count as the same line
+LINE_TOLERANCE = 10
+
+# Crops this much taller than wide are vertical text and get rotated
+VERTICAL_RATIO = 1.5
+
+
+def box_to_poly(box):
+    """
+    Normalize a region to a (4, 2) polygon
+
+    Args:
+        box: Four points, or an axis-aligned [x0, y0, x1, y1] box
+
+    Returns:
+        float32 array of four points clockwise from top-left
+    """
+    values = np.asarray(box, dtype=np.float32)
+    if values.size == 4:
+        x0, y0, x1, y1 = values.reshape(4)
+        return np.float32([[x0, y0], [x1, y0], [x1, y1], [x0, y1]])
+    if values.size != 8:
+        raise ValueError(f"Expected 4 points or [x0, y0, x1, y1], got {box!r}")
+    return values.reshape(4, 2)
+
+
+def sort_polys(polys):
+    """
+    Sort quadrilaterals top-to-bottom, then left-to-right within a line
+
+    Args:
+        polys: Sequence of (4, 2) point arrays
+
+    Returns:
+        List of the same polygons in reading order
+    """
+    polys = [np.asarray(p, dtype=np.float32).reshape(-1, 2) for p in polys]
+    polys.sort(key=lambda p: (p[0][1], p[0][0]))
+
+    # Bubble neighbours on the same line into left-to-right order
+    for i in range(len(polys) - 1):
+        for j in range(i, -1, -1):
+            same_line = abs(polys[j + 1][0][1] - polys[j][0][1]) < LINE_TOLERANCE
+            if same_line and polys[j + 1][0][0] < polys[j][0][0]:
+                polys[j], polys[j + 1] = polys[j + 1], polys[j]
+            else:
+                break
+    return polys
+
+
+def crop_text_region(image, poly):
+    """
+    Perspective-correct crop of one text region
+
+    Args:
+        image: BGR uint8 image array
+        poly: (4, 2) points clockwise from top-left
+
+    Returns:
+        Crop as a BGR uint8 array, rotated upright for vertical text
+    """
+    import cv2
+
+    points = np.asarray(poly, dtype=np.float32).reshape(4, 2)
+    width = int(max(np.linalg.norm(points[0] - points[1]), np.linalg.norm(points[2] - points[3])))
+    height = int(max(np.linalg.norm(points[0] - points[3]), np.linalg.norm(points[1] - points[2])))
+    width, height = max(width, 1), max(height, 1)
+
+    target = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    matrix = cv2.getPerspectiveTransform(points, target)
+    crop = cv2.warpPerspective(image, matrix, (width, height),
+                               borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC)
+
+    if height / width >= VERTICAL_RATIO:
+        crop = np.rot90(crop)
+    return np.ascontiguousarray(crop)
+
+
+def crop_text_regions(image, polys):
+    """Crops for a list of polygons, in the same order"""
+    return [crop_text_region(image, poly) for poly in polys]